@@ -26,7 +26,9 @@ except ImportError:
 
 from . import __version__ as VERSION
 from .dynamic_typing import ModelMeta, register_datetime_classes, registry
+from .flat_generator import FlatMetadataGenerator
 from .generator import MetadataGenerator
+from .json_stream import iter_json_stream_file
 from .models import ModelsStructureType
 from .models.attr import AttrsModelCodeGenerator
 from .models.base import GenericModelCodeGenerator, generate_code
@@ -49,6 +51,11 @@ class Cli:
         "exact": ModelFieldsEquals
     }
 
+    ENGINE_MAPPING: Dict[str, Type[MetadataGenerator]] = {
+        "tree": MetadataGenerator,
+        "flat": FlatMetadataGenerator
+    }
+
     STRUCTURE_FN_MAPPING: Dict[str, STRUCTURE_FN_TYPE] = {
         "nested": compose_models,
         "flat": compose_models_flat
@@ -65,11 +72,14 @@ class Cli:
 
     def __init__(self):
         self.initialized = False
-        self.models_data: Dict[str, Iterable[dict]] = {}  # -m/-l
+        self.models_data: Dict[str, List[Iterable[dict]]] = {}  # -m/-l
         self.enable_datetime: bool = False  # --datetime
         self.strings_converters: bool = False  # --strings-converters
         self.max_literals: int = -1  # --max-strings-literals
+        self.jobs: int = 1  # --jobs
+        self.engine: Type[MetadataGenerator] = MetadataGenerator  # --engine
         self.merge_policy: List[ModelCmp] = []  # --merge
+        self.strict_merge: bool = False  # --strict-merge
         self.structure_fn: STRUCTURE_FN_TYPE = None  # -s
         self.model_generator: Type[GenericModelCodeGenerator] = None  # -f & --code-generator
         self.model_generator_kwargs: Dict[str, Any] = None
@@ -93,7 +103,10 @@ class Cli:
         disable_unicode_conversion = namespace.disable_unicode_conversion
         self.strings_converters = namespace.strings_converters
         self.max_literals = namespace.max_strings_literals
+        self.jobs = namespace.jobs
+        self.engine = self.ENGINE_MAPPING[namespace.engine]
         merge_policy = [m.split("_") if "_" in m else m for m in namespace.merge]
+        self.strict_merge = namespace.strict_merge
         structure = namespace.structure
         framework = namespace.framework
         code_generator = namespace.code_generator
@@ -113,15 +126,22 @@ class Cli:
     def run(self):
         if self.enable_datetime:
             register_datetime_classes()
-        generator = MetadataGenerator(
+        generator = self.engine(
             dict_keys_regex=self.dict_keys_regex,
             dict_keys_fields=self.dict_keys_fields
         )
         registry = ModelRegistry(*self.merge_policy)
         for name, data in self.models_data.items():
-            meta = generator.generate(*data)
+            # Files are opened one by one so only one parsed document is in memory at a time
+            items = itertools.chain.from_iterable(data)
+            if self.jobs > 1:
+                meta = generator.generate_parallel(items, jobs=self.jobs)
+            else:
+                for item in items:
+                    generator.feed(item)
+                meta = generator.result()
             registry.process_meta_data(meta, name)
-        registry.merge_models(generator)
+        registry.merge_models(generator, strict=self.strict_merge)
         registry.generate_names()
         structure = self.structure_fn(registry.models_map)
         output = self.version_string + generate_code(
@@ -177,9 +197,10 @@ class Cli:
             parser: 'FileLoaders.T'
     ):
         """
-        Initialize lazy loaders for models data
+        Initialize lazy loaders for models data. Each model gets list of per-file iterators,
+        files are not opened until iteration is started.
         """
-        models_dict: Dict[str, List[dict]] = defaultdict(list)
+        models_dict: Dict[str, List[Iterable[dict]]] = defaultdict(list)
 
         models = list(models) + list(models_lists)
         for model_tuple in models:
@@ -192,8 +213,7 @@ class Cli:
                 raise RuntimeError('`--model` argument should contain exactly 2 or 3 strings')
 
             for real_path in process_path(path_raw):
-                iterator = iter_json_file(parser(real_path), lookup)
-                models_dict[model_name].extend(iterator)
+                models_dict[model_name].append(iter_file(real_path, lookup, parser))
 
         self.models_data = models_dict
 
@@ -343,6 +363,28 @@ class Cli:
                 "'exact'               - two models should have exact same field names to merge.\n\n"
             )
         )
+        parser.add_argument(
+            "--strict-merge",
+            action="store_true",
+            help="Merge only groups of models in which every pair of models meets the merge policy.\n"
+                 "By default similar models are chained, so a group could contain unrelated models.\n\n"
+        )
+        parser.add_argument(
+            "-j", "--jobs",
+            type=positive_int, default=1, metavar="N",
+            help="Number of worker processes that are used to extract metadata from models data.\n"
+                 "Default is 1 (data is processed in the main process)\n\n"
+        )
+        parser.add_argument(
+            "--engine",
+            default="tree",
+            choices=list(cls.ENGINE_MAPPING.keys()),
+            help="Metadata extraction engine.\n"
+                 "'tree' - merge metadata trees of data variants one by one (default).\n"
+                 "'flat' - collect type observations in a flat index by data paths and build metadata at the end.\n"
+                 "         It is faster on large inputs. Result is the same\n"
+                 "         (including the order of fields and types in unions).\n\n"
+        )
         parser.add_argument(
             "--dict-keys-regex", "--dkr",
             nargs="+", metavar="RegEx",
@@ -470,6 +512,39 @@ def iter_json_file(data: Union[dict, list], lookup: str) -> Generator[Union[dict
         raise TypeError(f'dict or list is expected at {lookup if lookup != "-" else "JSON root"}, not {type(item)}')
 
 
+def iter_file(path: Path, lookup: str, parser: FileLoaders.T) -> Generator[Union[dict, list], Any, None]:
+    """
+    Load file, perform lookup and return generator over json list.
+    Does not open file until iteration is started.
+
+    :param path: File path
+    :param lookup: Dot separated lookup path
+    :param parser: File loader
+    :return: Generator of the model data
+    """
+    if parser is FileLoaders.json:
+        # JSON files are read incrementally, so only one item of the looked-up list is in memory
+        yield from iter_json_stream_file(path, lookup)
+    else:
+        yield from iter_json_file(parser(path), lookup)
+
+
+def positive_int(value: str) -> int:
+    """
+    Argparse type converter that accepts only integers greater than zero
+
+    :param value: raw argument value
+    :return: parsed integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"value should be greater than zero, got {number}")
+    return number
+
+
 def process_path(path: str) -> Iterable[Path]:
     """
     Convert path pattern into path iterable.
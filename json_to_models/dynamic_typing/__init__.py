@@ -1,7 +1,8 @@
 from .base import (
-    BaseType, ImportPathList, MetaData, Null, Unknown, get_hash_string
+    BaseType, ImportPathList, MetaData, Null, Unknown, get_hash, get_hash_string, get_sort_key
 )
 from .complex import ComplexType, DDict, DList, DOptional, DTuple, DUnion, SingleType, StringLiteral
+from .interning import InternTable, is_interned
 from .models_meta import AbsoluteModelRef, ModelMeta, ModelPtr
 from .string_datetime import IsoDateString, IsoDatetimeString, IsoTimeString, register_datetime_classes
 from .string_serializable import (
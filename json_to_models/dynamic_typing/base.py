@@ -5,6 +5,8 @@ ImportPathList = List[Tuple[str, Union[Iterable[str], str, None]]]
 
 
 class BaseType:
+    __slots__ = []
+
     def __iter__(self) -> Iterable['MetaData']:
         """
         Yields nested metadata items
@@ -45,20 +47,32 @@ class BaseType:
                 return options
         return {}
 
-    def to_hash_string(self) -> str:
+    def __getstate__(self):
+        # Cached hash and sort key are not pickled because hashes of classes and strings
+        # are valid only in the current process
+        slots = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, '__slots__', ())
+            if name not in ('_hash', '_key') and hasattr(self, name)
+        }
+        return None, slots
+
+    def to_hash(self) -> int:
         """
-        Return unique string that can be used to generate hash of type instance.
+        Return structural hash of type instance. It is combined from hashes of nested types.
         Caches hash value by default. If subclass can mutate (by default it always can)
         then it should define setters to safely invalidate cached value.
 
-        :return: hash string
+        :return: hash
         """
         # NOTE: Do not override __hash__ function because BaseType instances isn't immutable
-        if not getattr(self, '_hash', None):
-            self._hash = self._to_hash_string()
-        return self._hash
+        h = getattr(self, '_hash', None)
+        if h is None:
+            h = self._hash = self._to_hash()
+        return h
 
-    def _to_hash_string(self) -> str:
+    def _to_hash(self) -> int:
         """
         Hash getter method to override
 
@@ -66,6 +80,44 @@ class BaseType:
         """
         raise NotImplementedError()
 
+    def to_sort_key(self) -> 'SortKey':
+        """
+        Return canonical key that is used to sort nested types of unions before comparison.
+        Key is (qualified class name, structure key) pair where structure key is built from keys of nested types.
+        Unlike ``to_hash`` it does not depend on order of dict fields and union items so equal types have equal keys
+        and keys are the same in all processes. Key is cached and invalidated by setters (as hash).
+        In-place changes of nested types do not invalidate it so it is used only for ordering but not for equality.
+        """
+        key = getattr(self, '_key', None)
+        if key is None:
+            key = self._key = (get_class_name(type(self)), self._to_sort_key())
+        return key
+
+    def _to_sort_key(self) -> Any:
+        """
+        Structure key getter method to override
+
+        :return:
+        """
+        raise NotImplementedError()
+
+    def to_hash_string(self) -> str:
+        """
+        Return unique string that can be used to generate hash of type instance.
+        Human readable (but not cached) version of ``to_hash`` method.
+
+        :return: hash string
+        """
+        return self._to_hash_string()
+
+    def _to_hash_string(self) -> str:
+        """
+        Hash string getter method to override
+
+        :return:
+        """
+        raise NotImplementedError()
+
     def iter_child(self) -> Generator['MetaData', Any, None]:
         yield self
         for child in self:
@@ -91,9 +143,19 @@ class UnknownType(BaseType):
             -> Tuple[ImportPathList, str]:
         return ([('typing', 'Any')], 'Any')
 
+    def to_hash(self) -> int:
+        return hash("Unknown")
+
+    def to_sort_key(self) -> 'SortKey':
+        return "Unknown", ()
+
     def to_hash_string(self) -> str:
         return "Unknown"
 
+    def __reduce__(self):
+        # Keep singleton after pickling
+        return "Unknown"
+
 
 class NoneType(BaseType):
     __slots__ = []
@@ -111,13 +173,24 @@ class NoneType(BaseType):
             -> Tuple[ImportPathList, str]:
         return ([], 'None')
 
+    def to_hash(self) -> int:
+        return hash("NoneType")
+
+    def to_sort_key(self) -> 'SortKey':
+        return "NoneType", ()
+
     def to_hash_string(self) -> str:
         return "NoneType"
 
+    def __reduce__(self):
+        # Keep singleton after pickling
+        return "Null"
+
 
 Unknown = UnknownType()
 Null = NoneType()
 MetaData = Union[type, dict, BaseType]
+SortKey = Tuple[str, Any]
 
 
 def get_hash_string(t: MetaData):
@@ -127,3 +200,42 @@ def get_hash_string(t: MetaData):
         return str(t)
     elif isinstance(t, BaseType):
         return t.to_hash_string()
+
+
+_class_names: Dict[type, str] = {}
+
+
+def get_class_name(cls: type) -> str:
+    """
+    Return qualified name of the class. Unlike ``hash(cls)`` it does not depend on the class address
+    so hashes of metadata are the same in all processes (with the same PYTHONHASHSEED).
+    """
+    name = _class_names.get(cls)
+    if name is None:
+        name = _class_names[cls] = f"{cls.__module__}.{cls.__qualname__}"
+    return name
+
+
+def get_hash(t: MetaData) -> int:
+    """
+    Integer version of ``get_hash_string``. Types with equal hash strings have equal hashes.
+    Different types could have equal hashes, so equality of hashes has to be checked by ``==`` operator.
+    """
+    if isinstance(t, dict):
+        return hash(tuple(zip(t.keys(), map(get_hash, t.values()))))
+    elif isinstance(t, type):
+        return hash(_class_names.get(t) or get_class_name(t))
+    elif isinstance(t, BaseType):
+        return t.to_hash()
+
+
+def get_sort_key(t: MetaData) -> SortKey:
+    """
+    Canonical sort key of metadata (see ``BaseType.to_sort_key``)
+    """
+    if isinstance(t, BaseType):
+        return t.to_sort_key()
+    elif isinstance(t, dict):
+        return "dict", tuple(sorted(zip(t.keys(), map(get_sort_key, t.values()))))
+    elif isinstance(t, type):
+        return "type", _class_names.get(t) or get_class_name(t)
@@ -1,21 +1,26 @@
 import json
+import operator
 from functools import partial
 from itertools import chain
 from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 from typing_extensions import Literal
 
-from .base import BaseType, ImportPathList, MetaData, get_hash_string
+from .base import (
+    BaseType, ImportPathList, MetaData, SortKey, get_class_name, get_hash, get_hash_string, get_sort_key
+)
 from .typing import metadata_to_typing
 
 
 class SingleType(BaseType):
     _typing_cls = None
-    __slots__ = ["_type", "_hash"]
+    __slots__ = ["_type", "_hash", "_key", "_interned"]
 
     def __init__(self, t: MetaData):
         self._type = t
         self._hash = None
+        self._key = None
+        self._interned = False  # Shared node (see InternTable)
 
     @property
     def type(self):
@@ -25,6 +30,7 @@ class SingleType(BaseType):
     def type(self, t: MetaData):
         self._type = t
         self._hash = None
+        self._key = None
 
     def __str__(self):
         return f"{type(self).__name__}[{self.type}]"
@@ -36,9 +42,14 @@ class SingleType(BaseType):
         yield self.type
 
     def __eq__(self, other):
-        return type(other) is type(self) and self.type == other.type
+        return self is other or type(other) is type(self) and self.type == other.type
 
     def replace(self, t: 'MetaData', **kwargs) -> 'SingleType':
+        if self._interned:
+            # Shared node is copied on write
+            if t is self._type:
+                return self
+            return type(self)(t)
         self.type = t
         return self
 
@@ -50,18 +61,26 @@ class SingleType(BaseType):
             f"{self._typing_cls._name}[{nested}]"
         )
 
+    def _to_hash(self) -> int:
+        return hash((get_class_name(type(self)), get_hash(self.type)))
+
+    def _to_sort_key(self) -> SortKey:
+        return get_sort_key(self.type)
+
     def _to_hash_string(self) -> str:
         return f"{type(self).__name__}/{get_hash_string(self.type)}"
 
 
 class ComplexType(BaseType):
     _typing_cls = None
-    __slots__ = ["_types", "_sorted", "_hash"]
+    __slots__ = ["_types", "_sorted", "_hash", "_key", "_interned"]
 
     def __init__(self, *types: MetaData):
         self._types = list(types)
         self._sorted = None
         self._hash = None
+        self._key = None
+        self._interned = False  # Shared node (see InternTable)
 
     @property
     def types(self):
@@ -72,6 +91,7 @@ class ComplexType(BaseType):
         self._types = value
         self._sorted = None
         self._hash = None
+        self._key = None
 
     @property
     def sorted(self):
@@ -80,17 +100,10 @@ class ComplexType(BaseType):
         """
         sorted_types = getattr(self, '_sorted', None)
         if sorted_types is None:
-            sorted_types = sorted(self.types, key=self._sort_key)
+            sorted_types = sorted(self.types, key=get_sort_key)
             self._sorted = sorted_types
         return sorted_types
 
-    @staticmethod
-    def _sort_key(item):
-        if hasattr(item, 'keys'):
-            return str(sorted(item.keys()))
-        else:
-            return str(item)
-
     def __str__(self):
         items = ', '.join(map(str, self.types))
         return f"{type(self).__name__}[{items}]"
@@ -103,22 +116,34 @@ class ComplexType(BaseType):
         yield from self.types
 
     def __eq__(self, other):
-        return type(other) is type(self) and self.sorted == other.sorted
+        if self is other:
+            return True
+        if type(other) is not type(self) or len(self.types) != len(other.types):
+            return False
+        return self.sorted == other.sorted
 
     def __len__(self):
         return len(self.types)
 
     def replace(self, t: Union['MetaData', List['MetaData']], index=None, **kwargs) -> 'ComplexType':
+        node = self
+        if self._interned:
+            # Shared node is copied on write
+            if index is None and isinstance(t, list) and len(t) == len(self.types) \
+                    and all(map(operator.is_, t, self.types)):
+                return self
+            node = object.__new__(type(self))
+            ComplexType.__init__(node, *self.types)
         if index is None and isinstance(t, list):
-            self.types = t
+            node.types = t
         elif index is not None and not isinstance(t, list):
-            types = self.types
+            types = node.types
             types[index] = t
             # Using property setter here
-            self.types = types
+            node.types = types
         else:
             raise ValueError(f"Unsupported arguments: t={t} index={index} kwargs={kwargs}")
-        return self
+        return node
 
     def to_typing_code(self, types_style: Dict[Union['BaseType', Type['BaseType']], dict]) \
             -> Tuple[ImportPathList, str]:
@@ -129,6 +154,12 @@ class ComplexType(BaseType):
             f"{self._typing_cls._name}[{nested}]"
         )
 
+    def _to_hash(self) -> int:
+        return hash((get_class_name(type(self)), *map(get_hash, self.types)))
+
+    def _to_sort_key(self) -> Tuple[SortKey, ...]:
+        return tuple(sorted(map(get_sort_key, self.types)))
+
     def _to_hash_string(self) -> str:
         return type(self).__name__ + "/" + ",".join(map(get_hash_string, self.types))
 
@@ -138,6 +169,7 @@ class DOptional(SingleType):
     Field of this type may not be presented in JSON object
     """
     _typing_cls = Optional
+    __slots__ = []
 
 
 class DUnion(ComplexType):
@@ -145,9 +177,10 @@ class DUnion(ComplexType):
     Same as typing.Union. Nested types are unique.
     """
     _typing_cls = Union
+    __slots__ = []
 
     def __init__(self, *types: Union[type, BaseType, dict]):
-        hashes = set()
+        hashes: Dict[int, List[MetaData]] = {}
         unique_types = []
         use_literals = True
         str_literals = set()
@@ -168,10 +201,15 @@ class DUnion(ComplexType):
                     str_literals.update(t.literals)
 
             else:
-                h = get_hash_string(t)
-                if h not in hashes:
-                    unique_types.append(t)
-                    hashes.add(h)
+                h = get_hash(t)
+                same_hash = hashes.get(h)
+                if same_hash is None:
+                    hashes[h] = [t]
+                elif any(t == other for other in same_hash):
+                    return use_literals
+                else:
+                    same_hash.append(t)
+                unique_types.append(t)
             return use_literals
 
         for t in types:
@@ -206,14 +244,17 @@ class DUnion(ComplexType):
 
 class DTuple(ComplexType):
     _typing_cls = Tuple
+    __slots__ = []
 
 
 class DList(SingleType):
     _typing_cls = List
+    __slots__ = []
 
 
 class DDict(SingleType):
     _typing_cls = Dict
+    __slots__ = []
 
     # Dict is single type because keys of JSON dict are always strings.
     def to_typing_code(self, types_style: Dict[Union['BaseType', Type['BaseType']], dict]) \
@@ -232,9 +273,10 @@ class StringLiteral(BaseType):
 
     MAX_LITERALS = 15  # Hard limit for performance optimization
     MAX_STRING_LENGTH = 20
-    __slots__ = ["_literals", "_hash", "_overflow"]
+    __slots__ = ["_literals", "_hash", "_key", "_overflow", "_interned"]
 
     def __init__(self, literals: AbstractSet[str]):
+        self._interned = False  # Shared node (see InternTable)
         self._overflow = (
                 len(literals) > self.MAX_LITERALS
                 or
@@ -255,7 +297,7 @@ class StringLiteral(BaseType):
         return f"<{type(self).__name__} [{self._repr_literals()}]>"
 
     def __eq__(self, other):
-        return type(other) is type(self) and self._literals == other._literals
+        return self is other or type(other) is type(self) and self._literals == other._literals
 
     def replace(self, t: 'MetaData', **kwargs) -> 'StringLiteral':
         return self
@@ -274,6 +316,12 @@ class StringLiteral(BaseType):
 
         return [], 'str'
 
+    def _to_hash(self) -> int:
+        return hash((get_class_name(type(self)), self._overflow, frozenset(self._literals)))
+
+    def _to_sort_key(self) -> Tuple[bool, Tuple[str, ...]]:
+        return self._overflow, tuple(sorted(self._literals))
+
     def _to_hash_string(self) -> str:
         return f"{type(self).__name__}/{self._repr_literals()}"
 
@@ -0,0 +1,102 @@
+import operator
+from inspect import isclass
+from typing import AbstractSet, Dict, Iterable, Type
+
+from .base import BaseType, MetaData
+from .complex import DUnion, SingleType, StringLiteral
+
+
+def is_interned(t: MetaData) -> bool:
+    """
+    Return True if metadata is shared and can not be changed in-place (classes, singletons and interned nodes)
+    """
+    return isclass(t) or isinstance(t, BaseType) and getattr(t, '_interned', True)
+
+
+class InternTable:
+    """
+    Factory of shared (hash-consed) metadata nodes. Structurally equal nodes which do not contain models
+    (dicts or model pointers) are created once, so they are stored in memory once and are compared by identity.
+    Interned nodes are immutable: their ``replace`` method returns a modified copy (copy-on-write).
+    Nodes which can not be interned are returned as new not shared instances.
+    """
+    MAX_SIZE = 2 ** 16
+
+    def __init__(self, max_size: int = None):
+        """
+        :param max_size: Max number of stored nodes. Table is cleared when it is reached
+            (already created nodes are still shared and immutable). 0 disables interning.
+        """
+        self.max_size = max_size if max_size is not None else self.MAX_SIZE
+        self._nodes: Dict[tuple, BaseType] = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @staticmethod
+    def _is_same(shared: BaseType, node: BaseType) -> bool:
+        """
+        Check that shared node found by key has the same nested nodes (keys are built from ids of nested nodes)
+        """
+        if isinstance(shared, SingleType):
+            return type(node) is type(shared) and shared.type is node.type
+        elif isinstance(shared, DUnion):
+            return len(shared.types) == len(node.types) and all(map(operator.is_, shared.types, node.types))
+        # Literals are stored by their values
+        return True
+
+    def _get(self, key: tuple, node: BaseType) -> BaseType:
+        shared = self._nodes.get(key)
+        if shared is not None and self._is_same(shared, node):
+            return shared
+        if not self.max_size:
+            return node
+        if len(self._nodes) >= self.max_size:
+            self._nodes.clear()
+        node._interned = True
+        self._nodes[key] = node
+        return node
+
+    def single(self, cls: Type[SingleType], t: MetaData) -> SingleType:
+        """
+        Interned version of ``cls(t)``
+        """
+        shared = self._nodes.get((cls, id(t)))
+        if shared is not None and shared.type is t:
+            return shared
+        if not is_interned(t):
+            return cls(t)
+        # Nested node is kept alive by the new one so its id is not reused while the key is stored
+        return self._get((cls, id(t)), cls(t))
+
+    def union(self, *types: MetaData) -> MetaData:
+        """
+        Interned version of ``DUnion(*types)``
+        """
+        union = DUnion(*types)
+        types = union.types
+        for i, t in enumerate(types):
+            if isinstance(t, StringLiteral) and not t._interned:
+                types[i] = self.literal(t.literals, t.overflowed)
+            elif not is_interned(t):
+                return union
+        union.types = types
+        return self._get((DUnion, *map(id, types)), union)
+
+    def literal(self, literals: Iterable[str], overflowed=False) -> StringLiteral:
+        """
+        Interned version of ``StringLiteral(literals)``
+        """
+        literals: AbstractSet[str] = frozenset(literals)
+        overflowed = overflowed or len(literals) > StringLiteral.MAX_LITERALS \
+            or any(len(s) >= StringLiteral.MAX_STRING_LENGTH for s in literals)
+        # All overflowed literals are equal so values are not stored in the key
+        key = (StringLiteral, None) if overflowed else (StringLiteral, literals)
+        shared = self._nodes.get(key)
+        if shared is not None:
+            return shared
+        node = StringLiteral(literals)
+        if overflowed:
+            node._overflow = True
+            node._literals = frozenset()
+        return self._get(key, node)
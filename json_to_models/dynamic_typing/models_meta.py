@@ -4,13 +4,14 @@ from typing import Dict, List, Optional, Set, Tuple, Type, Union
 import inflection
 
 from . import BaseType
-from .base import ImportPathList, MetaData
+from .base import ImportPathList, MetaData, get_class_name
 from .complex import SingleType
 from ..utils import distinct_words
 
 
 class ModelMeta(SingleType):
     WORDS_SEPARATOR = "_"
+    __slots__ = ["original_fields", "index", "pointers", "child_pointers", "_name", "_name_generated"]
 
     def __init__(self, t: MetaData, index, _original_fields=None):
         super().__init__(t)
@@ -36,6 +37,9 @@ class ModelMeta(SingleType):
     def __hash__(self):
         return hash(self.index)
 
+    def _to_sort_key(self) -> str:
+        return self.index
+
     def generate_name(self):
         """
         Generate model name based on fields to which his model is assigned.
@@ -107,6 +111,7 @@ class ModelPtr(SingleType):
     Model wrapper (pointer)
     """
     type: ModelMeta
+    __slots__ = ["parent", "parent_field_name"]
 
     def __init__(self, meta: ModelMeta, parent: ModelMeta = None, parent_field_name: str = None):
         super().__init__(meta)
@@ -136,6 +141,12 @@ class ModelPtr(SingleType):
             -> Tuple[ImportPathList, str]:
         return AbsoluteModelRef(self.type).to_typing_code(types_style)
 
+    def _to_hash(self) -> int:
+        return hash((get_class_name(type(self)), self.type.index))
+
+    def _to_sort_key(self) -> str:
+        return self.type.index
+
     def _to_hash_string(self) -> str:
         return f"{type(self).__name__}_#{self.type.index}"
 
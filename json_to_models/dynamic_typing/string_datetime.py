@@ -1,8 +1,10 @@
 import operator
-from datetime import date, datetime, time
+import re
+from datetime import date, datetime, time, tzinfo
 from typing import Any, Optional, Type, Union
 
 import dateutil.parser
+import dateutil.tz
 
 from .string_serializable import StringSerializable, StringSerializableRegistry, registry
 
@@ -28,6 +30,58 @@ def extend_datetime(d: Union[date, time, datetime], cls: Union[Type[date], Type[
     return cls(*args(d))
 
 
+# Most common ISO-8601 shapes: YYYY-MM-DD, hh:mm[:ss[.ffffff]] and date + time with optional timezone
+_iso_re = re.compile(
+    r'(?:(?P<year>[0-9]{4})-(?P<month>[0-9]{2})-(?P<day>[0-9]{2}))?'
+    r'(?:(?(year)[T ])(?P<hour>[0-9]{2}):(?P<minute>[0-9]{2})'
+    r'(?::(?P<second>[0-9]{2})(?:\.(?P<fraction>[0-9]{1,6}))?)?'
+    r'(?P<tz>Z|[+-][0-9]{2}(?::?[0-9]{2})?)?)?'
+)
+
+
+def _parse_tz(s: Optional[str]) -> Optional[tzinfo]:
+    """
+    Convert timezone part of ISO string to the same tzinfo instance that dateutil.parser.isoparse returns
+    """
+    if s is None:
+        return None
+    if s == 'Z':
+        return dateutil.tz.UTC
+    hours = int(s[1:3])
+    minutes = int(s[-2:]) if len(s) > 3 else 0
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Invalid timezone offset: '{s}'")
+    offset = (hours * 60 + minutes) * 60
+    if not offset:
+        return dateutil.tz.UTC
+    return dateutil.tz.tzoffset(None, offset if s[0] == '+' else -offset)
+
+
+def parse_iso(s: str) -> Optional[Union[date, time, datetime]]:
+    """
+    Single-pass parser of the most common ISO-8601 shapes. Time without date is always naive.
+
+    :param s: string
+    :return: date, time or datetime instance or None if string has other format
+        (or is not valid) and should be checked by dateutil
+    """
+    match = _iso_re.fullmatch(s)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, tz = match.groups()
+    if hour is None and year is None or year is None and tz is not None:
+        return None
+    try:
+        if hour is None:
+            return date(int(year), int(month), int(day))
+        time_args = (int(hour), int(minute), int(second or 0), int(fraction.ljust(6, '0')) if fraction else 0)
+        if year is None:
+            return time(*time_args)
+        return datetime(int(year), int(month), int(day), *time_args, tzinfo=_parse_tz(tz))
+    except ValueError:
+        return None
+
+
 _check_values_date = (
     datetime(2018, 1, 2, 0, 4, 5, 678, tzinfo=None),
     datetime(2018, 1, 2, 9, 4, 5, 678, tzinfo=None)
@@ -41,6 +95,9 @@ def is_date(s: str) -> Optional[date]:
     :param s: string
     :return: date or None
     """
+    parsed = parse_iso(s)
+    if parsed is not None:
+        return parsed if type(parsed) is date else None
     # dateutil.parser.parse replaces missing parts of datetime with values from default value
     # so if there is hour part in given string then d1 and d2 would be equal and string is not pure date
     d1 = dateutil.parser.parse(s, default=_check_values_date[0])
@@ -61,6 +118,9 @@ def is_time(s: str) -> Optional[time]:
     :param s: string
     :return: time or None
     """
+    parsed = parse_iso(s)
+    if parsed is not None:
+        return parsed if type(parsed) is time else None
     d1 = dateutil.parser.parse(s, default=_check_values_time[0])
     d2 = dateutil.parser.parse(s, default=_check_values_time[1])
     return None if d1 == d2 else d1.time()
@@ -72,13 +132,20 @@ class IsoDateString(StringSerializable, date):
     You can override to_representation method to customize it. Just don't forget to call registry.remove(IsoDateString)
     """
     actual_type = date
+    # isoparse requires year at the beginning (4 ascii chars that could be parsed by ``int``)
+    lexical_pattern = r'[0-9\s+\-_]{4}[\s\S]*'
 
     @classmethod
     def to_internal_value(cls, value: str) -> 'IsoDateString':
-        if not is_date(value):
+        d = parse_iso(value)
+        if d is None:
+            # Other formats
+            if not is_date(value):
+                raise ValueError(f"'{value}' is not valid date")
+            d = dateutil.parser.isoparse(value).date()
+        elif type(d) is not date:
             raise ValueError(f"'{value}' is not valid date")
-        dt = dateutil.parser.isoparse(value)
-        return extend_datetime(dt.date(), cls)
+        return extend_datetime(d, cls)
 
     def to_representation(self):
         return self.isoformat()
@@ -116,10 +183,18 @@ class IsoDatetimeString(StringSerializable, datetime):
     Representation format always is ``YYYY-MM-DDThh:mm:ss.ms`` (datetime.isoformat method).
     """
     actual_type = datetime
+    lexical_pattern = IsoDateString.lexical_pattern
 
     @classmethod
     def to_internal_value(cls, value: str) -> 'IsoDatetimeString':
-        dt = dateutil.parser.isoparse(value)
+        dt = parse_iso(value)
+        if dt is None:
+            # Other formats
+            dt = dateutil.parser.isoparse(value)
+        elif type(dt) is date:
+            dt = datetime(dt.year, dt.month, dt.day)
+        elif type(dt) is time:
+            raise ValueError(f"'{value}' is not valid datetime")
         return extend_datetime(dt, cls)
 
     def to_representation(self):
@@ -133,7 +208,8 @@ class IsoDatetimeString(StringSerializable, datetime):
 def register_datetime_classes(registry: StringSerializableRegistry = registry):
     """
     Register datetime classes in given registry (using default registry if no arguments is passed).
-    Date parsing is expensive operation so this classes are disabled by default
+    Common ISO-8601 formats are parsed fast but other formats are parsed by dateutil
+    which is expensive operation so this classes are disabled by default
     """
     registry.add(cls=IsoDateString)
     registry.add(cls=IsoTimeString)
@@ -1,5 +1,6 @@
+import re
 from itertools import permutations
-from typing import ClassVar, Collection, Dict, Iterable, List, Set, Tuple, Type, Union
+from typing import ClassVar, Collection, Dict, Iterable, List, Optional, Pattern, Set, Tuple, Type, Union
 
 from .base import BaseType, ImportPathList
 
@@ -8,12 +9,20 @@ class StringSerializable(BaseType):
     """
     Mixin for classes which are used to (de-)serialize some values in a string form
     """
+    __slots__ = []
 
     class TypeStyle:
         use_actual_type = 'use_actual_type'
 
     actual_type: ClassVar[Type]
 
+    # Cheap lexical pre-check which is used by registry to skip values that can not be represented by this class
+    # without calling ``to_internal_value``. Every value accepted by ``to_internal_value`` should fully match
+    # the pattern (it can be a looser condition) and its length should be in (min, max) range (max can be None).
+    # Use scoped inline flags (e.g. ``(?i:...)``) in string patterns or pass compiled regex.
+    lexical_pattern: ClassVar[Union[str, Pattern, None]] = None
+    lexical_length: ClassVar[Optional[Tuple[int, Optional[int]]]] = None
+
     @classmethod
     def to_internal_value(cls, value: str) -> 'StringSerializable':
         """
@@ -53,11 +62,41 @@ class StringSerializable(BaseType):
 
 T_StringSerializable = Type[StringSerializable]
 
+_scoped_flags = (
+    (re.ASCII, 'a'),
+    (re.IGNORECASE, 'i'),
+    (re.MULTILINE, 'm'),
+    (re.DOTALL, 's'),
+    (re.VERBOSE, 'x'),
+)
+
+
+def _lexical_check_source(cls: T_StringSerializable) -> Optional[str]:
+    """
+    Convert lexical pre-check of the class to the regex source (with inline flags) that should be fully matched
+    """
+    parts = []
+    if cls.lexical_length is not None:
+        min_length, max_length = cls.lexical_length
+        max_length = '' if max_length is None else max_length
+        parts.append(f"(?=[\\s\\S]{{{min_length},{max_length}}}\\Z)")
+    pattern = cls.lexical_pattern
+    if pattern is not None:
+        if isinstance(pattern, str):
+            parts.append(f"(?:{pattern})\\Z")
+        else:
+            flags = ''.join(char for flag, char in _scoped_flags if pattern.flags & flag)
+            parts.append(f"(?{flags}:{pattern.pattern})\\Z" if flags else f"(?:{pattern.pattern})\\Z")
+    return ''.join(parts) or None
+
 
 class StringSerializableRegistry:
     def __init__(self, *types: T_StringSerializable):
         self.types: List[T_StringSerializable] = list(types)
         self.replaces: Set[Tuple[T_StringSerializable, T_StringSerializable]] = set()
+        # Incremented on every change so caches of detected types could be invalidated
+        self.version = 0
+        self._dispatcher: Optional[Tuple[Pattern, List[Tuple[T_StringSerializable, Optional[str]]]]] = None
 
     def __iter__(self):
         return iter(self.types)
@@ -78,6 +117,8 @@ class StringSerializableRegistry:
             self.types.append(cls)
             for t in replace_types:
                 self.replaces.add((t, cls))
+            self.version += 1
+            self._dispatcher = None
             return cls
 
         if cls:
@@ -96,12 +137,54 @@ class StringSerializableRegistry:
         for base, replace in list(self.replaces):
             if replace is cls or base is cls:
                 self.replaces.remove((base, replace))
+        self.version += 1
+        self._dispatcher = None
 
     def remove_by_name(self, name: str):
         for cls in self.types[:]:
             if cls.__name__ == name or cls.actual_type.__name__ == name:
                 self.remove(cls)
 
+    def detect(self, value: str) -> Optional[T_StringSerializable]:
+        """
+        Return first registered class that can represent given value or None if there is no such class.
+        Lexical pre-checks of all classes are compiled into one regex so classes that
+        can not represent the value are skipped without calling their ``to_internal_value``.
+
+        :param value: some string literal
+        :return: StringSerializable class or None
+        """
+        if self._dispatcher is None:
+            self._dispatcher = self._compile_dispatcher()
+        regex, checks = self._dispatcher
+        match = regex.match(value) if isinstance(value, str) else None
+        for cls, group in checks:
+            if group is not None and match is not None and match.group(group) is None:
+                continue
+            try:
+                cls.to_internal_value(value)
+            except ValueError:
+                continue
+            return cls
+        return None
+
+    def _compile_dispatcher(self):
+        """
+        Build regex where each lexical check is an optional lookahead with named group
+        so after the single match call the group is set only if the value passed the check
+        """
+        parts = []
+        checks = []
+        for i, cls in enumerate(self.types):
+            source = _lexical_check_source(cls)
+            if source is None:
+                checks.append((cls, None))
+            else:
+                group = f"_{i}"
+                parts.append(f"(?:(?=(?P<{group}>{source}))|)")
+                checks.append((cls, group))
+        return re.compile(''.join(parts)), checks
+
     def resolve(self, *types: T_StringSerializable) -> Collection[T_StringSerializable]:
         """
         Return set of StringSerializable classes which can represent all classes from types argument.
@@ -133,6 +216,7 @@ registry = StringSerializableRegistry()
 @registry.add()
 class IntString(StringSerializable, int):
     actual_type = int
+    lexical_pattern = r'\s*[+-]?\d[\d_]*\s*'
 
     @classmethod
     def to_internal_value(cls, value: str) -> 'IntString':
@@ -145,6 +229,7 @@ class IntString(StringSerializable, int):
 @registry.add(replace_types=(IntString,))
 class FloatString(StringSerializable, float):
     actual_type = float
+    lexical_pattern = r'\s*[+-]?(?:[\d_]*\.?[\d_]*(?:[eE][+-]?[\d_]+)?|(?i:inf|infinity|nan))\s*'
 
     @classmethod
     def to_internal_value(cls, value: str) -> 'FloatString':
@@ -158,6 +243,7 @@ class FloatString(StringSerializable, float):
 class BooleanString(StringSerializable, int):
     # We can't extend bool class, but we can extend int with same result excepting isinstance and issubclass check
     actual_type = bool
+    lexical_pattern = r'(?i:true|false)'
 
     @classmethod
     def to_internal_value(cls, value: str) -> 'BooleanString':
@@ -0,0 +1,582 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .dynamic_typing import DDict, DList, DOptional, DUnion, MetaData, Null, StringLiteral, Unknown
+from .generator import MetadataGenerator, _static_types
+
+# Keys of list items and dict values paths. They are not strings so they can not clash with fields names.
+# Keys are compared by value because partial results of parallel generation are pickled
+LIST_ITEM = ('[]',)
+DICT_VALUE = ('{}',)
+
+T_PathKey = Union[str, Tuple[str]]
+
+# Kinds of union items (first element of structures stored in KeyTable)
+KIND, LITERAL, MODEL, LIST, DICT, UNION = range(6)
+
+# Metadata of data path is represented by tuple (key, items, is_union), where items are tuples
+# (key, kind, payload) in the order of MetadataGenerator unions. Payload of KIND item is a type,
+# of LITERAL item is frozenset of literals (None if overflowed), of MODEL item is dict {field name: value}
+# for data variants or tuple of (field name, PathStats) pairs for accumulated metadata
+# and payload of LIST and DICT items is a value of their items.
+T_Item = Tuple[int, int, Any]
+T_Value = Tuple[int, Tuple[T_Item, ...], bool]
+
+
+class KeyTable:
+    """
+    Hash-consing table of metadata structures. Structurally equal metadata (models, lists, unions, literals)
+    has the same integer key, so metadata is compared in constant time.
+    """
+    MAX_SIZE = 2 ** 16
+
+    def __init__(self):
+        self.ids: Dict[tuple, int] = {}
+        self.structs: List[tuple] = []
+        self.kinds: Dict[Any, T_Value] = {}
+        self.literals: Dict[Optional[frozenset], T_Value] = {}
+        self.literal_overflow = self.get((LITERAL, None))
+        self.str = self.kind(str)[0]
+        self.unknown = self.kind(Unknown)
+        self.empty_list = self.single(LIST, self.unknown)
+        self.empty_dict = self.single(DICT, self.unknown)
+
+    def __len__(self):
+        return len(self.structs)
+
+    def get(self, struct: tuple) -> int:
+        key = self.ids.get(struct)
+        if key is None:
+            key = self.ids[struct] = len(self.structs)
+            self.structs.append(struct)
+        return key
+
+    def kind(self, t) -> T_Value:
+        value = self.kinds.get(t)
+        if value is None:
+            key = self.get((KIND, t))
+            value = self.kinds[t] = (key, ((key, KIND, t),), False)
+        return value
+
+    def literal(self, literals: Optional[frozenset]) -> T_Value:
+        value = self.literals.get(literals)
+        if value is None:
+            overflowed = literals is None or (
+                    len(literals) > StringLiteral.MAX_LITERALS
+                    or any(len(s) >= StringLiteral.MAX_STRING_LENGTH for s in literals)
+            )
+            key = self.get((LITERAL, None if overflowed else literals))
+            value = self.literals[literals] = (key, ((key, LITERAL, None if overflowed else literals),), False)
+        return value
+
+    def single(self, kind: int, payload) -> T_Value:
+        """
+        Value of single list, dict (payload is a value of items) or model (payload is dict of fields values)
+        """
+        if kind == MODEL:
+            key = self.get((MODEL, frozenset([(name, False, value[0]) for name, value in payload.items()])))
+        else:
+            key = self.get((kind, payload[0]))
+        return key, ((key, kind, payload),), False
+
+    def union(self, *values: T_Value) -> T_Value:
+        """
+        Same as DUnion(*values): items are unique (first one is kept), literals are merged
+        and replaced with str if they are overflowed
+        """
+        items: Dict[int, T_Item] = {}
+        for _, value_items, _ in values:
+            for item in value_items:
+                if item[0] not in items:
+                    items[item[0]] = item
+        keys = []
+        literals = set()
+        use_literals = True
+        structs = self.structs
+        for key in items:
+            struct = structs[key]
+            if struct[0] == LITERAL:
+                if struct[1] is None:
+                    use_literals = False
+                else:
+                    literals.update(struct[1])
+            else:
+                if key == self.str:
+                    use_literals = False
+                keys.append(key)
+        if literals and use_literals:
+            literal = self.literal(frozenset(literals))[0]
+            if literal == self.literal_overflow:
+                use_literals = False
+            else:
+                keys.append(literal)
+        if not use_literals and self.str not in keys:
+            keys.append(self.str)
+        key = keys[0] if len(keys) == 1 else self.get((UNION, frozenset(keys)))
+        return key, tuple(items.values()), True
+
+    def rekey(self, value: T_Value) -> T_Value:
+        """
+        Build value of data variant (which keys are from other table) with keys of this table
+        """
+        items = []
+        for _, kind, payload in value[1]:
+            if kind == KIND:
+                item = self.kind(payload)
+            elif kind == LITERAL:
+                item = self.literal(payload)
+            elif kind == MODEL:
+                item = self.single(MODEL, {name: self.rekey(v) for name, v in payload.items()})
+            else:
+                item = self.single(kind, self.rekey(payload))
+            items.append(item)
+        if len(items) == 1 and not value[2]:
+            return items[0]
+        return self.union(*items)
+
+
+class PathStats:
+    """
+    Type observations of values that are located at the same data path
+    """
+    __slots__ = ('id', 'parent', 'key', 'count', 'kinds', 'literals', 'models',
+                 'lists', 'empty_lists', 'dicts', 'empty_dicts',
+                 'order', 'fields', 'overflowed', 'required', 'value', 'dirty')
+
+    def __init__(self, id: int, parent: Optional[int], key: Optional[T_PathKey]):
+        self.id = id
+        self.parent = parent
+        self.key = key
+        self.count = 0  # Number of values (for model fields it is the number of models where field is present)
+        self.kinds: Dict[Any, None] = {}  # Ordered set of primitive types and StringSerializable classes
+        self.literals: Optional[Set[str]] = set()  # None if literals are overflowed (str is added to kinds)
+        self.models = 0  # Number of dicts that are converted to models
+        self.lists = False
+        self.empty_lists = False
+        self.dicts = False
+        self.empty_dicts = False
+        # Order of kinds and model fields in the metadata of MetadataGenerator
+        self.order: List[Any] = []
+        self.fields: Dict[str, PathStats] = {}
+        self.overflowed = False  # Metadata is a single overflowed literal (it is not merged with anything yet)
+        self.required = 0  # Number of model fields that are present in all models
+        self.value: Optional[T_Value] = None  # Accumulated metadata (it is updated after each data variant)
+        self.dirty = False
+
+    def __getstate__(self):
+        # Values are rebuilt by the index which the stats are merged into
+        return {name: getattr(self, name) for name in self.__slots__ if name not in ('value', 'dirty')}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.value = None
+        self.dirty = False
+
+    def add_literal(self, value: str) -> bool:
+        """
+        :return: True if literals are changed
+        """
+        literals = self.literals
+        if literals is None or value in literals:
+            return False
+        literals.add(value)
+        if len(value) >= StringLiteral.MAX_STRING_LENGTH or len(literals) > StringLiteral.MAX_LITERALS:
+            self.literals = None
+            self.kinds[str] = None
+        return True
+
+    def update(self, other: 'PathStats'):
+        """
+        Merge observations of the other stats into this one
+        """
+        self.count += other.count
+        self.kinds.update(other.kinds)
+        if self.literals is not None:
+            if other.literals is None:
+                self.literals = None
+            else:
+                for value in other.literals:
+                    self.add_literal(value)
+        self.models += other.models
+        self.lists |= other.lists
+        self.empty_lists |= other.empty_lists
+        self.dicts |= other.dicts
+        self.empty_dicts |= other.empty_dicts
+
+
+class PathIndex:
+    """
+    Flat index of type observations. Each data path (i.e. ``a.b[].c``) has compact PathStats
+    which is looked up by (parent path id, key) pair, so data variants are not converted into metadata trees.
+    Metadata tree is built once from the whole index.
+
+    Types of unions and fields of models are ordered exactly as MetadataGenerator orders them.
+    It places types of the merged data variant first unless metadata is equal and merges nested models
+    and lists of unions (see ``MetadataGenerator._merge_partial_into`` and ``_compact``). So each data variant
+    is represented by tree of values (structures of keys from KeyTable) which is merged with accumulated values
+    of stats by the same rules, but only the order of kinds and fields is stored.
+    """
+
+    def __init__(self):
+        root = PathStats(0, None, None)
+        self.stats: List[PathStats] = [root]
+        self.index: Dict[Tuple[int, T_PathKey], PathStats] = {}
+        self.keys = KeyTable()
+        # Fields of the first data variant are not merged (and compacted) by MetadataGenerator
+        # until they are met again with other metadata, so these values are stored as is
+        self.initial: Dict[str, T_Value] = {}
+        self._dirty: List[PathStats] = []
+
+    def __setstate__(self, state):
+        # Values of stats are not pickled
+        self.__dict__.update(state)
+        self.rebuild()
+
+    @property
+    def root(self) -> PathStats:
+        return self.stats[0]
+
+    def child(self, parent: PathStats, key: T_PathKey) -> PathStats:
+        stats = self.index.get((parent.id, key))
+        if stats is None:
+            stats = PathStats(len(self.stats), parent.id, key)
+            self.stats.append(stats)
+            self.index[parent.id, key] = stats
+            self.changed(parent)
+        return stats
+
+    def changed(self, stats: PathStats):
+        """
+        Mark stats and all its parents to rebuild their values
+        """
+        while not stats.dirty:
+            stats.dirty = True
+            self._dirty.append(stats)
+            if stats.parent is None:
+                break
+            stats = self.stats[stats.parent]
+
+    def merge(self, fields: Dict[str, T_Value], first: bool):
+        """
+        Merge metadata of the root model fields (stats are already updated) as
+        ``MetadataGenerator._merge_partial_into`` does
+
+        :param first: True if this is the first merged metadata (it is stored as is)
+        """
+        root = self.root
+        for name, value in fields.items():
+            stats = self.child(root, name)
+            if name in root.fields:
+                old = self.initial.get(name) or stats.value
+                if old[0] == value[0]:
+                    continue
+                self.initial.pop(name, None)
+                self._compact(stats, self.keys.union(value, old))
+            else:
+                root.fields[name] = stats
+                self._compact(stats, value)
+                if first:
+                    self.initial[name] = value
+        self._rebuild_dirty()
+
+    def update(self, other: 'PathIndex') -> 'PathIndex':
+        """
+        Merge other index into this one (in-place)
+        """
+        first = not self.root.count
+        other.rebuild(self.keys)
+        ids = {0: self.root}
+        self.root.update(other.root)
+        # Parent path is always added to the index before its children
+        for (parent, key), stats in other.index.items():
+            own = self.child(ids[parent], key)
+            own.update(stats)
+            self.changed(own)
+            ids[stats.id] = own
+
+        fields = {}
+        for name, stats in other.root.fields.items():
+            fields[name] = other.initial.get(name) or stats.value
+        self.merge(fields, first=False)
+        if first:
+            self.initial = {name: value for name, value in fields.items() if name in other.initial}
+        self.rebuild()
+        return self
+
+    def rebuild(self, keys: KeyTable = None):
+        """
+        Rebuild values of all stats (i.e. if keys table is changed)
+        """
+        if keys is not None and keys is not self.keys:
+            self.keys = keys
+            self.initial = {name: keys.rekey(value) for name, value in self.initial.items()}
+        for stats in reversed(self.stats):
+            if stats.fields:
+                stats.required = sum(child.count == stats.models for child in stats.fields.values())
+            stats.value = self._value(stats)
+            stats.dirty = False
+        self._dirty = []
+
+    def _rebuild_dirty(self):
+        # Children are created after parents so they have greater ids
+        self._dirty.sort(key=lambda stats: stats.id, reverse=True)
+        for stats in self._dirty:
+            stats.value = self._value(stats)
+            stats.dirty = False
+        self._dirty = []
+
+    def _value(self, stats: PathStats) -> T_Value:
+        """
+        Build accumulated metadata value of stats
+        """
+        keys = self.keys
+        if stats.overflowed:
+            return keys.literal(None)
+        items = []
+        for t in (*stats.order, *(t for t in stats.kinds if t not in stats.order)):
+            items.append(keys.kind(t))
+        if stats.literals:
+            items.append(keys.literal(frozenset(stats.literals)))
+        if stats.models:
+            key = keys.get((MODEL, frozenset([
+                (name, child.count < stats.models, child.value[0])
+                for name, child in stats.fields.items()
+            ])))
+            items.append((key, ((key, MODEL, tuple(stats.fields.items())),), False))
+        for has_items, is_empty, path_key, kind in (
+                (stats.lists, stats.empty_lists, LIST_ITEM, LIST),
+                (stats.dicts, stats.empty_dicts, DICT_VALUE, DICT)
+        ):
+            if has_items:
+                nested = self.index[stats.id, path_key].value
+                items.append(keys.single(kind, keys.union(nested, keys.unknown) if is_empty else nested))
+            elif is_empty:
+                items.append(keys.empty_list if kind == LIST else keys.empty_dict)
+        if len(items) == 1:
+            return items[0]
+        return keys.union(*items)
+
+    def _compact(self, stats: PathStats, value: T_Value):
+        """
+        Update order of kinds and fields of the stats as ``MetadataGenerator._compact`` orders merged metadata
+        """
+        if value is stats.value:
+            return
+        order = []
+        models = []
+        lists = []
+        dicts = []
+        for key, kind, payload in value[1]:
+            if kind == KIND:
+                if payload is not Unknown:
+                    order.append(payload)
+            elif kind == MODEL:
+                models.append(payload)
+            elif kind == LIST:
+                lists.append(payload)
+            elif kind == DICT:
+                dicts.append(payload)
+        overflowed = not value[2] and value[0] == self.keys.literal_overflow
+        if order != stats.order or overflowed != stats.overflowed:
+            stats.order = order
+            stats.overflowed = overflowed
+            self.changed(stats)
+        if models:
+            self._merge_models(stats, models)
+        for values, path_key in ((lists, LIST_ITEM), (dicts, DICT_VALUE)):
+            if not values:
+                continue
+            nested = values[0] if len(values) == 1 else self.keys.union(*values)
+            if nested[0] != self.keys.unknown[0]:
+                self._compact(self.index[stats.id, path_key], nested)
+
+    def _merge_models(self, stats: PathStats, models: List[Union[dict, tuple]]):
+        """
+        Same as ``MetadataGenerator.merge_partials``. Fields are ordered by the first model which has them.
+        Values of the field are merged one by one and the next value is placed first unless it is equal
+        to merged ones.
+        """
+        fields: Dict[str, T_Value] = {}
+        for model in models:
+            for name, value in (model.items() if isinstance(model, dict) else model):
+                if not isinstance(value, tuple):
+                    value = value.value
+                merged = fields.get(name)
+                if merged is None:
+                    fields[name] = value
+                elif merged[0] != value[0]:
+                    fields[name] = self.keys.union(value, merged)
+        if list(fields) != list(stats.fields):
+            stats.fields = {name: self.index[stats.id, name] for name in fields}
+            self.changed(stats)
+        for name, value in fields.items():
+            self._compact(stats.fields[name], value)
+
+    def paths(self) -> Iterator[Tuple[str, PathStats]]:
+        """
+        Iterate over (dot separated path, stats) pairs
+        """
+        names = {0: ""}
+        for (parent, key), stats in self.index.items():
+            prefix = names[parent]
+            if key == LIST_ITEM or key == DICT_VALUE:
+                name = prefix + key[0]
+            else:
+                name = f"{prefix}.{key}" if prefix else key
+            names[stats.id] = name
+            yield name, stats
+
+    def to_field_set(self) -> Dict[str, MetaData]:
+        """
+        Build metadata (not optimized) of the root model
+        """
+        return self._build_model(self.root)
+
+    def _build_model(self, stats: PathStats) -> Dict[str, MetaData]:
+        fields = {}
+        for name, child in stats.fields.items():
+            meta = self._build(child)
+            fields[name] = meta if child.count == stats.models else DOptional(meta)
+        return fields
+
+    def _build(self, stats: PathStats) -> MetaData:
+        types: List[MetaData] = [*stats.order, *(t for t in stats.kinds if t not in stats.order)]
+        if stats.literals:
+            types.append(StringLiteral(stats.literals))
+        if stats.models:
+            types.append(self._build_model(stats))
+        for has_items, is_empty, key, cls in (
+                (stats.lists, stats.empty_lists, LIST_ITEM, DList),
+                (stats.dicts, stats.empty_dicts, DICT_VALUE, DDict)
+        ):
+            if has_items:
+                nested = self._build(self.index[stats.id, key])
+                types.append(cls(DUnion(nested, Unknown) if is_empty else nested))
+            elif is_empty:
+                types.append(cls(Unknown))
+        if len(types) == 1:
+            return types[0]
+        return DUnion(*types)
+
+
+class FlatMetadataGenerator(MetadataGenerator):
+    """
+    Alternative metadata extraction engine. Data variants are accumulated in the flat PathIndex
+    instead of merging metadata trees of each data variant. The result is the same as the result of
+    MetadataGenerator (including the order of fields and types in unions).
+    """
+
+    def _accumulate(self, fields: Optional[PathIndex], data: dict, paths=None) -> PathIndex:
+        first = fields is None
+        if first:
+            fields = PathIndex()
+        elif len(fields.keys) > fields.keys.MAX_SIZE:
+            fields.rebuild(KeyTable())
+        root = fields.root
+        root.count += 1
+        value = self._observe_model(fields, root, data)
+        fields.merge(value[1][0][2], first)
+        return fields
+
+    def _merge_fields(self, fields: Optional[PathIndex], other: PathIndex) -> PathIndex:
+        if fields is None:
+            return other
+        return fields.update(other)
+
+    def _finalize(self, fields: Optional[PathIndex]) -> dict:
+        return self.optimize_type(fields.to_field_set() if fields is not None else {})
+
+    def _observe_model(self, index: PathIndex, stats: PathStats, data: dict) -> T_Value:
+        models = stats.models
+        stats.models += 1
+        if not models:
+            index.changed(stats)
+        required = 0
+        fields = {}
+        for key, value in data.items():
+            if not isinstance(key, str):
+                raise TypeError(f'You are probably using a parser that is not JSON compatible and have data with some {type(key)}s as dict keys. '
+                                f'This is not supported.\n'
+                                f'Context: {data}\n'
+                                f'(If you are parsing yaml, try replacing PyYaml with ruamel.yaml)')
+            child = index.child(stats, key)
+            if child.count == models:
+                required += 1
+            fields[key] = self._observe(index, child, value, key not in self.dict_keys_fields)
+        # Some of required fields are missing so they become optional
+        if required < stats.required:
+            index.changed(stats)
+        stats.required = required
+        return index.keys.single(MODEL, fields)
+
+    def _observe(self, index: PathIndex, stats: PathStats, value, convert_dict=True) -> T_Value:
+        """
+        Update stats of the value path and return metadata value of the value
+        (same type detection as in MetadataGenerator._detect_type)
+        """
+        stats.count += 1
+        keys = index.keys
+        t = type(value)
+        if t in _static_types:
+            if t not in stats.kinds:
+                stats.kinds[t] = None
+                index.changed(stats)
+            return keys.kind(t)
+
+        elif t is list:
+            if value:
+                if not stats.lists:
+                    stats.lists = True
+                    index.changed(stats)
+                item = index.child(stats, LIST_ITEM)
+                return keys.single(LIST, self._observe_items(index, item, value))
+            if not stats.empty_lists:
+                stats.empty_lists = True
+                index.changed(stats)
+            return keys.empty_list
+
+        elif isinstance(value, dict):
+            if not value:
+                if not stats.empty_dicts:
+                    stats.empty_dicts = True
+                    index.changed(stats)
+                return keys.empty_dict
+            for reg in self.dict_keys_regex:
+                if all(map(reg.match, value.keys())):
+                    convert_dict = False
+                    break
+
+            if convert_dict:
+                return self._observe_model(index, stats, value)
+            if not stats.dicts:
+                stats.dicts = True
+                index.changed(stats)
+            item = index.child(stats, DICT_VALUE)
+            return keys.single(DICT, self._observe_items(index, item, value.values()))
+
+        elif value is None:
+            if Null not in stats.kinds:
+                stats.kinds[Null] = None
+                index.changed(stats)
+            return keys.kind(Null)
+
+        elif stats.literals is None:
+            # Detection is skipped if literals are overflowed because result type is str anyway
+            return keys.kind(str)
+
+        else:
+            t = self._get_string_cache()(value)
+            if t is None:
+                if stats.add_literal(value):
+                    index.changed(stats)
+                return keys.literal(frozenset((value,)))
+            if t not in stats.kinds:
+                stats.kinds[t] = None
+                index.changed(stats)
+            return keys.kind(t)
+
+    def _observe_items(self, index: PathIndex, stats: PathStats, values: Iterable) -> T_Value:
+        items = [self._observe(index, stats, x) for x in values]
+        if len(items) == 1:
+            return items[0]
+        return index.keys.union(*items)
@@ -1,5 +1,9 @@
 import re
-from typing import Any, Callable, List, Optional, Pattern, Union
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Set, Type, Union
 
 from .dynamic_typing import (
     ComplexType,
@@ -7,6 +11,7 @@ from .dynamic_typing import (
     DList,
     DOptional,
     DUnion,
+    InternTable,
     MetaData,
     ModelPtr,
     Null,
@@ -21,14 +26,108 @@ from .dynamic_typing import (
 _static_types = {float, bool, int}
 
 
+class FieldSetPartial:
+    """
+    Intermediate result of fields sets merging. Fields metadata is stored without DOptional wrapper,
+    instead the number of sets where the field is present is counted. Field becomes optional only
+    when partial is converted back to fields set and its presence count is less than number of merged sets.
+    So partials could be merged in any order and grouping and produce the same result
+    (empty partial is the identity element).
+    """
+    __slots__ = ('count', 'fields', 'presence')
+
+    def __init__(self, count: int = 0, fields: Dict[str, MetaData] = None, presence: Dict[str, int] = None):
+        """
+        :param count: Number of merged fields sets
+        :param fields: Fields metadata (never wrapped in DOptional)
+        :param presence: Number of fields sets where the field is present (as a required one)
+        """
+        self.count = count
+        self.fields = fields if fields is not None else {}
+        self.presence = presence if presence is not None else {}
+
+    @classmethod
+    def from_field_set(cls, field_set: Dict[str, MetaData]) -> 'FieldSetPartial':
+        fields = {}
+        presence = {}
+        for name, meta in field_set.items():
+            if isinstance(meta, DOptional):
+                fields[name] = meta.type
+                presence[name] = 0
+            else:
+                fields[name] = meta
+                presence[name] = 1
+        return cls(1, fields, presence)
+
+    def to_field_set(self) -> Dict[str, MetaData]:
+        return {
+            name: meta if self.presence[name] == self.count else DOptional(meta)
+            for name, meta in self.fields.items()
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, FieldSetPartial):
+            return NotImplemented
+        return (self.count, self.fields, self.presence) == (other.count, other.fields, other.presence)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} count={self.count} fields={self.fields!r} presence={self.presence!r}>"
+
+
+class PathState:
+    """
+    State of type detection of string values that are located at the same path of data variants
+    (fields of models, items of lists and values of dicts have own child states).
+    Path becomes saturated when its values can be represented only by str type
+    (some literal is too long or there are too many different literals), so the type of the following values
+    at this path does not affect the result and detection could be skipped.
+    """
+    __slots__ = ('fields', 'list_item', 'dict_value', 'literals', 'saturated')
+
+    def __init__(self):
+        self.fields: Dict[str, PathState] = {}
+        self.list_item: Optional[PathState] = None
+        self.dict_value: Optional[PathState] = None
+        self.literals: Optional[Set[str]] = set()
+        self.saturated = False
+
+    def field(self, name: str) -> 'PathState':
+        state = self.fields.get(name)
+        if state is None:
+            state = self.fields[name] = PathState()
+        return state
+
+    def item(self) -> 'PathState':
+        if self.list_item is None:
+            self.list_item = PathState()
+        return self.list_item
+
+    def value(self) -> 'PathState':
+        if self.dict_value is None:
+            self.dict_value = PathState()
+        return self.dict_value
+
+    def add_literal(self, literal: StringLiteral):
+        if literal.overflowed:
+            self.saturated = True
+        else:
+            self.literals.update(literal.literals)
+            self.saturated = len(self.literals) > StringLiteral.MAX_LITERALS
+        if self.saturated:
+            self.literals = None
+
+
 class MetadataGenerator:
     CONVERTER_TYPE = Optional[Callable[[str], Any]]
+    PARALLEL_CHUNK_SIZE = 500
+    STRING_CACHE_SIZE = 2 ** 16
 
     def __init__(
             self,
             str_types_registry: StringSerializableRegistry = None,
             dict_keys_regex: List[Union[Pattern, str]] = None,
-            dict_keys_fields: List[str] = None
+            dict_keys_fields: List[str] = None,
+            string_cache_size: int = None
     ):
         """
 
@@ -37,22 +136,183 @@ class MetadataGenerator:
             If all keys of some dict are match one of them then this dict will be marked as dict field
             but not nested model.
         :param dict_keys_fields: List of model fields names that will be marked as dict field
+        :param string_cache_size: Max number of string values which detected types are cached
+            (STRING_CACHE_SIZE by default, 0 disables caching)
         """
         self.str_types_registry = str_types_registry if str_types_registry is not None else registry
         self.dict_keys_regex = [re.compile(r) for r in dict_keys_regex] if dict_keys_regex else []
         self.dict_keys_fields = set(dict_keys_fields or ())
+        self.string_cache_size = string_cache_size if string_cache_size is not None else self.STRING_CACHE_SIZE
+        self._fields: Optional[FieldSetPartial] = None
+        self._paths: Optional[PathState] = None
+        self._string_cache = None
+        self._string_cache_version = None
+        # Shared metadata nodes (lists, dicts and unions of simple types)
+        self.intern_table = InternTable()
 
     def generate(self, *data_variants: dict) -> dict:
         """
         Convert given list of data variants to metadata dict
         """
-        fields_sets = [self._convert(data) for data in data_variants]
-        fields = self.merge_field_sets(fields_sets)
-        return self.optimize_type(fields)
+        fields = None
+        paths = PathState()
+        for data in data_variants:
+            fields = self._accumulate(fields, data, paths)
+        return self._finalize(fields)
 
-    def _convert(self, data: dict):
+    def generate_parallel(self, data_variants: Iterable[dict], jobs: int, chunk_size: int = None) -> dict:
+        """
+        Same as ``generate`` but data variants are split into chunks which are converted and merged
+        by pool of ``jobs`` worker processes. Partial results are merged in the original order
+        so the result is the same as the result of the ``generate`` method.
+
+        :param data_variants: Iterable of data variants (consumed lazily)
+        :param jobs: Number of worker processes
+        :param chunk_size: Number of data variants that are sent to the worker at once
+        :return: Metadata dict
+        """
+        chunk_size = chunk_size or self.PARALLEL_CHUNK_SIZE
+        iterator = iter(data_variants)
+        fields = None
+        # Generator is sent to each worker once, so workers keep their string types caches between chunks
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(self,)) as executor:
+            futures = deque()
+            while True:
+                # Keep limited number of chunks in flight so data variants are not loaded into memory at once
+                while len(futures) < jobs * 2:
+                    chunk = list(islice(iterator, chunk_size))
+                    if not chunk:
+                        break
+                    futures.append(executor.submit(_generate_partial, chunk))
+                if not futures:
+                    break
+                partial = futures.popleft().result()
+                if partial is not None:
+                    fields = self._merge_fields(fields, partial)
+        return self._finalize(fields)
+
+    def feed(self, data: dict):
+        """
+        Merge data variant into accumulated metadata. Data variant is not referenced after this call
+        so memory usage depends only on the size of models schema but not on the number of data variants.
+        """
+        if self._paths is None:
+            self._paths = PathState()
+        self._fields = self._accumulate(self._fields, data, self._paths)
+
+    def result(self) -> dict:
+        """
+        Return metadata dict of all data variants passed to ``feed`` method and reset accumulator
+        """
+        fields, self._fields = self._fields, None
+        self._paths = None
+        return self._finalize(fields)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Accumulator and cache are not shared with worker processes
+        state['_fields'] = None
+        state['_paths'] = None
+        state['_string_cache'] = None
+        state['_string_cache_version'] = None
+        state['intern_table'] = InternTable(self.intern_table.max_size)
+        return state
+
+    def string_cache_info(self):
+        """
+        Return statistics (hits, misses, maxsize, currsize) of the cache of detected string types
+        """
+        return self._get_string_cache().cache_info()
+
+    def _get_string_cache(self):
+        """
+        Return cached version of ``_detect_string_type`` method. Cache is reset if registry has been changed.
+        """
+        if self._string_cache is None or self._string_cache_version != self.str_types_registry.version:
+            self._string_cache = lru_cache(maxsize=self.string_cache_size)(self._detect_string_type)
+            self._string_cache_version = self.str_types_registry.version
+        return self._string_cache
+
+    def _accumulate(self, fields: Optional[FieldSetPartial], data: dict, paths: PathState = None) \
+            -> FieldSetPartial:
+        """
+        Merge data variant into fields set partial
+
+        :param paths: Detection state of all data variants merged into ``fields``
+        """
+        return self._merge_fields(fields, FieldSetPartial.from_field_set(self._convert(data, paths)))
+
+    def _merge_fields(self, fields: Optional[FieldSetPartial], other: FieldSetPartial) -> FieldSetPartial:
+        """
+        Merge partial (converted data variant or merged chunk of data variants) into accumulated one.
+        Accumulated partial is updated in-place.
+        """
+        if fields is None:
+            return other
+        return self._merge_partial_into(fields, other, compact=True)
+
+    def _finalize(self, fields: Optional[FieldSetPartial]) -> dict:
+        return self.optimize_type(fields.to_field_set() if fields is not None else {})
+
+    def _compact(self, meta: MetaData) -> MetaData:
+        """
+        Merge nested models, lists and dicts of unions into single type.
+        This is the same merging that optimize_type method does, so accumulated unions do not grow
+        with the number of data variants.
+        """
+        if isinstance(meta, dict):
+            return {k: self._compact(v) for k, v in meta.items()}
+
+        elif isinstance(meta, DUnion):
+            types: List[MetaData] = []
+            models: List[dict] = []
+            iterables = {DList: [], DDict: []}
+            for item in meta.types:
+                if isinstance(item, dict):
+                    if not models:
+                        types.append(models)
+                    models.append(item)
+                elif type(item) in iterables:
+                    if not iterables[type(item)]:
+                        types.append(iterables[type(item)])
+                    iterables[type(item)].append(item)
+                else:
+                    types.append(item)
+
+            for i, item in enumerate(types):
+                if item is models:
+                    types[i] = self._compact(self._merge_models(models) if len(models) > 1 else models[0])
+                elif item is iterables[DList] or item is iterables[DDict]:
+                    types[i] = self._compact(
+                        type(item[0])(self.intern_table.union(*(t.type for t in item))) if len(item) > 1 else item[0]
+                    )
+            if len(types) == 1:
+                return types[0]
+            return self.intern_table.union(*types)
+
+        elif isinstance(meta, (DOptional, DList, DDict)):
+            t = self._compact(meta.type)
+            if isinstance(meta, DOptional) and isinstance(t, DOptional):
+                return t
+            if t is meta.type:
+                return meta
+            return self.intern_table.single(type(meta), t)
+
+        return meta
+
+    def _merge_models(self, models: List[dict]) -> dict:
+        """
+        Merge nested models of accumulated union. Models could be already merged (and have optional fields)
+        so they are merged by presence counts. Field is optional if it is missing or optional in any model,
+        as it would be if all data variants of these models were merged at once.
+        """
+        return self.merge_partials(*map(FieldSetPartial.from_field_set, models)).to_field_set()
+
+    def _convert(self, data: dict, path: PathState = None):
         """
         Key and string value converting
+
+        :param path: Detection state of data path (state is not tracked if None)
         """
         fields = {}
         for key, value in data.items():
@@ -62,12 +322,14 @@ class MetadataGenerator:
                                 f'Context: {data}\n'
                                 f'(If you are parsing yaml, try replacing PyYaml with ruamel.yaml)')
             convert_dict = key not in self.dict_keys_fields
-            fields[key] = self._detect_type(value, convert_dict)
+            fields[key] = self._detect_type(value, convert_dict, path.field(key) if path is not None else None)
         return fields
 
-    def _detect_type(self, value, convert_dict=True) -> MetaData:
+    def _detect_type(self, value, convert_dict=True, path: PathState = None) -> MetaData:
         """
         Converts json value to metadata
+
+        :param path: Detection state of value path (state is not tracked if None)
         """
         # Simple types
         t = type(value)
@@ -77,37 +339,39 @@ class MetadataGenerator:
         # List trying to yield nested type
         elif t is list:
             if value:
-                types = [self._detect_type(item) for item in value]
+                item_path = path.item() if path is not None else None
+                types = [self._detect_type(item, path=item_path) for item in value]
                 if len(types) > 1:
-                    union = DUnion(*types)
+                    union = self.intern_table.union(*types)
                     if len(union.types) == 1:
-                        return DList(*union.types)
-                    return DList(union)
+                        return self.intern_table.single(DList, *union.types)
+                    return self.intern_table.single(DList, union)
                 else:
-                    return DList(*types)
+                    return self.intern_table.single(DList, *types)
             else:
-                return DList(Unknown)
+                return self.intern_table.single(DList, Unknown)
 
         # Dict should be processed as another model if convert_dict is enabled
         elif isinstance(value, dict):
             if not value:
-                return DDict(Unknown)
+                return self.intern_table.single(DDict, Unknown)
             for reg in self.dict_keys_regex:
                 if all(map(reg.match, value.keys())):
                     convert_dict = False
                     break
 
             if convert_dict:
-                return self._convert(value)
+                return self._convert(value, path)
             else:
-                types = [self._detect_type(item) for item in value.values()]
+                value_path = path.value() if path is not None else None
+                types = [self._detect_type(item, path=value_path) for item in value.values()]
                 if len(types) > 1:
-                    union = DUnion(*types)
+                    union = self.intern_table.union(*types)
                     if len(union.types) == 1:
-                        return DDict(*union.types)
-                    return DDict(union)
+                        return self.intern_table.single(DDict, *union.types)
+                    return self.intern_table.single(DDict, union)
                 else:
-                    return DDict(*types)
+                    return self.intern_table.single(DDict, *types)
 
         # null interpreted as is and will be processed later on Union merge stage
         elif value is None:
@@ -115,13 +379,21 @@ class MetadataGenerator:
 
         # string types trying to convert to other string-serializable types
         else:
-            for t in self.str_types_registry:
-                try:
-                    value = t.to_internal_value(value)
-                except ValueError:
-                    continue
-                return t
-            return StringLiteral({value})
+            if path is not None and path.saturated:
+                return str
+            t = self._get_string_cache()(value)
+            if t is None:
+                t = self.intern_table.literal((value,))
+                if path is not None:
+                    path.add_literal(t)
+            return t
+
+    def _detect_string_type(self, value: str) -> Optional[Type[StringSerializable]]:
+        """
+        Return first StringSerializable class from registry that can represent given value
+        or None if value is a string literal
+        """
+        return self.str_types_registry.detect(value)
 
     def merge_field_sets(self, field_sets: List[MetaData]) -> MetaData:
         """
@@ -171,6 +443,44 @@ class MetadataGenerator:
             first = False
         return fields
 
+    def merge_partials(self, *partials: FieldSetPartial) -> FieldSetPartial:
+        """
+        Merge fields sets partials into new one. This operation is associative so partials of
+        any groups of fields sets could be merged in any order (result fields sets will be equal).
+        """
+        result = FieldSetPartial()
+        for partial in partials:
+            self._merge_partial_into(result, partial)
+        return result
+
+    def _merge_partial_into(self, target: FieldSetPartial, other: FieldSetPartial,
+                            compact=False) -> FieldSetPartial:
+        """
+        Merge ``other`` partial into ``target`` in-place.
+
+        :param compact: Compact changed fields (see ``_compact`` method)
+        """
+        target.count += other.count
+        fields = target.fields
+        presence = target.presence
+        for name, field in other.fields.items():
+            if name in fields:
+                field_original = fields[name]
+                presence[name] += other.presence[name]
+                if field_original == field:
+                    continue
+                # Types of the merged set are placed first
+                field = self.intern_table.union(
+                    *(field.types if isinstance(field, DUnion) else [field]),
+                    *(field_original.types if isinstance(field_original, DUnion) else [field_original])
+                )
+                if len(field) == 1:
+                    field = field.types[0]
+            else:
+                presence[name] = other.presence[name]
+            fields[name] = self._compact(field) if compact else field
+        return target
+
     def optimize_type(self, meta: MetaData, process_model_ptr=False) -> MetaData:
         """
         Finds some redundant types and replace them with a simpler one
@@ -274,3 +584,28 @@ class MetadataGenerator:
             meta_type = types[0]
 
         return meta_type
+
+
+# Generator of MetadataGenerator.generate_parallel worker process
+_worker_generator: Optional[MetadataGenerator] = None
+
+
+def _init_worker(generator: MetadataGenerator):
+    """
+    Initializer of MetadataGenerator.generate_parallel workers
+    """
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _generate_partial(data_variants: List[dict]) -> Optional[FieldSetPartial]:
+    """
+    Worker of MetadataGenerator.generate_parallel. Convert and merge chunk of data variants.
+    Result is not optimized so it could be merged with results of other chunks.
+    """
+    generator = _worker_generator
+    fields = None
+    paths = PathState()
+    for data in data_variants:
+        fields = generator._accumulate(fields, data, paths)
+    return fields
@@ -0,0 +1,271 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Generator, List, TextIO, Union
+
+CHUNK_SIZE = 64 * 1024
+
+_whitespace_re = re.compile(r'[ \t\n\r]*')
+_structure_re = re.compile(r'[\[\]{}"]')
+_scalar_re = re.compile(r'[^ \t\n\r,:\[\]{}"]*')
+_decoder = json.JSONDecoder()
+
+
+class JsonStreamReader:
+    """
+    Incremental JSON reader. Reads file by chunks and keeps in memory only the part of the document
+    that is currently processed, so siblings of the looked-up value are skipped without being built
+    and array items are decoded one by one.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.mark = None  # Start of the value that is being read (buffer data after it is kept)
+        self.eof = False
+
+    def _fill(self):
+        """
+        Read next chunk into the buffer. Data before current position (or before mark) is dropped.
+        Chunk size grows with the kept data so reading of a large value takes linear time.
+        """
+        if self.eof:
+            raise ValueError("Unexpected end of JSON data")
+        drop = self.pos if self.mark is None else self.mark
+        chunk = self.fp.read(max(self.chunk_size, len(self.buffer) - drop))
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[drop:] + chunk
+        self.pos -= drop
+        if self.mark is not None:
+            self.mark -= drop
+
+    def peek(self) -> str:
+        """
+        Skip whitespaces and return next character without consuming it. Returns empty string at the end of data.
+        """
+        while True:
+            self.pos = _whitespace_re.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, chars: str) -> str:
+        """
+        Consume next non-whitespace character and ensure that it is one of ``chars``
+        """
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Invalid JSON: expected one of {chars!r}, got {ch or 'end of data'!r}")
+        self.pos += 1
+        return ch
+
+    def _skip_string(self):
+        """
+        Move position to the end of the string which opening quote is at current position
+        """
+        i = self.pos + 1
+        while True:
+            j = self.buffer.find('"', i)
+            if j == -1:
+                i = len(self.buffer) - self.pos
+                self._fill()
+                i += self.pos
+                continue
+            k = j
+            while self.buffer[k - 1] == '\\':
+                k -= 1
+            if (j - k) % 2 == 0:
+                self.pos = j + 1
+                return
+            i = j + 1
+
+    def _skip_scalar(self):
+        while True:
+            self.pos = _scalar_re.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return
+            self._fill()
+
+    def _skip_container(self):
+        depth = 0
+        self.pos += 1
+        while True:
+            match = _structure_re.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                self._fill()
+                continue
+            ch = match.group()
+            self.pos = match.start()
+            if ch == '"':
+                self._skip_string()
+                continue
+            self.pos += 1
+            if ch in '{[':
+                depth += 1
+            elif depth:
+                depth -= 1
+            else:
+                return
+
+    def read_raw_value(self) -> str:
+        """
+        Move position to the end of the next value without building it
+
+        :return: Raw JSON of the value
+        """
+        ch = self.peek()
+        if not ch:
+            raise ValueError("Unexpected end of JSON data")
+        self.mark = self.pos
+        try:
+            if ch == '"':
+                self._skip_string()
+            elif ch in '{[':
+                self._skip_container()
+            else:
+                self._skip_scalar()
+            return self.buffer[self.mark:self.pos]
+        finally:
+            self.mark = None
+
+    def skip_value(self):
+        self.read_raw_value()
+
+    def read_value(self) -> Any:
+        """
+        Decode next value
+        """
+        if self.peek():
+            # Fast path: value is already in the buffer
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                pass
+            else:
+                # Number at the end of the buffer could be truncated
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+        return json.loads(self.read_raw_value())
+
+    def read_key(self) -> str:
+        if self.peek() != '"':
+            self.expect('"')
+        key = self.read_value()
+        self.expect(':')
+        return key
+
+
+def _value_type(reader: JsonStreamReader) -> type:
+    """
+    Consume next value and return its type. Containers are skipped without being built.
+    """
+    ch = reader.peek()
+    if ch == '[':
+        reader.skip_value()
+        return list
+    if ch == '{':
+        reader.skip_value()
+        return dict
+    return type(reader.read_value())
+
+
+def _find_last_keys(reader: JsonStreamReader, keys: List[str]) -> Union[List[int], Exception]:
+    """
+    Scan the whole dict at current position (it is consumed) and find the last occurrence of the lookup path
+    in it, as ``json.load`` keeps the last value of duplicated keys.
+
+    :return: Ordinal of the used occurrence among occurrences of the key for each lookup level
+        or exception that would be raised by lookup in the loaded data
+    """
+    key = keys[0]
+    result = None
+    count = 0
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        return KeyError(key)
+    while True:
+        name = reader.read_key()
+        if name != key:
+            reader.skip_value()
+        elif len(keys) == 1:
+            reader.skip_value()
+            result = [count]
+            count += 1
+        else:
+            if reader.peek() == '{':
+                nested = _find_last_keys(reader, keys[1:])
+                result = [count] + nested if isinstance(nested, list) else nested
+            else:
+                result = TypeError(f'dict is expected to lookup key {keys[1]!r}, not {_value_type(reader)}')
+            count += 1
+        if reader.expect(',}') == '}':
+            break
+    return KeyError(key) if result is None else result
+
+
+def iter_json_stream(fp: TextIO, lookup: str, chunk_size: int = CHUNK_SIZE) \
+        -> Generator[Union[dict, list], Any, None]:
+    """
+    Streaming version of ``iter_json_file``. Perform lookup while reading file incrementally
+    and yield items of the found list one by one (or found dict itself).
+    Like ``json.load``, the last value of duplicated keys is used. To find it the file is scanned twice
+    (values are skipped without being built during first scan), so ``fp`` has to be seekable if lookup is set.
+
+    :param fp: Text file object
+    :param lookup: Dot separated lookup path
+    :param chunk_size: Size of read chunk
+    :return: Generator of the model data
+    """
+    keys: List[str] = lookup.split('.') if lookup and lookup != '-' else []
+    start = fp.tell() if keys else None
+    reader = JsonStreamReader(fp, chunk_size)
+    if keys:
+        if reader.peek() != '{':
+            raise TypeError(f'dict is expected to lookup key {keys[0]!r}, not {_value_type(reader)}')
+        ordinals = _find_last_keys(reader, keys)
+        if isinstance(ordinals, Exception):
+            raise ordinals
+        fp.seek(start)
+        reader = JsonStreamReader(fp, chunk_size)
+        for key, ordinal in zip(keys, ordinals):
+            reader.expect('{')
+            while True:
+                name = reader.read_key()
+                if name == key:
+                    if not ordinal:
+                        break
+                    ordinal -= 1
+                reader.skip_value()
+                reader.expect(',')
+
+    ch = reader.peek()
+    if ch == '[':
+        reader.expect('[')
+        if reader.peek() == ']':
+            return
+        while True:
+            yield reader.read_value()
+            if reader.expect(',]') == ']':
+                break
+    elif ch == '{':
+        yield reader.read_value()
+    else:
+        raise TypeError(f'dict or list is expected at {lookup if lookup != "-" else "JSON root"}, '
+                        f'not {type(reader.read_value())}')
+
+
+def iter_json_stream_file(path: Path, lookup: str, chunk_size: int = CHUNK_SIZE) \
+        -> Generator[Union[dict, list], Any, None]:
+    """
+    Open file and perform streaming lookup. Does not open file until iteration is started.
+    """
+    with path.open() as fp:
+        yield from iter_json_stream(fp, lookup, chunk_size)
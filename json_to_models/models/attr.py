@@ -1,7 +1,8 @@
 from inspect import isclass
 from typing import List, Tuple
 
-from .base import GenericModelCodeGenerator, KWAGRS_TEMPLATE, METADATA_FIELD_NAME, sort_kwargs, template
+from .base import (GenericModelCodeGenerator, KWAGRS_TEMPLATE, METADATA_FIELD_NAME, render, render_kwargs, sort_kwargs,
+                   template)
 from ..dynamic_typing import DDict, DList, DOptional, ImportPathList, MetaData, ModelMeta, StringLiteral, StringSerializable
 
 DEFAULT_ORDER = (
@@ -11,9 +12,17 @@ DEFAULT_ORDER = (
 )
 
 
+def _render_decorator(kwargs=None, **_) -> str:
+    return f"attr.s({render_kwargs(kwargs)})" if kwargs else "attr.s"
+
+
+def _render_field(kwargs=None, **_) -> str:
+    return f"attr.ib({render_kwargs(kwargs or {})})"
+
+
 class AttrsModelCodeGenerator(GenericModelCodeGenerator):
-    ATTRS = template(f"attr.s{{% if kwargs %}}({KWAGRS_TEMPLATE}){{% endif %}}")
-    ATTRIB = template(f"attr.ib({KWAGRS_TEMPLATE})")
+    ATTRS = template(f"attr.s{{% if kwargs %}}({KWAGRS_TEMPLATE}){{% endif %}}", renderer=_render_decorator)
+    ATTRIB = template(f"attr.ib({KWAGRS_TEMPLATE})", renderer=_render_field)
     default_types_style = {
         StringLiteral: {
             StringLiteral.TypeStyle.use_literals: False
@@ -35,7 +44,7 @@ class AttrsModelCodeGenerator(GenericModelCodeGenerator):
     def decorators(self) -> Tuple[ImportPathList, List[str]]:
         imports, decorators = super().decorators
         imports.append(('attr', None))
-        decorators.insert(0, self.ATTRS.render(kwargs=self.attrs_kwargs))
+        decorators.insert(0, render(self.ATTRS, kwargs=self.attrs_kwargs))
         return imports, decorators
 
     def field_data(self, name: str, meta: MetaData, optional: bool) -> Tuple[ImportPathList, dict]:
@@ -65,7 +74,7 @@ class AttrsModelCodeGenerator(GenericModelCodeGenerator):
 
         if not self.no_meta and name != data["name"]:
             body_kwargs["metadata"] = {METADATA_FIELD_NAME: name}
-        data["body"] = self.ATTRIB.render(kwargs=sort_kwargs(body_kwargs, DEFAULT_ORDER))
+        data["body"] = render(self.ATTRIB, kwargs=sort_kwargs(body_kwargs, DEFAULT_ORDER))
         return imports, data
 
     @property
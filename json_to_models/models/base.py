@@ -1,7 +1,9 @@
 import copy
 import keyword
+import pickle
 import re
-from typing import Dict, Iterable, List, Tuple, Type, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 import inflection
 from jinja2 import Template
@@ -27,10 +29,16 @@ other_common_names_set = {'datetime', 'time', 'date', 'defaultdict', 'schema'}
 blacklist_words = frozenset(keywords_set | builtins_set | other_common_names_set)
 ones = ['', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
 
+# Template -> plain python function that renders the same string (see ``template`` and ``render``)
+_renderers: Dict[Template, Callable[..., str]] = {}
 
-def template(pattern: str, indent: str = INDENT) -> Template:
+
+def template(pattern: str, indent: str = INDENT, renderer: Callable[..., str] = None) -> Template:
     """
     Remove indent from triple-quotes string and return jinja2.Template instance
+
+    :param renderer: Function with the same output as template. If it is set then ``render``
+        calls it instead of jinja2 (so overridden templates of subclasses are still rendered by jinja2)
     """
     if "\n" in pattern:
         n = len(indent)
@@ -41,7 +49,52 @@ def template(pattern: str, indent: str = INDENT) -> Template:
 
         pattern = "\n".join(line[n:] if line[:n] == indent else line
                             for line in lines)
-    return Template(pattern)
+    compiled = Template(pattern)
+    if renderer is not None:
+        _renderers[compiled] = renderer
+    return compiled
+
+
+def render(template: Template, **data) -> str:
+    """
+    Render template with its precompiled renderer if it has one or with jinja2 otherwise
+    """
+    renderer = _renderers.get(template)
+    if renderer is None:
+        return template.render(**data)
+    return renderer(**data)
+
+
+def render_kwargs(kwargs: dict) -> str:
+    """
+    Precompiled KWAGRS_TEMPLATE
+    """
+    return ", ".join(f"{key!s}={value!s}" for key, value in kwargs.items())
+
+
+def _render_body(decorators=(), name="", bases=None, nested=(), fields=(), extra=None, **_) -> str:
+    parts = [f"@{decorator!s}\n" for decorator in decorators]
+    parts.append(f"class {name!s}({bases!s}):" if bases else f"class {name!s}:")
+    parts.extend(f"\n{code!s}\n" for code in nested)
+    if fields:
+        parts.extend(f"\n{INDENT}{field!s}" for field in fields)
+    else:
+        parts.append(f"\n{INDENT}pass")
+    if extra:
+        parts.append(f"\n{extra!s}")
+    return "".join(parts)
+
+
+def _render_field(name="", type="", body=None, **_) -> str:
+    if body:
+        return f"{name!s}: {type!s} = {body!s}"
+    return f"{name!s}: {type!s}"
+
+
+def _render_str_convert_decorator(str_fields="", kwargs=None, **_) -> str:
+    if kwargs:
+        return f"convert_strings({str_fields!s}, {render_kwargs(kwargs)})"
+    return f"convert_strings({str_fields!s})"
 
 
 class GenericModelCodeGenerator:
@@ -69,11 +122,11 @@ class GenericModelCodeGenerator:
     {%- if extra %}
     {{ extra }}
     {%- endif -%}
-    """)
+    """, renderer=_render_body)
 
     STR_CONVERT_DECORATOR = template("convert_strings({{ str_fields }}{%% if kwargs %%}, %s{%% endif %%})"
-                                     % KWAGRS_TEMPLATE)
-    FIELD: Template = template("{{name}}: {{type}}{% if body %} = {{ body }}{% endif %}")
+                                     % KWAGRS_TEMPLATE, renderer=_render_str_convert_decorator)
+    FIELD: Template = template("{{name}}: {{type}}{% if body %} = {{ body }}{% endif %}", renderer=_render_field)
     DEFAULT_MAX_LITERALS = 10
     default_types_style = {
         StringLiteral: {
@@ -128,7 +181,7 @@ class GenericModelCodeGenerator:
         }
         if nested_classes:
             data["nested"] = [indent(s) for s in nested_classes]
-        return [*imports, *decorator_imports], self.BODY.render(**data)
+        return [*imports, *decorator_imports], render(self.BODY, **data)
 
     @property
     def decorators(self) -> Tuple[ImportPathList, List[str]]:
@@ -144,7 +197,7 @@ class GenericModelCodeGenerator:
                     *decorator_imports,
                     ('json_to_models.models.string_converters', ['convert_strings']),
                 ])
-                decorators.append(self.STR_CONVERT_DECORATOR.render(str_fields=str_fields, kwargs=decorator_kwargs))
+                decorators.append(render(self.STR_CONVERT_DECORATOR, str_fields=str_fields, kwargs=decorator_kwargs))
         return imports, decorators
 
     def field_data(self, name: str, meta: MetaData, optional: bool) -> Tuple[ImportPathList, dict]:
@@ -179,7 +232,7 @@ class GenericModelCodeGenerator:
             for field in fields:
                 field_imports, data = self.field_data(field, self.model.type[field], bool(is_optional))
                 imports.extend(field_imports)
-                strings.append(self.FIELD.render(**data))
+                strings.append(render(self.FIELD, **data))
         return imports, strings
 
     def _filter_fields(self, fields):
@@ -240,10 +293,93 @@ def _generate_code(
     return imports, classes
 
 
+def _init_generators(
+        structure: List[dict],
+        class_generator: Type[GenericModelCodeGenerator],
+        class_generator_kwargs: dict
+):
+    """
+    Create generators in the same order as ``_generate_code`` does (generators rename models on init)
+    """
+    for data in structure:
+        _init_generators(data["nested"], class_generator, class_generator_kwargs)
+        class_generator(data["model"], **class_generator_kwargs)
+
+
+def _generate_code_parallel(
+        structure: List[dict],
+        class_generator: Type[GenericModelCodeGenerator],
+        class_generator_kwargs: dict,
+        mapping: Dict[ModelMeta, ModelMeta],
+        jobs: int
+) -> Tuple[ImportPathList, List[str]]:
+    """
+    Same as ``_generate_code`` but root models are split into chunks which are converted into code
+    by pool of ``jobs`` worker processes.
+
+    Models structure is pickled once and sent to each worker by the pool initializer, tasks are just
+    bounds of chunks. Generators rename models on init so workers create generators of all models
+    (not only models of the chunk) in the same order as ``_generate_code`` does. Thus workers see
+    the same models names as they would have in the serial run and the result is the same as the result
+    of ``_generate_code``.
+
+    :param mapping: AbsoluteModelRef injections that are passed to workers
+    :return: imports, list of first lvl classes
+    """
+    chunk_size = -(-len(structure) // jobs)
+    payload = pickle.dumps((structure, class_generator, class_generator_kwargs, mapping))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(payload,)) as executor:
+        futures = [executor.submit(_generate_chunk, i, i + chunk_size)
+                   for i in range(0, len(structure), chunk_size)]
+        chunks = [future.result() for future in futures]
+
+    imports = [path for nested, _ in chunks for nested_imports, _ in nested for path in nested_imports]
+    classes = []
+    for _, generated in chunks:
+        for cls_imports, cls_string in generated:
+            imports.extend(cls_imports)
+            classes.append(cls_string)
+    return imports, classes
+
+
+# Pickled arguments of _generate_code_parallel (structure, class generator, its kwargs and mapping)
+_worker_payload: Optional[bytes] = None
+
+
+def _init_worker(payload: bytes):
+    """
+    Initializer of _generate_code_parallel workers
+    """
+    global _worker_payload
+    _worker_payload = payload
+
+
+def _generate_chunk(start: int, end: int) \
+        -> Tuple[List[Tuple[ImportPathList, List[str]]], List[Tuple[ImportPathList, str]]]:
+    """
+    Worker of _generate_code_parallel. Generate nested models and root models of ``structure[start:end]``.
+    Structure is unpickled for each chunk because generators of the previous chunk have renamed its models.
+
+    :return: imports and classes of nested models of each root model, imports and class of each root model
+    """
+    structure, class_generator, class_generator_kwargs, mapping = pickle.loads(_worker_payload)
+    _init_generators(structure[:start], class_generator, class_generator_kwargs)
+    nested = []
+    generators = []
+    with AbsoluteModelRef.inject(mapping):
+        for data in structure[start:end]:
+            nested.append(_generate_code(data["nested"], class_generator, class_generator_kwargs, lvl=1))
+            generators.append(class_generator(data["model"], **class_generator_kwargs))
+        _init_generators(structure[end:], class_generator, class_generator_kwargs)
+        generated = [gen.generate(classes) for gen, (_, classes) in zip(generators, nested)]
+    return nested, generated
+
+
 def generate_code(structure: ModelsStructureType, class_generator: Type[GenericModelCodeGenerator],
                   class_generator_kwargs: dict = None,
                   objects_delimiter: str = OBJECTS_DELIMITER,
-                  preamble: str = None) -> str:
+                  preamble: str = None,
+                  jobs: int = 1) -> str:
     """
     Generate ready-to-use code
 
@@ -252,12 +388,19 @@ def generate_code(structure: ModelsStructureType, class_generator: Type[GenericM
     :param class_generator_kwargs: kwags for GenericModelCodeGenerator init
     :param objects_delimiter: Delimiter between root level classes
     :param preamble: code to insert after the imports and before the classes
+    :param jobs: Number of worker processes. Root models are converted into code in parallel if it is greater than 1
+        (class generator and its kwargs should be picklable). Result is the same as the result of a single process run.
+        Each worker creates generators of all models, so it pays off only for large structures on multi-core machines
+        (see testing_tools.benchmarks.parallel_code_generation)
     :return: Generated code
     """
     root, mapping = structure
-    with AbsoluteModelRef.inject(mapping):
-        imports, classes = _generate_code(root, class_generator, class_generator_kwargs or {})
-        imports_str = ""
+    if jobs > 1 and len(root) > 1:
+        imports, classes = _generate_code_parallel(root, class_generator, class_generator_kwargs or {}, mapping, jobs)
+    else:
+        with AbsoluteModelRef.inject(mapping):
+            imports, classes = _generate_code(root, class_generator, class_generator_kwargs or {})
+    imports_str = ""
     if imports:
         imports_str = compile_imports(imports) + objects_delimiter
     if preamble:
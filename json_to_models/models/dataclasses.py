@@ -1,7 +1,8 @@
 from inspect import isclass
 from typing import List, Tuple
 
-from .base import GenericModelCodeGenerator, KWAGRS_TEMPLATE, METADATA_FIELD_NAME, sort_kwargs, template
+from .base import (GenericModelCodeGenerator, KWAGRS_TEMPLATE, METADATA_FIELD_NAME, render, render_kwargs, sort_kwargs,
+                   template)
 from ..dynamic_typing import (DDict, DList, DOptional, ImportPathList, MetaData, ModelMeta, StringSerializable)
 
 DEFAULT_ORDER = (
@@ -11,9 +12,17 @@ DEFAULT_ORDER = (
 )
 
 
+def _render_decorator(kwargs=None, **_) -> str:
+    return f"dataclass({render_kwargs(kwargs)})" if kwargs else "dataclass"
+
+
+def _render_field(kwargs=None, **_) -> str:
+    return f"field({render_kwargs(kwargs or {})})"
+
+
 class DataclassModelCodeGenerator(GenericModelCodeGenerator):
-    DC_DECORATOR = template(f"dataclass{{% if kwargs %}}({KWAGRS_TEMPLATE}){{% endif %}}")
-    DC_FIELD = template(f"field({KWAGRS_TEMPLATE})")
+    DC_DECORATOR = template(f"dataclass{{% if kwargs %}}({KWAGRS_TEMPLATE}){{% endif %}}", renderer=_render_decorator)
+    DC_FIELD = template(f"field({KWAGRS_TEMPLATE})", renderer=_render_field)
 
     def __init__(self, model: ModelMeta, meta=False, dataclass_kwargs: dict = None, **kwargs):
         """
@@ -30,7 +39,7 @@ class DataclassModelCodeGenerator(GenericModelCodeGenerator):
     def decorators(self) -> Tuple[ImportPathList, List[str]]:
         imports, decorators = super().decorators
         imports.append(('dataclasses', ['dataclass', 'field']))
-        decorators.insert(0, self.DC_DECORATOR.render(kwargs=self.dataclass_kwargs))
+        decorators.insert(0, render(self.DC_DECORATOR, kwargs=self.dataclass_kwargs))
         return imports, decorators
 
     def field_data(self, name: str, meta: MetaData, optional: bool) -> Tuple[ImportPathList, dict]:
@@ -62,7 +71,7 @@ class DataclassModelCodeGenerator(GenericModelCodeGenerator):
         if len(body_kwargs) == 1 and next(iter(body_kwargs.keys())) == "default":
             data["body"] = body_kwargs["default"]
         elif body_kwargs:
-            data["body"] = self.DC_FIELD.render(kwargs=sort_kwargs(body_kwargs, DEFAULT_ORDER))
+            data["body"] = render(self.DC_FIELD, kwargs=sort_kwargs(body_kwargs, DEFAULT_ORDER))
         return imports, data
 
     @property
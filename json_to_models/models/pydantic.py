@@ -1,6 +1,6 @@
 from typing import List, Optional, Tuple
 
-from .base import GenericModelCodeGenerator, KWAGRS_TEMPLATE, sort_kwargs, template
+from .base import GenericModelCodeGenerator, KWAGRS_TEMPLATE, render, render_kwargs, sort_kwargs, template
 from ..dynamic_typing import (
     DDict,
     DList,
@@ -19,9 +19,15 @@ DEFAULT_ORDER = (
 )
 
 
+def _render_field(default="", kwargs=None, **_) -> str:
+    if kwargs:
+        return f"Field({default!s}, {render_kwargs(kwargs)})"
+    return f"Field({default!s})"
+
+
 class PydanticModelCodeGenerator(GenericModelCodeGenerator):
     PYDANTIC_FIELD = template("Field({{ default }}{% if kwargs %}, KWAGRS_TEMPLATE{% endif %})"
-                              .replace('KWAGRS_TEMPLATE', KWAGRS_TEMPLATE))
+                              .replace('KWAGRS_TEMPLATE', KWAGRS_TEMPLATE), renderer=_render_field)
     default_types_style = {
         StringSerializable: {
             StringSerializable.TypeStyle.use_actual_type: True
@@ -81,7 +87,8 @@ class PydanticModelCodeGenerator(GenericModelCodeGenerator):
 
         body_kwargs = self._get_field_kwargs(name, meta, optional, data)
         if body_kwargs:
-            data["body"] = self.PYDANTIC_FIELD.render(
+            data["body"] = render(
+                self.PYDANTIC_FIELD,
                 default=default or '...',
                 kwargs=sort_kwargs(body_kwargs, DEFAULT_ORDER)
             )
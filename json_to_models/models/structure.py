@@ -1,7 +1,8 @@
+from collections import defaultdict
 from typing import Dict, Iterable, List, Set, Tuple
 
 from . import Index, ModelsStructureType
-from .utils import ListEx, PositionsDict
+from .utils import ListEx, PositionsIndex
 from ..dynamic_typing import BaseType, DOptional, ModelMeta, ModelPtr
 
 
@@ -11,51 +12,66 @@ def compose_models(models_map: Dict[str, ModelMeta]) -> ModelsStructureType:
 
     :return: List of root models data, Map(child model -> root model) for absolute ref generation
     """
-    root_models = ListEx()
-    root_nested_ix = 0
+    parents, root_pointers = pointers_graph(models_map)
+    roots = extract_roots(parents)
     structure_hash_table: Dict[Index, dict] = {
         key: {
             "model": model,
             "nested": ListEx(),
-            "roots": list(extract_root(model)),  # Indexes of root level models
+            "roots": list(roots[key]),  # Indexes of root level models
         } for key, model in models_map.items()
     }
     # TODO: Test path_injections
     path_injections: Dict[ModelMeta, ModelMeta] = {}
 
+    # Root models list consists of models that are used by different root models (in order of insertion)
+    # followed by root level models, each of them is preceded by models that are inserted before it.
+    # So position of any model is known without scanning of the list
+    root_nested: List[dict] = []
+    root_level: Dict[Index, List[dict]] = {}  # Root model index -> models inserted before it
+    root_level_positions: Dict[Index, int] = {}
+    # Models inserted into the beginning of nested models lists
+    nested_head: Dict[Index, List[dict]] = defaultdict(list)
+
     for key, model in models_map.items():
-        pointers = list(filter_pointers(model))
-        has_root_pointers = len(pointers) != len(model.pointers)
-        if not pointers:
+        model_parents = parents[key]
+        has_root_pointers = root_pointers[key]
+        struct = structure_hash_table[key]
+        if not model_parents:
             # Root level model
             if not has_root_pointers:
                 raise Exception(f'Model {model.name} has no pointers')
-            root_models.append(structure_hash_table[key])
-        else:
-            parents = {ptr.parent.index for ptr in pointers}
-            struct = structure_hash_table[key]
-            # Model is using by other models
-            if has_root_pointers or len(parents) > 1 and len(struct["roots"]) > 1:
-                # Model is using by different root models
-                try:
-                    root_models.insert_before(
-                        struct,
-                        *(structure_hash_table[parent_key] for parent_key in struct["roots"])
-                    )
-                except ValueError:
-                    root_models.insert(root_nested_ix, struct)
-                    root_nested_ix += 1
-            elif len(parents) > 1 and len(struct["roots"]) == 1:
-                # Model is using by single root model
-                parent = structure_hash_table[struct["roots"][0]]
-                parent["nested"].insert(0, struct)
-                path_injections[struct["model"]] = parent["model"]
+            root_level_positions[key] = len(root_level)
+            root_level[key] = []
+        # Model is using by other models
+        elif has_root_pointers or len(model_parents) > 1 and len(struct["roots"]) > 1:
+            # Model is using by different root models.
+            # It is placed before the first of its root models that is already in the list
+            # (root level models are never reordered)
+            first_root = min(
+                (root_key for root_key in struct["roots"] if root_key in root_level),
+                key=root_level_positions.__getitem__, default=None
+            )
+            if first_root is not None:
+                root_level[first_root].append(struct)
             else:
-                # Model is using by only one model
-                parent = structure_hash_table[next(iter(parents))]
-                struct = structure_hash_table[key]
-                parent["nested"].append(struct)
+                root_nested.append(struct)
+        elif len(model_parents) > 1 and len(struct["roots"]) == 1:
+            # Model is using by single root model
+            parent = structure_hash_table[struct["roots"][0]]
+            nested_head[struct["roots"][0]].append(struct)
+            path_injections[struct["model"]] = parent["model"]
+        else:
+            # Model is using by only one model
+            parent = structure_hash_table[next(iter(model_parents))]
+            parent["nested"].append(struct)
 
+    for key, head in nested_head.items():
+        structure_hash_table[key]["nested"][:0] = reversed(head)
+    root_models = ListEx(root_nested)
+    for key, before in root_level.items():
+        root_models.extend(before)
+        root_models.append(structure_hash_table[key])
     return root_models, path_injections
 
 
@@ -66,45 +82,47 @@ def compose_models_flat(models_map: Dict[Index, ModelMeta]) -> ModelsStructureTy
     :param models_map: Mapping (model index -> model meta instance).
     :return: List of root models data, Map(child model -> root model) for absolute ref generation
     """
+    parents, root_pointers = pointers_graph(models_map)
+    roots = extract_roots(parents)
     root_models = ListEx()
-    positions: PositionsDict[Index, int] = PositionsDict()
+    # Positions are shifted on each insertion so PositionsIndex is used to avoid full scan of all positions
+    positions = PositionsIndex()
     top_level_models: Set[Index] = set()
     structure_hash_table: Dict[Index, dict] = {
         key: {
             "model": model,
             "nested": ListEx(),
-            "roots": list(extract_root(model)),  # Indexes of root level models
+            "roots": list(roots[key]),  # Indexes of root level models
         } for key, model in models_map.items()
     }
 
     for key, model in models_map.items():
-        pointers = list(filter_pointers(model))
-        has_root_pointers = len(pointers) != len(model.pointers)
-        if not pointers:
+        model_parents = parents[key]
+        has_root_pointers = root_pointers[key]
+        if not model_parents:
             # Root level model
             if not has_root_pointers:
                 raise Exception(f'Model {model.name} has no pointers')
             root_models.insert(positions["root"], structure_hash_table[key])
             top_level_models.add(key)
-            positions.update_position("root", PositionsDict.INC)
+            positions.update_position("root", PositionsIndex.INC)
         else:
-            parents = {ptr.parent.index for ptr in pointers}
             struct = structure_hash_table[key]
             # Model is using by other models
-            if has_root_pointers or len(parents) > 1 and len(struct["roots"]) >= 1:
+            if has_root_pointers or len(model_parents) > 1 and len(struct["roots"]) >= 1:
                 # Model is using by different root models
-                if parents & top_level_models:
-                    parents.add("root")
-                parents_positions = {positions[parent_key] for parent_key in parents
+                if model_parents & top_level_models:
+                    model_parents = model_parents | {"root"}
+                parents_positions = {positions[parent_key] for parent_key in model_parents
                                      if parent_key in positions}
-                parents_joined = "#".join(sorted(parents))
+                parents_joined = "#".join(sorted(model_parents))
                 if parents_joined in positions:
                     parents_positions.add(positions[parents_joined])
                 pos = max(parents_positions) if parents_positions else len(root_models)
                 positions.update_position(parents_joined, pos + 1)
             else:
                 # Model is using by only one model
-                parent = next(iter(parents))
+                parent = next(iter(model_parents))
                 pos = positions.get(parent, len(root_models))
                 positions.update_position(parent, pos + 1)
             positions.update_position(key, pos + 1)
@@ -113,6 +131,97 @@ def compose_models_flat(models_map: Dict[Index, ModelMeta]) -> ModelsStructureTy
     return root_models, {}
 
 
+def pointers_graph(models_map: Dict[Index, ModelMeta]) -> Tuple[Dict[Index, Set[Index]], Dict[Index, bool]]:
+    """
+    Build index of models graph.
+
+    :return: Map(model index -> indexes of parent models),
+        Map(model index -> True if model has pointers without parent, i.e. it is used as root model)
+    """
+    parents: Dict[Index, Set[Index]] = {}
+    root_pointers: Dict[Index, bool] = {}
+    for key, model in models_map.items():
+        parents[key] = {ptr.parent.index for ptr in model.pointers if ptr.parent}
+        root_pointers[key] = any(not ptr.parent for ptr in model.pointers)
+    return parents, root_pointers
+
+
+def extract_roots(parents: Dict[Index, Set[Index]]) -> Dict[Index, Set[Index]]:
+    """
+    Return map of model index -> set of indexes of root models that are use this model
+    directly or through another nested model (same as ``extract_root`` for each model).
+
+    Roots are computed once for each strongly connected component of the models graph (Tarjan's algorithm)
+    in order of dependencies, so shared models are not walked again for each of their descendants.
+    Models could share the same set instance so result sets should not be modified.
+
+    :param parents: Map(model index -> indexes of parent models)
+    """
+    roots: Dict[Index, Set[Index]] = {}
+    order: Dict[Index, int] = {}  # Model index -> DFS visit order
+    low: Dict[Index, int] = {}
+    stack: List[Index] = []
+    on_stack: Set[Index] = set()
+
+    for start in parents:
+        if start in order:
+            continue
+        order[start] = low[start] = len(order)
+        stack.append(start)
+        on_stack.add(start)
+        path = [(start, iter(parents[start]))]
+        while path:
+            node, node_parents = path[-1]
+            for parent in node_parents:
+                if parent not in order:
+                    order[parent] = low[parent] = len(order)
+                    stack.append(parent)
+                    on_stack.add(parent)
+                    path.append((parent, iter(parents[parent])))
+                    break
+                if parent in on_stack:
+                    low[node] = min(low[node], order[parent])
+            else:
+                path.pop()
+                if path:
+                    child = path[-1][0]
+                    low[child] = min(low[child], low[node])
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component_roots = _component_roots(component, parents, roots)
+                    for member in component:
+                        roots[member] = component_roots
+    return roots
+
+
+def _component_roots(component: List[Index], parents: Dict[Index, Set[Index]],
+                     roots: Dict[Index, Set[Index]]) -> Set[Index]:
+    """
+    Return roots of strongly connected component. Roots of all parent components should be already calculated.
+    """
+    members = set(component) if len(component) > 1 else component
+    parents_roots: List[Set[Index]] = []
+    direct_roots: Set[Index] = set()
+    for member in component:
+        for parent in parents[member]:
+            if parent in members:
+                continue
+            if parents[parent]:
+                parents_roots.append(roots[parent])
+            else:
+                direct_roots.add(parent)
+    if not direct_roots and parents_roots and all(r is parents_roots[0] for r in parents_roots):
+        # Chain of nested models, same roots as parent model has
+        return parents_roots[0]
+    return direct_roots.union(*parents_roots)
+
+
 def filter_pointers(model: ModelMeta) -> Iterable[ModelPtr]:
     """
     Return iterator over pointers with not None parent
@@ -123,6 +232,7 @@ def filter_pointers(model: ModelMeta) -> Iterable[ModelPtr]:
 def extract_root(model: ModelMeta) -> Set[Index]:
     """
     Return set of indexes of root models that are use given `model` directly or through another nested model.
+    Use ``extract_roots`` to get roots of all models.
     """
     seen: Set[Index] = set()
     nodes: List[ModelPtr] = list(filter_pointers(model))
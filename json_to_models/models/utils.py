@@ -1,5 +1,6 @@
+from bisect import bisect_left
 from collections import defaultdict
-from typing import Generic, TypeVar, Union
+from typing import Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar, Union
 
 from . import INDENT
 
@@ -66,6 +67,122 @@ class PositionsDict(defaultdict):
         self[key] = value
 
 
+class _Block:
+    __slots__ = ("offset", "values", "keys")
+
+    def __init__(self, offset: int = 0):
+        self.offset = offset
+        self.values: List[int] = []  # Sorted positions relative to offset
+        self.keys: List[Hashable] = []
+
+
+class PositionsIndex:
+    """
+    Same as PositionsDict but position update doesn't iterate over all keys.
+    Positions are kept sorted and split into blocks with offset, so a shift updates
+    single block and offsets of the following blocks.
+    """
+    INC = PositionsDict.INC
+    BLOCK_SIZE = 128
+
+    def __init__(self):
+        self._blocks: List[_Block] = []
+        self._key_blocks: Dict[Hashable, _Block] = {}
+
+    def __contains__(self, key):
+        return key in self._key_blocks
+
+    def __getitem__(self, key) -> int:
+        if key not in self._key_blocks:
+            # Same as defaultdict
+            self._insert(key, 0)
+        return self.get(key)
+
+    def get(self, key, default=None) -> Optional[int]:
+        block = self._key_blocks.get(key)
+        if block is None:
+            return default
+        return block.values[block.keys.index(key)] + block.offset
+
+    def items(self):
+        for block in self._blocks:
+            for key, value in zip(block.keys, block.values):
+                yield key, value + block.offset
+
+    def update_position(self, key: str, value: Union[object, int]):
+        """
+        Shift all elements which are placed after updated one
+
+        :param key: Index or "root"
+        :param value: Could be position or PositionsDict.INC to perform quick increment (x+=1)
+        :return:
+        """
+        if value is self.INC:
+            value = self[key] + 1
+        if key in self._key_blocks:
+            old_value = self.get(key)
+            delta = value - old_value
+            self._remove(key)
+        else:
+            old_value = value
+            delta = 1
+        if delta > 0:
+            self._shift(old_value, delta)
+        elif delta < 0:
+            # Shifted positions could pass other ones so order is restored by full rebuild.
+            # It is rare case (model is placed before its already placed child)
+            self._build((k, v + delta if v >= old_value else v) for k, v in list(self.items()))
+        self._insert(key, value)
+
+    def _shift(self, threshold: int, delta: int):
+        """
+        Add delta (> 0) to all positions >= threshold
+        """
+        for block in self._blocks:
+            if block.values[0] + block.offset >= threshold:
+                block.offset += delta
+            elif block.values[-1] + block.offset >= threshold:
+                values = block.values
+                for i in range(bisect_left(values, threshold - block.offset), len(values)):
+                    values[i] += delta
+
+    def _insert(self, key, value: int):
+        if not self._blocks:
+            self._blocks.append(_Block())
+            block = self._blocks[0]
+        else:
+            block = next((block for block in self._blocks if block.values[-1] + block.offset >= value),
+                         self._blocks[-1])
+        i = bisect_left(block.values, value - block.offset)
+        block.values.insert(i, value - block.offset)
+        block.keys.insert(i, key)
+        self._key_blocks[key] = block
+        if len(block.values) > 2 * self.BLOCK_SIZE:
+            self._build(self.items())
+
+    def _remove(self, key):
+        block = self._key_blocks.pop(key)
+        i = block.keys.index(key)
+        del block.values[i]
+        del block.keys[i]
+        if not block.values:
+            self._blocks.remove(block)
+
+    def _build(self, items: Iterable[Tuple[Hashable, int]]):
+        """
+        Split sorted positions into blocks of BLOCK_SIZE
+        """
+        items = sorted(items, key=lambda item: item[1])
+        self._blocks = []
+        for i in range(0, len(items), self.BLOCK_SIZE):
+            block = _Block()
+            block.keys = [key for key, _ in items[i:i + self.BLOCK_SIZE]]
+            block.values = [value for _, value in items[i:i + self.BLOCK_SIZE]]
+            self._blocks.append(block)
+            for key in block.keys:
+                self._key_blocks[key] = block
+
+
 def indent(string: str, lvl: int = 1, indent: str = INDENT) -> str:
     """
     Indent all lines of string by ``indent * lvl``
@@ -1,29 +1,61 @@
+import math
 from collections import defaultdict
 from itertools import chain, combinations
-from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from ordered_set import OrderedSet
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 from .dynamic_typing import BaseType, MetaData, ModelMeta, ModelPtr
-from .utils import Index, distinct_words
+from .utils import DisjointSet, Index, distinct_words
 
 
 class ModelCmp:
     """
     Generic model comparator
+
+    Comparators which decision depends only on sizes of fields sets and their intersection
+    should also implement ``cmp_sizes`` and ``min_common`` methods (in the same class as ``cmp``).
+    It allows registry to skip pairs of models that can not be merged without comparing them.
+    Set ``vectorized = True`` (in the same class) if ``cmp_sizes`` also works with numpy arrays.
     """
+    vectorized = False
 
     def cmp(self, fields_a: set, fields_b: set) -> bool:
         raise NotImplementedError()
 
+    def cmp_sizes(self, len_a: int, len_b: int, common: int) -> bool:
+        """
+        Same as ``cmp`` but get sizes of fields sets and size of their intersection
+        """
+        raise NotImplementedError()
+
+    def min_common(self, len_a: int) -> int:
+        """
+        Return lower bound of the number of common fields that model with ``len_a`` fields
+        should have with any other model to be merged with it (0 if there is no such bound)
+        """
+        return 0
+
 
 class ModelFieldsEquals(ModelCmp):
+    vectorized = True
+
     def cmp(self, fields_a: set, fields_b: set) -> bool:
         return fields_a == fields_b
 
+    def cmp_sizes(self, len_a: int, len_b: int, common: int) -> bool:
+        return (len_a == len_b) & (len_b == common)
+
+    def min_common(self, len_a: int) -> int:
+        return len_a
+
 
 class ModelFieldsPercentMatch(ModelCmp):
     DEFAULT = .7
+    vectorized = True
 
     def __init__(self, percent_fields: float = DEFAULT):
         self.percent_fields = percent_fields
@@ -31,9 +63,17 @@ class ModelFieldsPercentMatch(ModelCmp):
     def cmp(self, fields_a: set, fields_b: set) -> bool:
         return len(fields_a & fields_b) / len(fields_a | fields_b) >= self.percent_fields
 
+    def cmp_sizes(self, len_a: int, len_b: int, common: int) -> bool:
+        return common / (len_a + len_b - common) >= self.percent_fields
+
+    def min_common(self, len_a: int) -> int:
+        # Union is not less than len_a. Floor is used to be tolerant to float rounding
+        return max(math.floor(self.percent_fields * len_a), 0)
+
 
 class ModelFieldsNumberMatch(ModelCmp):
     DEFAULT = 10
+    vectorized = True
 
     def __init__(self, number_fields: int = DEFAULT):
         self.number_fields = number_fields
@@ -41,9 +81,39 @@ class ModelFieldsNumberMatch(ModelCmp):
     def cmp(self, fields_a: set, fields_b: set) -> bool:
         return len(fields_a & fields_b) >= self.number_fields
 
+    def cmp_sizes(self, len_a: int, len_b: int, common: int) -> bool:
+        return common >= self.number_fields
+
+    def min_common(self, len_a: int) -> int:
+        return max(math.ceil(self.number_fields), 0)
+
+
+def _is_sized(cmp: ModelCmp, vectorized=False) -> bool:
+    """
+    Check that comparator's ``cmp_sizes`` and ``min_common`` methods are implemented along with ``cmp`` method
+    (i.e. they are not inherited from base class of comparator with overridden ``cmp``)
+
+    :param vectorized: Also check that ``cmp_sizes`` supports numpy arrays
+    """
+    for cls in type(cmp).__mro__:
+        if 'cmp' in vars(cls):
+            return (
+                    cls is not ModelCmp and 'cmp_sizes' in vars(cls) and 'min_common' in vars(cls)
+                    and (not vectorized or vars(cls).get('vectorized', False))
+            )
+    return False
+
 
 class ModelRegistry:
     DEFAULT_MODELS_CMP = (ModelFieldsPercentMatch(), ModelFieldsNumberMatch())
+    # Registries with this number of models could be compared with numpy (if it is installed)
+    VECTORIZE_THRESHOLD = 500
+    # Min fraction of all pairs of models that inverted index would compare to use numpy instead
+    VECTORIZE_MIN_DENSITY = .1
+    # Max size of models x fields matrix (larger registries are compared without numpy)
+    VECTORIZE_MAX_SIZE = 2 ** 25
+    # Max size of block of similarity matrix that is computed at once
+    VECTORIZE_BLOCK_SIZE = 2 ** 22
 
     def __init__(self, *models_cmp: ModelCmp):
         """
@@ -52,6 +122,8 @@ class ModelRegistry:
         self._models_cmp = models_cmp or self.DEFAULT_MODELS_CMP
         self._registry: Dict[str, ModelMeta] = {}
         self._index = Index()
+        # Indexes of models that are registered (or created by merge) after the last merge_models call
+        self._changed: Set[str] = set()
 
     @property
     def models(self):
@@ -74,111 +146,337 @@ class ModelRegistry:
         :param meta: Dict[str, MetaData] - usually result of MetadataGenerator.generate method call
         :param model_name: Raw model name. Will be set as is.
             It is recommended to set it for root level models because names can not be generated for such models
-        :param parent: System attribute for recursive call
-        :param parent_model: Pair of (ModelMeta, field name). System attribute for recursive call
-        :param replace_kwargs: System attribute for recursive call
+        :param parent: Metadata that contains ``meta``. If set, pointer to the model replaces ``meta`` in it
+            (``parent.replace(ptr, **replace_kwargs)``)
+        :param parent_model: Pair of (ModelMeta, field name) of the model that contains ``meta``
+        :param replace_kwargs: Arguments of ``parent.replace`` call
         :return:
         """
-        replace_kwargs = replace_kwargs or {}
-        ptr = None
-
-        if isinstance(meta, dict):
-            # Register model
-            model_meta = self._register(meta)
-            ptr = ModelPtr(model_meta, parent=parent_model[0], parent_field_name=parent_model[1])
-            if parent:
-                parent.replace(ptr, **replace_kwargs)
-
-            # Process nested data
-            for key, value in meta.items():
-                nested_ptr = self.process_meta_data(value, parent_model=(model_meta, key))
-                if nested_ptr:
-                    meta[key] = nested_ptr
-
-        elif isinstance(meta, BaseType):
-            # Process other non-atomic types
-            try:
-                meta_iter = iter(meta)
-            except TypeError:
-                pass
+        # Nested data is processed depth-first using explicit stack (instead of recursion)
+        # so registration of models does not depend on the recursion limit.
+        # Nested data is iterated lazily and pointer to nested model is assigned to model dict
+        # after the nested model is processed (as it would be done by recursive function).
+        # Stack items are lists of
+        # [iterator over (key or index, nested data), model dict or other type, closest model, its field,
+        #  pending assignment to model dict]
+        stack = []
+        # Models of dicts that are already registered by this call. Metadata that contains pointers to processed
+        # models could refer to the same dict again so such dict gets pointer to its model and is not processed again
+        registered: Dict[int, ModelMeta] = {}
+        root_ptr = None
+        frame = None
+        key = None
+        parent_model, parent_field = parent_model
+        while True:
+            if isinstance(meta, dict):
+                model_meta = registered.get(id(meta))
+                is_new = model_meta is None
+                if is_new:
+                    # Register model
+                    model_meta = registered[id(meta)] = self._register(meta)
+                ptr = ModelPtr(model_meta, parent=parent_model, parent_field_name=parent_field)
+                if frame is None:
+                    root_ptr = ptr
+                    if parent:
+                        parent.replace(ptr, **(replace_kwargs or {}))
+                elif isinstance(frame[1], dict):
+                    frame[4] = (key, ptr)
+                elif frame[1]:
+                    frame[1].replace(ptr, parent=frame[1], index=key)
+                if is_new:
+                    stack.append([iter(meta.items()), meta, model_meta, None, None])
+
+            elif isinstance(meta, BaseType):
+                # Process other non-atomic types
+                try:
+                    meta_iter = iter(meta)
+                except TypeError:
+                    pass
+                else:
+                    stack.append([enumerate(meta_iter), meta, parent_model, parent_field, None])
+
+            # Get next nested data
+            while stack:
+                frame = stack[-1]
+                if frame[4] is not None:
+                    pending_key, ptr = frame[4]
+                    frame[4] = None
+                    frame[1][pending_key] = ptr
+                for key, meta in frame[0]:
+                    if isinstance(meta, (dict, BaseType)):
+                        break
+                else:
+                    stack.pop()
+                    continue
+                parent_model = frame[2]
+                # Keys of model dict are fields names
+                parent_field = key if isinstance(frame[1], dict) else frame[3]
+                break
             else:
-                for i, nested_meta in enumerate(meta_iter):
-                    self.process_meta_data(
-                        nested_meta,
-                        parent=meta,
-                        parent_model=parent_model,
-                        replace_kwargs={'parent': meta, 'index': i}
-                    )
+                break
 
         if model_name is not None:
-            ptr.type.set_raw_name(model_name)
-        return ptr
+            root_ptr.type.set_raw_name(model_name)
+        return root_ptr
 
     def _register(self, meta: MetaData):
         model_meta = ModelMeta(meta, self._index()) if not isinstance(meta, ModelMeta) else meta
         self._registry[model_meta.index] = model_meta
+        self._changed.add(model_meta.index)
         return model_meta
 
     def _unregister(self, model_meta: ModelMeta):
         del self._registry[model_meta.index]
+        self._changed.discard(model_meta.index)
 
-    def _models_cmp_fn(self, model_a: ModelMeta, model_b: ModelMeta) -> bool:
+    def _similar_models(self, changed: Set[str] = None) -> List[Tuple[ModelMeta, ModelMeta]]:
         """
-        Return True if ANY of comparators decided to merge pair of models
+        Return pairs of models that should be merged (in the order of ``combinations(self.models, 2)``)
+
+        :param changed: Indexes of models. If set only pairs with at least one of these models are compared
         """
-        fields_a = set(model_a.type.keys())
-        fields_b = set(model_b.type.keys())
-        return any(cmp.cmp(fields_a, fields_b) for cmp in self._models_cmp)
+        models = list(self.models)
+        if changed is not None and all(map(_is_sized, self._models_cmp)):
+            return [(models[i], models[j]) for i, j in self._similar_changed_models(models, changed)]
+        fields = [set(model.type.keys()) for model in models]
+        if not all(map(_is_sized, self._models_cmp)):
+            # Custom comparators could use anything so all pairs are compared
+            return [
+                (models[i], models[j])
+                for i, j in combinations(range(len(models)), 2)
+                if (changed is None or models[i].index in changed or models[j].index in changed)
+                and any(cmp.cmp(fields[i], fields[j]) for cmp in self._models_cmp)
+            ]
+
+        # Prefix filtering: if models should be merged then they have at least ``min_common`` common fields.
+        # So if fields are sorted in the same order (rare first) then first (size - min_common + 1) fields
+        # of both models have at least one common field. Only such pairs are compared.
+        frequency = defaultdict(int)
+        for model_fields in fields:
+            for name in model_fields:
+                frequency[name] += 1
+        prefixes: List[Optional[List[str]]] = []  # None for models without lower bound
+        for model_fields in fields:
+            size = len(model_fields)
+            min_common = min(cmp.min_common(size) for cmp in self._models_cmp)
+            if min_common <= 0:
+                prefixes.append(None)
+            else:
+                prefixes.append(sorted(model_fields, key=lambda name: (frequency[name], name))[:size - min_common + 1])
+
+        if self._vectorize(fields, prefixes):
+            pairs = self._similar_models_vectorized(fields, frequency)
+            if pairs is not None:
+                return [(models[i], models[j]) for i, j in pairs]
+
+        index: Dict[str, List[int]] = defaultdict(list)
+        exhaustive: List[int] = []  # Models without lower bound which are compared with all other models
+        pairs = []
+        for j, (model_fields, prefix) in enumerate(zip(fields, prefixes)):
+            size = len(model_fields)
+            if prefix is None:
+                candidates = set(range(j))
+            else:
+                candidates = set(exhaustive)
+                for name in prefix:
+                    candidates.update(index[name])
+                    index[name].append(j)
+            for i in candidates:
+                common = len(fields[i] & model_fields)
+                if any(cmp.cmp_sizes(len(fields[i]), size, common) for cmp in self._models_cmp):
+                    pairs.append((i, j))
+            if prefix is None:
+                exhaustive.append(j)
+        pairs.sort()
+        return [(models[i], models[j]) for i, j in pairs]
+
+    def _similar_changed_models(self, models: List[ModelMeta], changed: Set[str]) -> List[Tuple[int, int]]:
+        """
+        Compare changed models with all other models. Return sorted pairs of models positions.
 
-    def merge_models(self, generator, strict=False) -> List[Tuple[ModelMeta, Set[ModelMeta]]]:
+        If models should be merged then they have at least ``min_common`` common fields
+        so any (size - min_common + 1) fields of changed model include at least one common field.
+        Only models that have one of these fields (rare first) are compared.
+        """
+        index: Dict[str, List[int]] = defaultdict(list)
+        changed_positions = []
+        for i, model in enumerate(models):
+            for name in model.type:
+                index[name].append(i)
+            if model.index in changed:
+                changed_positions.append(i)
+
+        fields = {}
+        pairs = []
+        for j in changed_positions:
+            model_fields = fields.setdefault(j, set(models[j].type))
+            size = len(model_fields)
+            min_common = min(cmp.min_common(size) for cmp in self._models_cmp)
+            if min_common <= 0:
+                candidates = range(len(models))
+            else:
+                candidates = set()
+                for name in sorted(model_fields, key=lambda name: (len(index[name]), name))[:size - min_common + 1]:
+                    candidates.update(index[name])
+            for i in candidates:
+                # Pair of changed models is compared only once
+                if i == j or i > j and models[i].index in changed:
+                    continue
+                a, b = (i, j) if i < j else (j, i)
+                fields_a = fields.get(a) or fields.setdefault(a, set(models[a].type))
+                fields_b = fields.get(b) or fields.setdefault(b, set(models[b].type))
+                common = len(fields_a & fields_b)
+                if any(cmp.cmp_sizes(len(fields_a), len(fields_b), common) for cmp in self._models_cmp):
+                    pairs.append((a, b))
+        pairs.sort()
+        return pairs
+
+    def _vectorize(self, fields: List[Set[str]], prefixes: List[Optional[List[str]]]) -> bool:
+        """
+        Check if similarity matrix should be used instead of inverted index, i.e. numpy is installed,
+        all comparators support it and inverted index would produce a lot of candidates pairs anyway
+        """
+        n = len(fields)
+        if (
+                np is None or n < self.VECTORIZE_THRESHOLD or not all(fields)
+                or not all(_is_sized(cmp, vectorized=True) for cmp in self._models_cmp)
+        ):
+            return False
+        postings = defaultdict(int)
+        candidates = 0
+        for prefix in prefixes:
+            if prefix is None:
+                candidates += n
+                continue
+            for name in prefix:
+                postings[name] += 1
+        candidates += sum(count * (count - 1) // 2 for count in postings.values())
+        return candidates >= self.VECTORIZE_MIN_DENSITY * n * (n - 1) / 2
+
+    def _similar_models_vectorized(
+            self,
+            fields: List[Set[str]],
+            frequency: Dict[str, int]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Compute numbers of common fields of all pairs of models as product of models x fields incidence matrix
+        and apply comparators to whole blocks of this matrix. Return sorted pairs of models indexes
+        or None if matrix is too large.
+        """
+        # Fields of only one model do not affect intersections
+        columns = {name: i for i, name in enumerate(name for name, count in frequency.items() if count > 1)}
+        n = len(fields)
+        if n * len(columns) > self.VECTORIZE_MAX_SIZE:
+            return None
+
+        matrix = np.zeros((n, len(columns)), dtype=np.float32)
+        rows, cols = [], []
+        for i, model_fields in enumerate(fields):
+            for name in model_fields:
+                col = columns.get(name)
+                if col is not None:
+                    rows.append(i)
+                    cols.append(col)
+        matrix[rows, cols] = 1
+        sizes = np.array([len(model_fields) for model_fields in fields], dtype=np.int64)
+
+        pairs = []
+        block = max(1, self.VECTORIZE_BLOCK_SIZE // n)
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            # Only upper triangle is computed (pairs i < j). Sums of ones are exact in float32
+            common = (matrix[start:stop] @ matrix[start:].T).astype(np.int64)
+            len_a = sizes[start:stop, None]
+            len_b = sizes[None, start:]
+            mask = np.zeros(common.shape, dtype=bool)
+            for cmp in self._models_cmp:
+                mask |= cmp.cmp_sizes(len_a, len_b, common)
+            rows, cols = np.nonzero(mask)
+            upper = cols > rows
+            pairs.extend(zip((rows[upper] + start).tolist(), (cols[upper] + start).tolist()))
+        return pairs
+
+    def _merge_groups(self, pairs: Iterable[Tuple[ModelMeta, ModelMeta]]) -> List[List[ModelMeta]]:
+        """
+        Split models into non-overlapping groups (connected components of graph formed by given pairs)
+        """
+        groups: DisjointSet[ModelMeta] = DisjointSet()
+        for model_a, model_b in pairs:
+            groups.add(model_a)
+            groups.add(model_b)
+            groups.union(model_a, model_b)
+        return groups.groups()
+
+    def _strict_merge_groups(self, pairs: Iterable[Tuple[ModelMeta, ModelMeta]]) -> List[List[ModelMeta]]:
+        """
+        Split models into non-overlapping groups where all pairs of models are similar (cliques of graph formed
+        by given pairs). Greedy algorithm is used: models are processed in registry order and each model
+        is added to the largest group of its neighbours in which it is similar to all models
+        (or it starts new group). Groups of single model are dropped.
+        """
+        adjacency: Dict[ModelMeta, Set[ModelMeta]] = defaultdict(set)
+        for model_a, model_b in pairs:
+            adjacency[model_a].add(model_b)
+            adjacency[model_b].add(model_a)
+
+        groups: List[List[ModelMeta]] = []
+        group_of: Dict[ModelMeta, int] = {}
+        for model in self.models:
+            neighbours = adjacency.get(model)
+            if not neighbours:
+                continue
+            best = None
+            # Only groups of neighbours could be extended by this model
+            for i in sorted({group_of[neighbour] for neighbour in neighbours if neighbour in group_of}):
+                group = groups[i]
+                if (
+                        (best is None or len(group) > len(groups[best])) and len(group) <= len(neighbours)
+                        and all(m in neighbours for m in group)
+                ):
+                    best = i
+            if best is None:
+                group_of[model] = len(groups)
+                groups.append([model])
+            else:
+                group_of[model] = best
+                groups[best].append(model)
+        return [group for group in groups if len(group) > 1]
+
+    def merge_models(self, generator, strict=False, incremental=False) -> List[Tuple[ModelMeta, Set[ModelMeta]]]:
         """
         Optimize whole models registry by merging same or similar models (uses given models comparators)
 
         :param generator: Generator instance that will be used to metadata merging and optimization
         :param strict: if True ALL models in merge group should meet the conditions
             else groups will form from pairs of models as is.
+            In incremental mode similar models that were left unmerged by previous strict merge are not merged.
+        :param incremental: if True only models that are registered after the previous call
+            (and models created by previous merge) are compared with other models.
+            Only these models and models that refer to merged models are optimized.
         :return: pairs of (new model, set of old models)
         """
-        # TODO: Implement strict mode
-        models2merge: Dict[ModelMeta, Set[ModelMeta]] = defaultdict(set)
-        for model_a, model_b in combinations(self.models, 2):
-            if self._models_cmp_fn(model_a, model_b):
-                models2merge[model_a].add(model_b)
-                models2merge[model_b].add(model_a)
-
-        # Groups of models to merge
-        groups: Iterable[Set[ModelMeta]] = [{model, *models} for model, models in models2merge.items()]
-        # Make groups non-overlapping.
-        # This is not optimal algorithm but it works and we probably will not have thousands of models here.
-        flag = True
-        while flag:
-            flag = False
-            new_groups: OrderedSet[FrozenSet[ModelMeta]] = OrderedSet()
-            for gr1 in groups:
-                in_set = False
-                for gr2 in groups:
-                    if gr1 is gr2:
-                        continue
-                    if gr1 & gr2:
-                        in_set = True
-                        old_len = len(new_groups)
-                        new_groups.add(frozenset(gr1 | gr2))
-                        added = old_len < len(new_groups)
-                        flag = flag or added
-                if not in_set:
-                    new_groups.add(gr1)
-            if flag:
-                groups: OrderedSet[FrozenSet[ModelMeta]] = new_groups
+        changed = self._changed
+        self._changed = set()
+        pairs = self._similar_models(changed if incremental else None)
+        # Groups of models to merge. Groups are ordered by their first model in registry
+        # and models in each group are ordered by the first pair in which they are met
+        groups = self._strict_merge_groups(pairs) if strict else self._merge_groups(pairs)
 
         replaces = []
-        replaces_ids = set()
         for group in groups:
             model_meta = self._merge(generator, *group)
             generator.optimize_type(model_meta)
-            replaces_ids.add(model_meta.index)
-            replaces.append((model_meta, group))
-
-        for model_meta in self.models:
+            replaces.append((model_meta, set(group)))
+
+        if incremental:
+            # Models which fields contain pointers to merged models are changed too
+            affected = changed | self._changed
+            for model_meta, _ in replaces:
+                affected.update(ptr.parent.index for ptr in model_meta.pointers if ptr.parent is not None)
+            models = [model_meta for model_meta in self.models if model_meta.index in affected]
+        else:
+            models = self.models
+        for model_meta in models:
             generator.optimize_type(model_meta)
         return replaces
 
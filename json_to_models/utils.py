@@ -1,6 +1,8 @@
 import json
 from functools import wraps
-from typing import Callable, Optional, Set
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, Set, TypeVar
+
+T = TypeVar('T', bound=Hashable)
 
 
 class Index:
@@ -19,6 +21,52 @@ class Index:
         return value
 
 
+class DisjointSet(Generic[T]):
+    """
+    Union-find structure. Items are grouped into non-overlapping sets in (almost) linear time
+    """
+
+    def __init__(self, items: Iterable[T] = ()):
+        self.parent: Dict[T, T] = {}
+        self.size: Dict[T, int] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: T):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item: T) -> T:
+        """
+        Return representative item of the set that contains given item
+        """
+        parent = self.parent
+        while parent[item] is not item:
+            # Path halving
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: T, b: T):
+        a, b = self.find(a), self.find(b)
+        if a is b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+    def groups(self) -> List[List[T]]:
+        """
+        Return sets as lists. Sets are ordered by their first added item and items keep the order of addition
+        """
+        groups: Dict[T, List[T]] = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+
+
 def json_format(x) -> str:
     return json.dumps(x, indent=4, default=str, ensure_ascii=False)
 
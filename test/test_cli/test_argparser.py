@@ -1,6 +1,29 @@
+import pytest
+
 from json_to_models.cli import Cli
 
 
 def test_help():
     cli = Cli()
     cli.argparser.print_help()
+
+
+@pytest.mark.parametrize("value,expected", [
+    pytest.param("1", 1, id="one"),
+    pytest.param("4", 4, id="four"),
+])
+def test_jobs(value, expected):
+    cli = Cli()
+    namespace = cli.argparser.parse_args(["-m", "Model", "data.json", "--jobs", value])
+    assert namespace.jobs == expected
+
+
+@pytest.mark.parametrize("value", [
+    pytest.param("0", id="zero"),
+    pytest.param("-1", id="negative"),
+    pytest.param("two", id="not_int"),
+])
+def test_jobs_invalid(value):
+    cli = Cli()
+    with pytest.raises(SystemExit):
+        cli.argparser.parse_args(["-m", "Model", "data.json", "--jobs", value])
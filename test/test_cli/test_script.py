@@ -77,6 +77,12 @@ test_commands = [
                  id="gists_merge_policy"),
     pytest.param(f"""{executable} -m Gist "{tmp_path / '*.gist'}" --dkf files --merge exact""",
                  id="gists_no_merge"),
+    pytest.param(f"""{executable} -m Gist "{tmp_path / '*.gist'}" --dkf files --merge percent_30 --strict-merge""",
+                 id="gists_strict_merge"),
+    pytest.param(f"""{executable} -m Gist "{tmp_path / '*.gist'}" --dkf files --jobs 2""",
+                 id="gists_jobs"),
+    pytest.param(f"""{executable} -m Gist "{tmp_path / '*.gist'}" --dkf files --engine flat""",
+                 id="gists_flat_engine"),
     pytest.param(f"""{executable} -m Gist "{tmp_path / '*.gist'}" --dkf files --datetime --strings-converters""",
                  id="gists_strings_converters"),
 
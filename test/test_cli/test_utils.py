@@ -1,10 +1,12 @@
+import io
 import json
 import sys
 from pathlib import Path
 
 import pytest
 
-from json_to_models.cli import dict_lookup, iter_json_file, path_split, process_path
+from json_to_models.cli import Cli, dict_lookup, iter_json_file, path_split, process_path
+from json_to_models.json_stream import iter_json_stream
 from json_to_models.utils import convert_args
 
 echo = lambda *args, **kwargs: (args, kwargs)
@@ -160,3 +162,94 @@ test_process_path_data = [
 def test_process_path(value, expected):
     result = set(str(p).replace("\\", "/") for p in process_path(value))
     assert result == expected, f"(in value: {value})"
+
+
+test_iter_json_stream_data = [
+    pytest.param("users.json", "-", id="root_list"),
+    pytest.param("photos.json", "items", id="lookup"),
+    pytest.param("photos.json", "-", id="root_dict"),
+    pytest.param("gists.json", "-", id="strings_escapes"),
+    pytest.param("unicode.json", "-", id="unicode"),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64 * 1024])
+@pytest.mark.parametrize("file,lookup", test_iter_json_stream_data)
+def test_iter_json_stream(file, lookup, chunk_size):
+    with (path / "data" / file).open() as f:
+        expected = list(iter_json_file(json.load(f), lookup))
+    with (path / "data" / file).open() as f:
+        result = list(iter_json_stream(f, lookup, chunk_size=chunk_size))
+    assert result == expected
+
+
+test_iter_json_stream_lookup_data = [
+    pytest.param('{"a": [1, "x\\\\\\"]", {"b": "]"}], "b": {"c": [{"d": 1}, {"d": 2}]}}', "b.c",
+                 [{"d": 1}, {"d": 2}], id="skip_siblings"),
+    pytest.param('{"a": {"b": []}}', "a.b", [], id="empty_list"),
+    pytest.param('  {"a" : {"b" : {"x": null, "y": true}}}  ', "a.b", [{"x": None, "y": True}], id="whitespaces"),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+@pytest.mark.parametrize("value,lookup,expected", test_iter_json_stream_lookup_data)
+def test_iter_json_stream_lookup(value, lookup, expected, chunk_size):
+    assert list(iter_json_stream(io.StringIO(value), lookup, chunk_size=chunk_size)) == expected
+
+
+test_iter_json_stream_duplicated_keys_data = [
+    pytest.param('{"a": [1], "a": [2, 3]}', "a", id="last_value"),
+    pytest.param('{"a": {"b": [1]}, "x": 0, "a": {"c": [2], "b": [3]}}', "a.b", id="nested_last_value"),
+    pytest.param('{"a": {"b": [1], "b": [2]}, "a": {"b": [3], "b": [4]}}', "a.b", id="duplicates_on_each_level"),
+    pytest.param('{"a": 1, "a": {"b": [2]}}', "a.b", id="not_a_dict_before_last_value"),
+    pytest.param('{"a": {"b": [1]}, "a": {"c": [2]}}', "a.b", id="missing_key_in_last_value"),
+    pytest.param('{"a": {"b": [1]}, "a": [2]}', "a.b", id="last_value_is_not_a_dict"),
+    pytest.param('{"a": [{"x": 1, "x": 2}]}', "a", id="duplicates_in_items"),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+@pytest.mark.parametrize("value,lookup", test_iter_json_stream_duplicated_keys_data)
+def test_iter_json_stream_duplicated_keys(value, lookup, chunk_size):
+    # Streamed lookup should use the same values as lookup in the data loaded by json.load
+    try:
+        expected = list(iter_json_file(json.loads(value), lookup))
+    except (KeyError, TypeError) as e:
+        with pytest.raises(type(e)):
+            list(iter_json_stream(io.StringIO(value), lookup, chunk_size=chunk_size))
+    else:
+        assert list(iter_json_stream(io.StringIO(value), lookup, chunk_size=chunk_size)) == expected
+
+
+test_iter_json_stream_errors_data = [
+    pytest.param('{"a": [1, 2]}', "b", KeyError, id="missing_key"),
+    pytest.param('{"a": 1}', "a", TypeError, id="not_a_list_or_dict"),
+    pytest.param('[{"a": 1}]', "a", TypeError, id="lookup_in_list"),
+    pytest.param('{"a": [1, 2}', "a", ValueError, id="invalid_json"),
+]
+
+
+@pytest.mark.parametrize("value,lookup,error", test_iter_json_stream_errors_data)
+def test_iter_json_stream_errors(value, lookup, error):
+    with pytest.raises(error):
+        list(iter_json_stream(io.StringIO(value), lookup, chunk_size=4))
+
+
+def test_setup_models_data_is_lazy():
+    loaded = []
+
+    def parser(p):
+        loaded.append(p)
+        return [{"file": p.name}]
+
+    cli = Cli()
+    cli.setup_models_data([("Model", str(path / "data" / "dummy_files" / "*.txt"))], (), parser)
+    iterators = cli.models_data["Model"]
+    assert len(iterators) == 3
+    assert not loaded
+
+    items = []
+    for i, it in enumerate(iterators, 1):
+        items.extend(it)
+        assert len(loaded) == i
+    assert sorted(item["file"] for item in items) == ["test1.txt", "test2.txt", "test3.txt"]
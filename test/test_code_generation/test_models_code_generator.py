@@ -18,9 +18,14 @@ from json_to_models.dynamic_typing import (
     Unknown,
     compile_imports,
 )
-from json_to_models.models.base import GenericModelCodeGenerator, generate_code
-from json_to_models.models.structure import sort_fields
+from jinja2 import Template
+
+from json_to_models.models import attr, base, dataclasses, pydantic, sqlmodel  # noqa: F401 (register precompiled templates)
+from json_to_models.models.base import GenericModelCodeGenerator, _renderers, generate_code, render, template
+from json_to_models.generator import MetadataGenerator
+from json_to_models.models.structure import compose_models, compose_models_flat, sort_fields
 from json_to_models.models.utils import indent
+from json_to_models.registry import ModelRegistry
 
 LITERAL_SOURCE = f"from {Literal.__module__}"
 
@@ -430,3 +435,123 @@ def test_override_style(value: ModelMeta, types_style: Dict[Union['BaseType', Ty
         class_generator_kwargs=dict(types_style=types_style)
     )
     assert generated.rstrip() == expected, generated
+
+
+test_render_data = [
+    {},
+    {"name": "Test", "type": "int"},
+    {"name": "test", "type": "List[int]", "body": "field(default_factory=list)"},
+    {"name": "test", "type": "int", "body": ""},
+    {"kwargs": {}, "default": "...", "str_fields": []},
+    {"kwargs": {"default": "None", "metadata": {"J2M_ORIGINAL_FIELD": "Test"}}, "default": "None",
+     "str_fields": ["a", "b#c.d"]},
+    {"decorators": [], "name": "Test", "bases": [], "fields": []},
+    {"decorators": ["attr.s", "convert_strings(['a'])"], "name": "Test", "bases": "BaseModel",
+     "fields": ["a: int", "b: str = None"], "nested": ["    class Nested:\n        pass"], "extra": "    # extra"},
+    {"name": "Test", "fields": ["a: int"], "nested": ["    class A:\n        pass", "    class B:\n        pass"]},
+]
+
+
+@pytest.mark.parametrize("data", test_render_data)
+def test_precompiled_templates(data: dict):
+    assert _renderers
+    data = {"kwargs": {}, **data}  # KWAGRS_TEMPLATE fails on undefined kwargs
+    for compiled, renderer in _renderers.items():
+        assert renderer(**data) == compiled.render(**data)
+        assert render(compiled, **data) == compiled.render(**data)
+
+
+# Models with all features that are rendered by templates: optional fields, defaults, renamed fields,
+# string converters, literals, dicts, nested models and models without fields
+# (empty lists and dicts are not used because string converters do not support Unknown type)
+test_templates_features_data = [
+    {"id": 1, "class": "a", "someField": "2020-01-02", "1st": "12", "поле": 1.5, "lit": "a",
+     "items": [{"a": 1, "b": "10"}], "meta": {"k": "v"}, "nothing": None,
+     "nested": {"inner": {"x": "1", "y": True}, "none": {"z": None}}},
+    {"id": 2, "class": "b", "someField": "2020-01-03", "1st": "13", "lit": "b", "items": [{"a": 2}],
+     "meta": {"k": "w"}, "opt_list": [1], "opt_dict": {"1": 1}, "opt_model": {"y": "x"},
+     "opt_str": "long string value of the field"},
+]
+
+
+@pytest.mark.parametrize("structure_fn", [compose_models, compose_models_flat])
+@pytest.mark.parametrize("class_generator,kwargs", [
+    pytest.param(GenericModelCodeGenerator, {}, id="base"),
+    pytest.param(attr.AttrsModelCodeGenerator, {}, id="attrs"),
+    pytest.param(attr.AttrsModelCodeGenerator, {"meta": True, "attrs_kwargs": {"frozen": True}}, id="attrs_meta"),
+    pytest.param(dataclasses.DataclassModelCodeGenerator, {}, id="dataclasses"),
+    pytest.param(dataclasses.DataclassModelCodeGenerator, {"meta": True, "dataclass_kwargs": {"frozen": True}},
+                 id="dataclasses_meta"),
+    pytest.param(pydantic.PydanticModelCodeGenerator, {}, id="pydantic"),
+    pytest.param(sqlmodel.SqlModelCodeGenerator, {}, id="sqlmodel"),
+])
+@pytest.mark.parametrize("options", [
+    pytest.param({}, id="default"),
+    pytest.param({"post_init_converters": True, "convert_unicode": False, "max_literals": 1}, id="options"),
+])
+def test_precompiled_templates_features(monkeypatch, structure_fn, class_generator, kwargs, options):
+    # Precompiled renderers generate the same code as jinja2 templates
+    templates = [value for value in vars(class_generator).values() if isinstance(value, Template)]
+    for cls in class_generator.__mro__:
+        templates.extend(value for value in vars(cls).values() if isinstance(value, Template))
+    assert templates and all(compiled in _renderers for compiled in templates)
+
+    # Generators rename models so structure is built again for each run
+    def build():
+        generator = MetadataGenerator(dict_keys_regex=[r"^\d+$"], dict_keys_fields=["meta"])
+        registry = ModelRegistry()
+        registry.process_meta_data(generator.generate(*test_templates_features_data), "Model")
+        registry.merge_models(generator)
+        registry.generate_names()
+        return structure_fn(registry.models_map)
+
+    def generate():
+        code = generate_code(build(), class_generator, {**kwargs, **options})
+        gen = class_generator(model_factory("Extra", {}), **kwargs, **options)
+        _, extra = gen.generate(nested_classes=["    class Nested:\n        pass"], extra="    # extra")
+        return code, extra
+
+    expected = generate()
+    monkeypatch.setattr(base, "_renderers", {})
+    assert generate() == expected
+
+
+def test_precompiled_templates_override():
+    class CustomGenerator(GenericModelCodeGenerator):
+        FIELD = template("{{ name }} = {{ type }}")
+
+    model = model_factory("Test", {"foo": int})
+    assert GenericModelCodeGenerator(model).fields[1] == ["foo: int"]
+    assert CustomGenerator(model).fields[1] == ["foo = int"]
+
+
+test_generate_code_parallel_data = [
+    ("Сообщение", {"id": 5, "автор": {"имя": "a", "id": 1}, "ответы": [{"id": 2, "text": "b", "user": {"id": 1}}]}),
+    ("class", {"class": "a", "items": [{"class": {"type": "b"}, "author": {"name": "a", "id": 1}}]}),
+    ("Thread", {"id": 3, "user": {"id": 1}, "author": {"name": "b", "id": 2}, "data": {"1": {"x": 1.0}}}),
+    ("Empty", {"empty": None}),
+    ("Blog", {"posts": [{"title": "a", "tag": {"name": "a", "color": 1}}],
+              "pages": [{"path": "b", "tag": {"name": "b", "color": 2}}]}),
+]
+
+
+@pytest.mark.parametrize("structure_fn", [compose_models, compose_models_flat])
+@pytest.mark.parametrize("class_generator,kwargs", [
+    pytest.param(GenericModelCodeGenerator, {}, id="base"),
+    pytest.param(dataclasses.DataclassModelCodeGenerator, {"meta": True}, id="dataclasses"),
+    pytest.param(pydantic.PydanticModelCodeGenerator, {"convert_unicode": False}, id="pydantic"),
+])
+def test_generate_code_parallel(structure_fn, class_generator, kwargs):
+    # Generators rename models so structure is built again for each run
+    def build():
+        generator = MetadataGenerator()
+        registry = ModelRegistry()
+        for name, data in test_generate_code_parallel_data:
+            registry.process_meta_data(generator.generate(data), name)
+        registry.merge_models(generator)
+        registry.generate_names()
+        return structure_fn(registry.models_map)
+
+    expected = generate_code(build(), class_generator, kwargs)
+    for jobs in (2, 3):
+        assert generate_code(build(), class_generator, kwargs, jobs=jobs) == expected
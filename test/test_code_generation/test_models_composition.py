@@ -1,11 +1,14 @@
+import random
 from typing import Dict, List, Set, Tuple, Union
 
 import pytest
 
 from json_to_models.dynamic_typing import ModelMeta
 from json_to_models.generator import MetadataGenerator
-from json_to_models.models.structure import compose_models, compose_models_flat, extract_root
-from json_to_models.models.utils import ListEx
+from json_to_models.models.structure import (
+    compose_models, compose_models_flat, extract_root, extract_roots, pointers_graph
+)
+from json_to_models.models.utils import ListEx, PositionsDict, PositionsIndex
 from json_to_models.registry import ModelRegistry
 
 
@@ -21,6 +24,27 @@ def test_list_ex():
     assert l == [0, 'a', *range(1, 6), 'b', *range(6, 10)]
 
 
+@pytest.mark.parametrize("seed", range(20))
+def test_positions_index(monkeypatch, seed):
+    monkeypatch.setattr(PositionsIndex, "BLOCK_SIZE", 3)
+    rnd = random.Random(seed)
+    expected = PositionsDict()
+    positions = PositionsIndex()
+    keys = ["root", *(f"Model{i}" for i in range(rnd.randint(1, 40)))]
+    for _ in range(200):
+        key = rnd.choice(keys)
+        action = rnd.random()
+        if action < .1:
+            assert positions[key] == expected[key]
+        elif action < .2:
+            assert positions.get(key, -1) == expected.get(key, -1)
+        else:
+            value = PositionsDict.INC if action < .3 else rnd.randint(0, 60)
+            expected.update_position(key, value)
+            positions.update_position(key, value)
+        assert dict(positions.items()) == expected
+
+
 # This test relies on model names as a some sort of models ids
 # and may fail if some logic of their generation will be changed
 # List of Tuple[root_model_name, JSON data] | Dict[model_name, Set[root_model_names]]
@@ -89,10 +113,32 @@ def test_extract_root(
     models_registry.generate_names()
     names_map = {model.index: model.name for model in models_registry.models}
     names_map.update({model.name: model.index for model in models_registry.models})
+    all_roots = extract_roots(pointers_graph(models_registry.models_map)[0])
     for model_name, roots in expected.items():
         meta = models_registry.models_map[names_map[model_name]]
         extracted_roots = {names_map[ix] for ix in extract_root(meta)}
         assert extracted_roots == roots
+        assert {names_map[ix] for ix in all_roots[meta.index]} == roots
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_extract_roots_cycles(seed):
+    rnd = random.Random(seed)
+    keys = [f"M{i}" for i in range(rnd.randint(1, 30))]
+    parents = {key: set(rnd.sample(keys, min(len(keys), rnd.randint(0, 3)))) for key in keys}
+    expected = {}
+    for key in keys:
+        expected[key] = set()
+        seen = {key}
+        nodes = list(parents[key])
+        while nodes:
+            node = nodes.pop()
+            if node not in seen:
+                seen.add(node)
+                nodes.extend(parents[node])
+                if not parents[node]:
+                    expected[key].add(node)
+    assert extract_roots(parents) == expected
 
 
 base_dict = {"field_" + str(i): int for i in range(20)}
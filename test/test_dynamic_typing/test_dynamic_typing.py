@@ -1,8 +1,17 @@
+import os
+import pickle
+import subprocess
+import sys
 from builtins import complex
 
 import pytest
 
-from json_to_models.dynamic_typing import DUnion, StringLiteral, get_hash_string
+from json_to_models.dynamic_typing import complex as complex_module
+
+from json_to_models.dynamic_typing import (
+    DDict, DList, DOptional, DTuple, DUnion, IntString, InternTable, ModelMeta, ModelPtr, StringLiteral, Unknown,
+    get_hash, get_hash_string, get_sort_key, is_interned
+)
 
 # *args | MetaData
 test_dunion = [
@@ -56,3 +65,165 @@ def test_hash_string():
     union.replace(complex, index=0)
     h2 = union.to_hash_string()
     assert h1 != h2, f"{h1}, {h2}"
+
+
+def test_hash():
+    a = {'a': DList(int), 'b': DUnion(int, StringLiteral({'x'}))}
+    b = {'a': DList(int), 'b': DUnion(int, StringLiteral({'y'}))}
+    c = {'a': DList(int), 'b': DUnion(int, StringLiteral({'x'}))}
+    assert get_hash(a) == get_hash(c)
+    assert len(set(map(get_hash, (a, b, {'a': DList(float)}, {'b': DList(int)})))) == 4
+    # Same as hash strings: fields order matters
+    assert get_hash({'x': int, 'y': str}) != get_hash({'y': str, 'x': int})
+
+    union = DUnion(str, float)
+    h1 = union.to_hash()
+    union.replace(complex, index=0)
+    h2 = union.to_hash()
+    assert h1 != h2
+
+    # Cached hash is not pickled
+    union = pickle.loads(pickle.dumps(union))
+    assert getattr(union, '_hash', None) is None
+    assert union.to_hash() == h2
+
+
+def test_hash_is_same_in_other_process():
+    # Hashes of classes are not based on their addresses
+    code = (
+        "from json_to_models.dynamic_typing import *\n"
+        "print(get_hash({'a': DList(int), 'b': DUnion(IntString, StringLiteral({'x'}), DOptional(float))}))"
+    )
+    env = {**os.environ, 'PYTHONHASHSEED': '0'}
+    hashes = {
+        subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, check=True, text=True).stdout
+        for _ in range(2)
+    }
+    assert len(hashes) == 1
+
+
+def test_union_hash_collision(monkeypatch):
+    # Types with equal hashes are compared
+    monkeypatch.setattr(complex_module, 'get_hash', lambda t: 0)
+    union = DUnion(int, float, DList(int), DList(str), int, DList(int))
+    assert union.types == [int, float, DList(int), DList(str)]
+
+
+def test_intern_table():
+    table = InternTable()
+    assert table.single(DList, int) is table.single(DList, int)
+    assert table.single(DList, Unknown) is not table.single(DDict, Unknown)
+    assert table.literal(('a', 'b')) is table.literal(('b', 'a'))
+    assert table.literal(('a' * 100,)) is table.literal(('b' * 100,))
+    assert table.literal(('a' * 100,)).overflowed
+
+    union = table.union(table.single(DList, int), StringLiteral({'a'}), float)
+    assert union is table.union(table.single(DList, int), table.literal('a'), float)
+    assert is_interned(union) and is_interned(union.types[1])
+    assert table.single(DList, union) is table.single(DList, union)
+
+    # Nodes that contain models are not shared
+    model = {'a': int}
+    assert table.single(DList, model) is not table.single(DList, model)
+    assert not is_interned(table.union(int, model))
+    assert not is_interned(table.single(DDict, DList(int)))
+
+
+def test_intern_table_key_of_other_node():
+    # Keys of shared nodes are ids of nested nodes. Node is not shared if found node is built from other nodes
+    table = InternTable()
+    nested = table.single(DList, int)
+    other = table.single(DList, float)
+    table._nodes[(DList, id(nested))] = other
+    assert table.single(DList, nested).type is nested
+
+    union = table.union(int, nested)
+    table._nodes[(DUnion, id(int), id(other))] = union
+    assert table.union(int, other).types == [int, other]
+
+
+def test_intern_table_copy_on_write():
+    table = InternTable()
+    node = table.single(DList, table.union(int, str))
+    shared = table.single(DList, node)
+    assert shared.replace(node) is shared
+    changed = shared.replace(table.single(DList, int))
+    assert changed is not shared and not is_interned(changed)
+    assert changed == DList(DList(int))
+    assert shared == DList(DList(DUnion(int, str)))
+
+    union = table.union(int, str)
+    assert union.replace(union.types) is union
+    changed = union.replace(float, index=0)
+    assert changed == DUnion(float, str)
+    assert union == DUnion(int, str)
+    assert changed.replace(bool, index=0) is changed
+
+    # Not interned nodes are still changed in-place
+    node = DList(int)
+    assert node.replace(float) is node
+
+
+def test_intern_table_limit():
+    table = InternTable(max_size=2)
+    a, b = table.single(DList, int), table.single(DList, float)
+    assert len(table) == 2
+    assert table.single(DList, str) is table.single(DList, str)
+    assert len(table) == 1
+    assert is_interned(a) and is_interned(b)
+
+    disabled = InternTable(max_size=0)
+    assert disabled.single(DList, int) is not disabled.single(DList, int)
+    assert not is_interned(disabled.literal('a'))
+
+
+def test_sort_key():
+    a = DUnion(DList({'x': int, 'y': DUnion(str, float)}), StringLiteral({'a', 'b'}), int)
+    b = DUnion(int, StringLiteral({'b', 'a'}), DList({'y': DUnion(float, str), 'x': int}))
+    assert get_sort_key(a) == get_sort_key(b)
+    assert a == b
+    c = DUnion(int, StringLiteral({'b', 'a'}), DList({'y': DUnion(float, int), 'x': int}))
+    assert get_sort_key(a) != get_sort_key(c)
+    assert a != c
+    assert [get_sort_key(t) for t in a.sorted] == [get_sort_key(t) for t in b.sorted]
+
+    # Key is invalidated by setters
+    c.replace(DList({'y': DUnion(float, str), 'x': int}), index=1)
+    assert a == c
+
+
+def test_sort_key_is_structural():
+    # Key is built from names and values so it is the same in all processes
+    assert get_sort_key(DList({'x': IntString, 'y': StringLiteral({'b', 'a'})})) == (
+        'json_to_models.dynamic_typing.complex.DList',
+        ('dict', (
+            ('x', ('type', 'json_to_models.dynamic_typing.string_serializable.IntString')),
+            ('y', ('json_to_models.dynamic_typing.complex.StringLiteral', (False, ('a', 'b')))),
+        ))
+    )
+    # Different models and dicts have different keys
+    a, b = ModelMeta({'x': int}, 'A'), ModelMeta({'x': int}, 'B')
+    assert get_sort_key(ModelPtr(a)) != get_sort_key(ModelPtr(b))
+    assert get_sort_key(ModelPtr(a)) == get_sort_key(ModelPtr(a))
+    assert get_sort_key({'x': int}) != get_sort_key({'x': float})
+    assert get_sort_key({'x': int}) != get_sort_key({'y': int})
+    union = DUnion(ModelPtr(b), {'x': int}, ModelPtr(a), Unknown, {'x': float})
+    assert union.sorted == [Unknown, {'x': float}, {'x': int}, ModelPtr(a), ModelPtr(b)]
+
+
+def test_equality_after_nested_replace():
+    # Cached sort key of union is not invalidated by in-place change of nested type
+    nested = DList(int)
+    a = DUnion(nested, str)
+    b = DUnion(DList(float), str)
+    assert a != b
+    nested.replace(float)
+    assert a == b
+    assert DList(a) == DList(b)
+
+
+def test_slots():
+    model = ModelMeta({'a': int}, 0)
+    ptr = ModelPtr(model, parent=ModelMeta({'b': model}, 1), parent_field_name='b')
+    for t in (model, ptr, DOptional(int), DList(int), DDict(int), DUnion(int, str), DTuple(int), StringLiteral({'a'})):
+        assert not hasattr(t, '__dict__'), type(t)
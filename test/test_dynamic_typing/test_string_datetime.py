@@ -1,9 +1,11 @@
 import datetime
 
+import dateutil.tz
 import pytest
 
 from json_to_models.dynamic_typing import (BooleanString, FloatString, IntString, IsoDateString, IsoDatetimeString,
                                            IsoTimeString, register_datetime_classes)
+from json_to_models.dynamic_typing.string_datetime import parse_iso
 from json_to_models.generator import MetadataGenerator
 
 register_datetime_classes()
@@ -39,6 +41,11 @@ test_detect_type_data = [
         "2018-12-31T12:58:12Z",
         IsoDatetimeString,
         id="datetime"
+    ),
+    pytest.param(
+        "2018-12-31 12:58:12,5",
+        IsoDatetimeString,
+        id="datetime_dateutil_fallback"
     )
 ]
 
@@ -101,3 +108,29 @@ def test_replace():
     assert IsoDateString(2014, 12, 5).replace(day=4, month=5) == IsoDateString(2014, 5, 4)
     assert IsoDatetimeString(2014, 12, 5, 14, 12, 57).replace(minute=58, second=32, day=4, month=5) \
            == IsoDatetimeString(2014, 5, 4, 14, 58, 32)
+
+
+# string | parsed value
+test_parse_iso_data = [
+    pytest.param("2018-12-31", datetime.date(2018, 12, 31), id="date"),
+    pytest.param("12:58", datetime.time(12, 58), id="time"),
+    pytest.param("12:58:01.5", datetime.time(12, 58, 1, 500000), id="time_ms"),
+    pytest.param("2018-12-31 12:58:01", datetime.datetime(2018, 12, 31, 12, 58, 1), id="datetime"),
+    pytest.param("2018-12-31T12:58Z", datetime.datetime(2018, 12, 31, 12, 58, tzinfo=dateutil.tz.UTC), id="utc"),
+    pytest.param("2018-12-31T12:58-0130", datetime.datetime(2018, 12, 31, 12, 58, tzinfo=dateutil.tz.tzoffset(None, -5400)),
+                 id="tz_offset"),
+    pytest.param("2018-02-30", None, id="invalid_date"),
+    pytest.param("24:00", None, id="invalid_time"),
+    pytest.param("12:58Z", None, id="time_with_tz"),
+    pytest.param("31 Dec 2018", None, id="other_format"),
+    pytest.param("", None, id="empty"),
+]
+
+
+@pytest.mark.parametrize("value,expected", test_parse_iso_data)
+def test_parse_iso(value, expected):
+    result = parse_iso(value)
+    assert result == expected
+    assert type(result) is type(expected)
+    if expected is not None and hasattr(expected, "tzinfo"):
+        assert repr(result.tzinfo) == repr(expected.tzinfo)
@@ -1,6 +1,8 @@
+import re
+
 import pytest
 
-from json_to_models.dynamic_typing import IsoTimeString
+from json_to_models.dynamic_typing import IsoTimeString, register_datetime_classes
 from json_to_models.dynamic_typing.string_serializable import (FloatString, IntString, StringSerializable,
                                                                StringSerializableRegistry)
 from json_to_models.generator import MetadataGenerator
@@ -77,3 +79,84 @@ def test_string_serializable_registry_order():
     r2.add(cls=IsoTimeString)
     assert gen._detect_type("12") == IntString
     assert gen._detect_type("12:14") == IsoTimeString
+
+
+class Counted(StringSerializable):
+    calls = 0
+
+    @classmethod
+    def to_internal_value(cls, value: str):
+        cls.calls += 1
+        if not value.startswith("x"):
+            raise ValueError()
+        return value
+
+
+class Prefixed(Counted):
+    calls = 0
+    lexical_pattern = re.compile(r"x.*", re.IGNORECASE)
+
+
+class Short(Counted):
+    calls = 0
+    lexical_pattern = r"\w+"
+    lexical_length = (1, 3)
+
+
+# value | detected class
+test_data_detect = [
+    pytest.param("x", Prefixed, id="match"),
+    pytest.param("X", None, id="pattern_flags"),
+    pytest.param("y", None, id="rejected_by_pattern"),
+    pytest.param("xyz", Prefixed, id="max_length"),
+]
+
+
+@pytest.mark.parametrize("value,expected", test_data_detect)
+def test_string_serializable_registry_detect(value, expected):
+    r2 = StringSerializableRegistry(Prefixed, Short)
+    assert r2.detect(value) == expected
+
+
+def test_string_serializable_registry_lexical_checks():
+    r2 = StringSerializableRegistry(Prefixed, Short, Counted)
+    Prefixed.calls = Short.calls = Counted.calls = 0
+    for value in ("a", "abcd", "b.c"):
+        r2.detect(value)
+    assert (Prefixed.calls, Short.calls, Counted.calls) == (0, 1, 3)
+
+    # Dispatcher is rebuilt on registry change
+    r2.remove(Prefixed)
+    assert r2.detect("xy") == Short
+
+
+@pytest.mark.parametrize("value", ["1", " -1_000 ", "1.5", ".5e-3", "-inf", "NaN", "True", "false"])
+def test_default_lexical_checks(value):
+    gen = MetadataGenerator()
+    expected = None
+    for cls in gen.str_types_registry:
+        try:
+            cls.to_internal_value(value)
+        except ValueError:
+            continue
+        expected = cls
+        break
+    assert expected is not None
+    assert gen.str_types_registry.detect(value) is expected
+
+
+@pytest.mark.parametrize("value", ["1", "2020-01-02", "2020-01-02T10:11:12Z", "10:11", "10:11:12.5", "Monday", "Jan",
+                                   "noon", "5 PM", "2020/01/02", "Jan 5 2020", "x"])
+def test_datetime_lexical_checks(value):
+    # Lexical checks are necessary conditions so detection is the same as trying of all classes one by one
+    registry = StringSerializableRegistry(IntString, FloatString)
+    register_datetime_classes(registry)
+    expected = None
+    for cls in registry:
+        try:
+            cls.to_internal_value(value)
+        except ValueError:
+            continue
+        expected = cls
+        break
+    assert registry.detect(value) is expected
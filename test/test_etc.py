@@ -3,8 +3,8 @@ from random import shuffle
 import pytest
 from inflection import singularize
 
-from json_to_models.utils import (Index, cached_classmethod, cached_method, convert_args_decorator, distinct_words,
-                                  json_format)
+from json_to_models.utils import (DisjointSet, Index, cached_classmethod, cached_method, convert_args_decorator,
+                                  distinct_words, json_format)
 
 test_distinct_words_data = [
     pytest.param(['test', 'foo', 'bar'], {'test', 'foo', 'bar'}),
@@ -49,6 +49,15 @@ def test_index():
         ix()
 
 
+def test_disjoint_set():
+    items = DisjointSet(range(10))
+    for a, b in ((8, 9), (1, 3), (3, 5), (9, 0), (7, 7)):
+        items.union(a, b)
+    assert items.find(5) == items.find(1)
+    assert items.find(0) != items.find(1)
+    assert items.groups() == [[0, 8, 9], [1, 3, 5], [2], [4], [6], [7]]
+
+
 @convert_args_decorator(int, b=float)
 def f(a, b):
     return a + b
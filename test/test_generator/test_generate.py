@@ -0,0 +1,288 @@
+import json
+import pickle
+import random
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from json_to_models.dynamic_typing import (BaseType, DList, DOptional, DUnion, FloatString, IntString, InternTable,
+                                           StringLiteral, StringSerializableRegistry, is_interned)
+from json_to_models.flat_generator import FlatMetadataGenerator, PathIndex
+from json_to_models.generator import MetadataGenerator, PathState
+from json_to_models.models.base import GenericModelCodeGenerator, generate_code
+from json_to_models.models.structure import compose_models_flat
+from json_to_models.registry import ModelRegistry
+from testing_tools.data import test_data as test_data_set
+
+data_path = (Path(__file__) / ".." / ".." / "test_cli" / "data").resolve()
+
+# List of data variants | expected metadata
+test_data = [
+    pytest.param(
+        [{"a": 1}, {"a": 2, "b": "1"}],
+        {"a": int, "b": DOptional(IntString)},
+        id="optional_field"
+    ),
+    pytest.param(
+        [{"a": {"x": "foo"}}, {"a": {"x": "bar", "y": 1}}, {"a": None}],
+        {"a": DOptional({"x": StringLiteral({"foo", "bar"}), "y": DOptional(int)})},
+        id="nested_models"
+    ),
+    pytest.param(
+        [{"a": [{"x": 1}]}, {"a": [{"x": 1.5}, {"y": 1}]}, {"a": []}],
+        {"a": DList({"x": DOptional(float), "y": DOptional(int)})},
+        id="nested_lists"
+    ),
+    pytest.param(
+        [{"a": 1}, {"a": "x"}, {"a": 1.5}],
+        {"a": DUnion(float, StringLiteral({"x"}))},
+        id="union"
+    ),
+]
+
+
+@pytest.mark.parametrize("value,expected", test_data)
+def test_generate(models_generator: MetadataGenerator, value, expected):
+    assert models_generator.generate(*value) == expected
+
+
+@pytest.mark.parametrize("value,expected", test_data)
+def test_feed(models_generator: MetadataGenerator, value, expected):
+    for data in value:
+        models_generator.feed(data)
+    assert models_generator.result() == expected
+    # Accumulator is reset after result call
+    assert models_generator.result() == {}
+
+
+def test_feed_is_same_as_generate(models_generator: MetadataGenerator):
+    with (data_path / "gists.json").open() as f:
+        gists = json.load(f)
+    corpora = [test_data_set, gists, *(random_data_variants(seed) for seed in range(200))]
+    for data in corpora:
+        def generate_batch():
+            # All data variants are converted and merged at once
+            return models_generator.optimize_type(
+                models_generator.merge_field_sets([models_generator._convert(item) for item in data])
+            )
+
+        def feed():
+            for item in data:
+                models_generator.feed(item)
+            return models_generator.result()
+
+        expected = generate_batch()
+        for result in (feed(), models_generator.generate(*data)):
+            assert result == expected
+            assert metadata_order(result) == metadata_order(expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_generate_parallel(models_generator: MetadataGenerator, chunk_size):
+    with (data_path / "gists.json").open() as f:
+        gists = json.load(f)
+    for data in (test_data_set, gists):
+        expected = models_generator.generate(*data)
+        result = models_generator.generate_parallel(iter(data), jobs=2, chunk_size=chunk_size)
+        assert result == expected
+        assert generate_flat_code(result) == generate_flat_code(expected)
+
+
+def test_string_cache():
+    str_registry = StringSerializableRegistry(IntString)
+    gen = MetadataGenerator(str_registry, string_cache_size=2)
+    for value, expected in (("1", IntString), ("1", IntString), ("x", StringLiteral({"x"})),
+                            ("1.5", StringLiteral({"1.5"}))):
+        assert gen._detect_type(value) == expected
+    info = gen.string_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+
+    # Cache is invalidated on registry change
+    str_registry.add(cls=FloatString)
+    assert gen._detect_type("1.5") == FloatString
+    info = gen.string_cache_info()
+    assert (info.hits, info.misses) == (0, 1)
+
+    gen = MetadataGenerator(str_registry, string_cache_size=0)
+    assert gen._detect_type("1") == IntString
+    assert gen.string_cache_info().currsize == 0
+
+
+def test_path_state_saturation(models_generator: MetadataGenerator):
+    path = PathState()
+    for i in range(StringLiteral.MAX_LITERALS):
+        assert isinstance(models_generator._detect_type(f"value {i}", path=path), StringLiteral)
+    assert models_generator._detect_type("1", path=path) == IntString
+    assert not path.saturated
+    assert isinstance(models_generator._detect_type("another value", path=path), StringLiteral)
+    assert path.saturated
+    # Detection is skipped
+    assert models_generator._detect_type("1", path=path) is str
+
+    path = PathState()
+    models_generator._detect_type("x" * StringLiteral.MAX_STRING_LENGTH, path=path)
+    assert path.saturated
+
+
+def test_path_state_tree(models_generator: MetadataGenerator):
+    paths = PathState()
+    long_text = "x" * StringLiteral.MAX_STRING_LENGTH
+    models_generator._convert({"a": [{"b": long_text}], "c": "1"}, paths)
+    assert paths.field("a").item().field("b").saturated
+    assert not paths.field("c").saturated
+    assert models_generator._convert({"a": [{"b": "1"}], "c": "1", "d": {"b": "1"}}, paths) == {
+        "a": DList({"b": str}),
+        "c": IntString,
+        "d": {"b": IntString},
+    }
+
+
+def test_path_saturation_result(models_generator: MetadataGenerator):
+    long_text = "x" * StringLiteral.MAX_STRING_LENGTH
+    data = [{"a": long_text, "b": [f"v{i}" for i in range(20)]}, {"a": "1", "b": ["1", "x"]}]
+    assert models_generator.generate(*data) == {"a": str, "b": DList(str)}
+
+
+@pytest.mark.parametrize("value,expected", test_data)
+def test_flat_generator(value, expected):
+    gen = FlatMetadataGenerator()
+    assert gen.generate(*value) == expected
+    for data in value:
+        gen.feed(data)
+    assert gen.result() == expected
+
+
+def test_flat_generator_is_same_as_generate():
+    with (data_path / "gists.json").open() as f:
+        gists = json.load(f)
+    gen = FlatMetadataGenerator(dict_keys_fields=["files"])
+    tree_gen = MetadataGenerator(dict_keys_fields=["files"])
+    for data in (test_data_set, gists):
+        expected = tree_gen.generate(*data)
+        result = gen.generate(*data)
+        assert result == expected
+        assert metadata_order(result) == metadata_order(expected)
+        assert gen.generate_parallel(iter(data), jobs=2, chunk_size=3) == expected
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_flat_generator_order(seed):
+    # Output of engines is identical, not only equal (fields and types of unions are ordered in the same way)
+    data = random_data_variants(seed)
+    expected = MetadataGenerator().generate(*data)
+    result = FlatMetadataGenerator().generate(*data)
+    assert result == expected
+    assert metadata_order(result) == metadata_order(expected)
+
+
+@pytest.mark.parametrize("data", [
+    pytest.param([{"a": "x" * 30}, {"a": "x" * 30}, {"a": "y"}], id="long_string"),
+    pytest.param([{"a": [{"b": "x" * 30}]}, {"a": [{"b": 1}, {"c": "y" * 30}]}], id="long_string_nested"),
+    pytest.param([{"a": str(i), "b": [str(i), i]} for i in range(20)], id="literals_overflow"),
+    pytest.param([{"a": {"1": 1.5}, "b": {}}, {"a": {"2": [True, 1]}, "b": {"x": 1}}, {"a": {}}], id="dicts"),
+])
+def test_flat_generator_order_strings_and_dicts(data):
+    tree_gen = MetadataGenerator(dict_keys_regex=[r"^\d+$"])
+    gen = FlatMetadataGenerator(dict_keys_regex=[r"^\d+$"])
+    for result, expected in (
+            (gen.generate(*data), tree_gen.generate(*data)),
+            (gen.generate_parallel(iter(data * 3), jobs=2, chunk_size=2),
+             tree_gen.generate_parallel(iter(data * 3), jobs=2, chunk_size=2))
+    ):
+        assert result == expected
+        assert metadata_order(result) == metadata_order(expected)
+
+
+def test_flat_generator_parallel_mixed_paths():
+    # Paths with both nested model and list/dict. Partial results are pickled so keys of items are new objects
+    data = [{"a": [1, 2], "b": {"x": 1}}, {"a": {"x": 1}, "b": {"1": "y"}}] * 10
+    gen = FlatMetadataGenerator(dict_keys_regex=[r"^\d+$"])
+    expected = MetadataGenerator(dict_keys_regex=[r"^\d+$"]).generate(*data)
+    assert gen.generate(*data) == expected
+    assert gen.generate_parallel(iter(data), jobs=2, chunk_size=3) == expected
+    index = pickle.loads(pickle.dumps(gen._accumulate(None, data[0])))
+    assert [path for path, _ in index.paths()] == ["a", "a[]", "b", "b.x"]
+
+
+def test_path_index():
+    gen = FlatMetadataGenerator()
+    index = None
+    for data in ({"a": [{"b": "x"}], "c": {}}, {"a": [{"b": 1}, {"d": None}]}):
+        index = gen._accumulate(index, data)
+    paths = {path: stats for path, stats in index.paths()}
+    assert list(paths) == ["a", "a[]", "a[].b", "c", "a[].d"]
+    assert (paths["a[]"].models, paths["a[].b"].count, paths["a[].d"].count) == (3, 2, 1)
+    assert paths["a[].b"].kinds == {int: None}
+    assert paths["a[].b"].literals == {"x"}
+    assert paths["c"].empty_dicts
+
+    # Index merging is the same as accumulating
+    other = gen._accumulate(None, {"c": {"x": {"y": 1}}})
+    merged = PathIndex().update(index).update(other)
+    assert merged.to_field_set() == gen._accumulate(index, {"c": {"x": {"y": 1}}}).to_field_set()
+
+
+def test_interned_metadata():
+    gen = MetadataGenerator()
+    meta = gen._convert({"a": [1, 2], "b": [3], "c": [{"d": [4]}], "e": ["x", "x"]})
+    assert meta["a"] is meta["b"] is meta["c"].type["d"]
+    assert is_interned(meta["e"]) and not is_interned(meta["c"])
+
+    plain = MetadataGenerator()
+    plain.intern_table = InternTable(max_size=0)
+    with (data_path / "gists.json").open() as f:
+        gists = json.load(f)
+    for data in (test_data_set, gists):
+        expected = plain.generate(*data)
+        assert gen.generate(*data) == expected
+
+        # Shared nodes are not changed by models registry
+        result = gen.generate(*data)
+        registry = ModelRegistry()
+        registry.process_meta_data(result, "Model")
+        registry.merge_models(gen)
+        assert gen.generate(*data) == expected
+
+
+def metadata_order(meta):
+    """
+    Nested lists of fields names and union items (equality of metadata does not depend on their order)
+    """
+    if isinstance(meta, dict):
+        return [(name, metadata_order(t)) for name, t in meta.items()]
+    elif isinstance(meta, StringLiteral):
+        return sorted(meta.literals)
+    elif isinstance(meta, BaseType):
+        return [type(meta).__name__, *map(metadata_order, meta)]
+    return meta
+
+
+def random_data_variants(seed: int) -> List[dict]:
+    """
+    Data variants with nested models, lists, nulls and string serializable values of the same fields
+    """
+    rnd = random.Random(seed)
+    keys = ["id", "name", "value", "items", "data", "type", "url", "tags"]
+    strings = ["1", "42", "3.14", "true", "false", "abc", "2020-01-02", "10:20:30", "x", ""]
+
+    def value(depth):
+        choice = rnd.random()
+        if depth > 3 or choice < .5:
+            return rnd.choice([rnd.randint(0, 100), rnd.random(), True, None, *strings])
+        if choice < .75:
+            return model(depth + 1)
+        return [value(depth + 1) for _ in range(rnd.randint(0, 4))]
+
+    def model(depth):
+        return {key: value(depth) for key in rnd.sample(keys, rnd.randint(1, 5))}
+
+    return [model(0) for _ in range(rnd.randint(1, 6))]
+
+
+def generate_flat_code(meta: dict) -> str:
+    registry = ModelRegistry()
+    registry.process_meta_data(meta, "Model")
+    registry.merge_models(MetadataGenerator())
+    registry.generate_names()
+    return generate_code(compose_models_flat(registry.models_map), GenericModelCodeGenerator)
@@ -4,7 +4,7 @@ from random import shuffle
 import pytest
 
 from json_to_models.dynamic_typing import DOptional, DUnion, FloatString, IntString
-from json_to_models.generator import MetadataGenerator
+from json_to_models.generator import FieldSetPartial, MetadataGenerator
 
 # List of fields sets | result field set
 test_data = [
@@ -82,6 +82,22 @@ test_data = [
 ]
 
 
+# Partials take into account optional fields of any set
+test_merge_partials_data = [
+    *test_data,
+    pytest.param(
+        [{'a': int}, {'a': DOptional(int)}],
+        {'a': DOptional(int)},
+        id="merge_optional_into_required"
+    ),
+    pytest.param(
+        [{'a': int}, {'a': DOptional(float)}],
+        {'a': DOptional(DUnion(int, float))},
+        id="merge_optional_union_into_required"
+    ),
+]
+
+
 @pytest.mark.parametrize("value,expected", test_data)
 def test_merge_field_sets(models_generator: MetadataGenerator, value, expected):
     shuffled = value[:]
@@ -91,3 +107,48 @@ def test_merge_field_sets(models_generator: MetadataGenerator, value, expected):
         if isinstance(result, OrderedDict):
             result = dict(result)
         assert result == expected
+
+
+@pytest.mark.parametrize("value,expected", [
+    pytest.param(
+        [{'a': int}, {'a': DOptional(int)}],
+        {'a': int},
+        id="merge_optional_into_required"
+    ),
+    pytest.param(
+        [{'a': int}, {'a': DOptional(float)}],
+        {'a': DUnion(DOptional(float), int)},
+        id="merge_optional_union_into_required"
+    ),
+])
+def test_merge_field_sets_optional_into_required(models_generator: MetadataGenerator, value, expected):
+    # merge_field_sets result depends on the order of sets: field that is required in the first set
+    # is not made optional by the same type in the following ones (models merged by registry keep it)
+    result = models_generator.merge_field_sets(value)
+    assert result == expected
+    assert isinstance(result['a'], type(expected['a']))
+
+
+@pytest.mark.parametrize("value,expected", test_merge_partials_data)
+def test_merge_partials(models_generator: MetadataGenerator, value, expected):
+    partials = [FieldSetPartial.from_field_set(v) for v in value]
+    for i in range(len(partials) + 1):
+        left = models_generator.merge_partials(*partials[:i])
+        right = models_generator.merge_partials(*partials[i:])
+        for result in (
+                models_generator.merge_partials(left, right),
+                models_generator.merge_partials(right, left),
+                models_generator.merge_partials(FieldSetPartial(), left, FieldSetPartial(), right),
+        ):
+            assert result.count == len(value)
+            assert result.to_field_set() == expected
+
+
+def test_merge_partials_presence(models_generator: MetadataGenerator):
+    a = FieldSetPartial.from_field_set({'a': int, 'b': DOptional(int)})
+    b = FieldSetPartial.from_field_set({'a': int, 'c': str})
+    result = models_generator.merge_partials(a, b, b)
+    assert result == FieldSetPartial(3, {'a': int, 'b': int, 'c': str}, {'a': 3, 'b': 0, 'c': 2})
+    assert result.to_field_set() == {'a': int, 'b': DOptional(int), 'c': DOptional(str)}
+    # Arguments are not modified
+    assert a == FieldSetPartial.from_field_set({'a': int, 'b': DOptional(int)})
@@ -1,10 +1,15 @@
+import copy
+import random
+from itertools import combinations
 from typing import Iterable
 
 import pytest
 
 from json_to_models.dynamic_typing import DList, DOptional, ModelMeta, Unknown
 from json_to_models.generator import MetadataGenerator
-from json_to_models.registry import ModelRegistry
+from json_to_models.registry import (
+    ModelCmp, ModelFieldsEquals, ModelFieldsNumberMatch, ModelFieldsPercentMatch, ModelRegistry
+)
 from test.test_registry.test_registry_process_meta_data import check_type, cycle_ref, test_data as base_test_data
 
 # Include test cases from `test_registry_process_meta_data.py`. They should be correct.
@@ -268,6 +273,10 @@ test_data = base_test_data + [
     ),
 ]
 
+# process_meta_data replaces nested dicts of metadata with pointers in place,
+# so tests that process the same metadata again get their own copy (made before any test is run)
+test_data_copy = [pytest.param(copy.deepcopy(param.values[0]), param.values[1], id=param.id) for param in test_data]
+
 
 def sort_models(models: Iterable[ModelMeta]):
     return sorted(
@@ -290,3 +299,263 @@ def test_registry_merge_models_base(models_generator: MetadataGenerator, models_
     assert len(models_registry.models) == len(expected)
     for model, expected_model in zip(sort_models(models_registry.models), sort_models(expected)):
         check_type(model, expected_model)
+
+
+@pytest.mark.parametrize("value,expected", test_data_copy)
+def test_registry_merge_models_incremental_new(models_generator: MetadataGenerator, models_registry: ModelRegistry,
+                                               value, expected):
+    # All models of new registry are compared
+    for v in (value if isinstance(value, list) else [value]):
+        models_registry.process_meta_data(v)
+    models_registry.merge_models(generator=models_generator, incremental=True)
+    assert len(models_registry.models) == len(expected)
+    for model, expected_model in zip(sort_models(models_registry.models), sort_models(expected)):
+        check_type(model, expected_model)
+
+
+def test_registry_merge_models_incremental(models_generator: MetadataGenerator, models_registry: ModelRegistry,
+                                           monkeypatch):
+    for i in range(20):
+        models_registry.process_meta_data({f"field_{i}_{k}": int for k in range(5)})
+    models_registry.merge_models(models_generator)
+    assert len(models_registry.models) == 20
+
+    # New model is similar to the first one and its nested model is similar to the second one
+    models_registry.process_meta_data({
+        **{f"field_0_{k}": int for k in range(5)},
+        "nested": {f"field_1_{k}": int for k in range(5)},
+    })
+    optimized = []
+    optimize_type = models_generator.optimize_type
+
+    def optimize_type_spy(meta):
+        if isinstance(meta, ModelMeta):
+            optimized.append(meta)
+        return optimize_type(meta)
+
+    monkeypatch.setattr(models_generator, "optimize_type", optimize_type_spy)
+    compared = []
+    similar_models = models_registry._similar_models
+    monkeypatch.setattr(
+        models_registry, "_similar_models",
+        lambda changed: compared.append(changed) or similar_models(changed)
+    )
+
+    replaces = models_registry.merge_models(models_generator, incremental=True)
+    assert len(compared[0]) == 2
+    assert len(replaces) == 2
+    assert len(models_registry.models) == 20
+    # Only merged models are optimized
+    assert {model.index for model in optimized} == {model.index for model, _ in replaces}
+    merged_parent = next(model for model, _ in replaces if "nested" in model.type)
+    merged_nested = next(model for model, _ in replaces if model is not merged_parent)
+    # Field is optional because the first model has no such field
+    assert merged_parent.type["nested"].type.type is merged_nested
+    assert set(merged_parent.type) == {*(f"field_0_{k}" for k in range(5)), "nested"}
+
+    # Nothing was added so nothing is merged but models created by the last merge are compared again
+    assert models_registry.merge_models(models_generator, incremental=True) == []
+    assert {*compared[1]} == {model.index for model, _ in replaces}
+
+
+def test_registry_merge_models_strict(models_generator: MetadataGenerator):
+    registry = ModelRegistry(ModelFieldsPercentMatch(.4))
+    # Chain of similar models: each model is similar to the next one but not to the one after it
+    fields = [f"field_{i}" for i in range(20)]
+    for i in range(0, 13, 4):
+        registry.process_meta_data({name: int for name in fields[i:i + 10]})
+    models = list(registry.models)
+
+    pairs = registry._similar_models()
+    assert pairs == [(models[0], models[1]), (models[1], models[2]), (models[2], models[3])]
+    assert registry._merge_groups(pairs) == [models]
+    assert registry._strict_merge_groups(pairs) == [models[0:2], models[2:4]]
+
+    registry.merge_models(models_generator, strict=True)
+    assert sorted(len(model.type) for model in registry.models) == [12, 14]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_strict_merge_groups(seed):
+    rnd = random.Random(seed)
+    registry = ModelRegistry()
+    models = [registry.process_meta_data({f"field_{i}": int}).type for i in range(60)]
+    # Some dense clusters and random noise
+    pairs = set()
+    for _ in range(8):
+        cluster = rnd.sample(models, rnd.randint(2, 10))
+        pairs.update(combinations(sorted(cluster, key=models.index), 2))
+    pairs.update(combinations(sorted(rnd.sample(models, 20), key=models.index), 2) if seed % 2 else ())
+    pairs.update(tuple(sorted(rnd.sample(models, 2), key=models.index)) for _ in range(40))
+
+    groups = registry._strict_merge_groups(pairs)
+    seen = set()
+    for group in groups:
+        assert len(group) > 1
+        assert group == sorted(group, key=models.index)
+        assert all(pair in pairs for pair in combinations(group, 2))
+        assert not seen & set(group)
+        seen.update(group)
+    # Models that are left alone could not be added to any group
+    for model in models:
+        if model in seen:
+            continue
+        for group in groups:
+            assert not all(
+                (a, b) in pairs for a, b in (sorted((model, m), key=models.index) for m in group)
+            )
+
+
+def test_strict_merge_groups_scaling():
+    registry = ModelRegistry()
+    models = [registry.process_meta_data({f"field_{i}": int}).type for i in range(3000)]
+    # Big cluster of similar models and chains between neighbour models
+    pairs = list(combinations(models[:1000], 2))
+    pairs += [(models[i], models[i + 1]) for i in range(1000, len(models) - 1)]
+    groups = registry._strict_merge_groups(pairs)
+    assert groups[0] == models[:1000]
+    assert groups[1:] == [models[i:i + 2] for i in range(1000, len(models) - 1, 2)]
+
+
+class FirstFieldMatch(ModelCmp):
+    def cmp(self, fields_a: set, fields_b: set) -> bool:
+        return min(fields_a) == min(fields_b)
+
+
+class PercentMatchSubclass(ModelFieldsPercentMatch):
+    def cmp(self, fields_a: set, fields_b: set) -> bool:
+        return super().cmp(fields_a, fields_b) or FirstFieldMatch().cmp(fields_a, fields_b)
+
+
+similar_models_comparators = [
+    pytest.param((), id="default"),
+    pytest.param((ModelFieldsPercentMatch(.3), ModelFieldsNumberMatch(3)), id="low_thresholds"),
+    pytest.param((ModelFieldsPercentMatch(0),), id="zero_percent"),
+    pytest.param((ModelFieldsEquals(),), id="equals"),
+    pytest.param((ModelFieldsNumberMatch(4), FirstFieldMatch()), id="custom"),
+    pytest.param((PercentMatchSubclass(.9),), id="custom_subclass"),
+]
+
+
+@pytest.mark.parametrize("comparators", similar_models_comparators)
+def test_similar_models(comparators):
+    rnd = random.Random(0)
+    names = [f"field_{i}" for i in range(40)]
+    registry = ModelRegistry(*comparators)
+    for _ in range(150):
+        # Some models share most of the fields
+        base = names[:rnd.randint(1, 20)] if rnd.random() < .5 else rnd.sample(names, rnd.randint(1, 20))
+        fields = [name for name in base if rnd.random() < .9] or base[:1]
+        registry.process_meta_data({name: int for name in fields})
+
+    models = list(registry.models)
+    expected = [
+        (a, b) for a, b in combinations(models, 2)
+        if any(cmp.cmp(set(a.type), set(b.type)) for cmp in registry._models_cmp)
+    ]
+    assert expected
+    assert registry._similar_models() == expected
+
+
+@pytest.mark.parametrize("comparators", similar_models_comparators)
+def test_similar_models_vectorized(comparators, monkeypatch):
+    pytest.importorskip("numpy")
+    rnd = random.Random(1)
+    names = [f"field_{i}" for i in range(40)]
+    registry = ModelRegistry(*comparators)
+    for _ in range(150):
+        base = names[:rnd.randint(1, 20)] if rnd.random() < .5 else rnd.sample(names, rnd.randint(1, 20))
+        fields = [name for name in base if rnd.random() < .9] or base[:1]
+        registry.process_meta_data({name: int for name in fields})
+
+    expected = registry._similar_models()
+    assert expected
+    monkeypatch.setattr(ModelRegistry, "VECTORIZE_THRESHOLD", 0)
+    monkeypatch.setattr(ModelRegistry, "VECTORIZE_MIN_DENSITY", 0)
+    # Small blocks to check that rows of matrix are split correctly
+    monkeypatch.setattr(ModelRegistry, "VECTORIZE_BLOCK_SIZE", 1000)
+    assert registry._similar_models() == expected
+    # Too large matrix
+    monkeypatch.setattr(ModelRegistry, "VECTORIZE_MAX_SIZE", 10)
+    assert registry._similar_models() == expected
+
+
+def test_merge_groups_scaling():
+    registry = ModelRegistry()
+    models = [registry.process_meta_data({f"field_{i}": int}).type for i in range(6000)]
+    # Thousands of overlapping groups: each model is linked to the next one except every 6th
+    pairs = [(models[i], models[i + 1]) for i in range(len(models) - 1) if i % 6 != 5]
+    groups = registry._merge_groups(pairs)
+    assert groups == [models[i:i + 6] for i in range(0, len(models), 6)]
+
+
+def old_merge_groups(pairs):
+    """
+    Fixed-point loop which was used to make groups of models non-overlapping
+    """
+    models2merge = {}
+    for model_a, model_b in pairs:
+        models2merge.setdefault(model_a, set()).add(model_b)
+        models2merge.setdefault(model_b, set()).add(model_a)
+    groups = [{model, *models} for model, models in models2merge.items()]
+    flag = True
+    while flag:
+        flag = False
+        new_groups = {}
+        for gr1 in groups:
+            in_set = False
+            for gr2 in groups:
+                if gr1 is gr2:
+                    continue
+                if gr1 & gr2:
+                    in_set = True
+                    group = frozenset(gr1 | gr2)
+                    flag = flag or group not in new_groups
+                    new_groups.setdefault(group, None)
+            if not in_set:
+                new_groups.setdefault(frozenset(gr1), None)
+        if flag:
+            groups = list(new_groups)
+    return [set(group) for group in groups]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_merge_groups_as_old_loop(models_generator: MetadataGenerator, seed):
+    rnd = random.Random(seed)
+    names = [f"field_{i}" for i in range(30)]
+    types = [int, float, bool, str]
+    data = []
+    for _ in range(40):
+        # Models share fields with models of the same cluster so groups are overlapping
+        start = rnd.randrange(0, len(names) - 10, 6)
+        data.append({
+            name: rnd.choice(types)
+            for name in rnd.sample(names[start:start + 10], rnd.randint(2, 8))
+        })
+
+    registry = ModelRegistry(ModelFieldsPercentMatch(.5))
+    for value in data:
+        registry.process_meta_data(value)
+    models = list(registry.models)
+    pairs = registry._similar_models()
+    groups = registry._merge_groups(pairs)
+    old_groups = old_merge_groups(pairs)
+    assert any(len(group) > 2 for group in groups)
+    assert [set(group) for group in groups] == old_groups
+    # Models are ordered by the first pair in which they are met
+    order = list(dict.fromkeys(model for pair in pairs for model in pair))
+    for group in groups:
+        assert group == sorted(group, key=order.index)
+        assert group[0] == min(group, key=models.index)
+
+    # Merged models are the same as models merged in groups of old loop
+    replaces = registry.merge_models(models_generator)
+    old_registry = ModelRegistry(ModelFieldsPercentMatch(.5))
+    for value in data:
+        old_registry.process_meta_data(value)
+    old_registry._merge_groups = lambda pairs: [list(group) for group in old_merge_groups(pairs)]
+    old_replaces = old_registry.merge_models(models_generator)
+    assert len(replaces) == len(old_replaces)
+    for (model, group), (old_model, old_group) in zip(replaces, old_replaces):
+        assert {m.index for m in group} == {m.index for m in old_group}
+        assert model.type == old_model.type
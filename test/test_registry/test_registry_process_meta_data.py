@@ -2,7 +2,9 @@ from collections import OrderedDict
 
 import pytest
 
-from json_to_models.dynamic_typing import ComplexType, DOptional, DTuple, MetaData, ModelMeta, ModelPtr, SingleType
+from json_to_models.dynamic_typing import (
+    ComplexType, DList, DOptional, DTuple, DUnion, MetaData, ModelMeta, ModelPtr, SingleType
+)
 from json_to_models.registry import ModelRegistry
 
 # MetaData | List of models
@@ -184,3 +186,63 @@ def test_registry_pointers(models_registry: ModelRegistry, value, expected):
         assert model.index == index
         ptr = next(iter(model.pointers))
         assert ptr.parent.index if ptr.parent else None == parent
+
+
+def test_registry_process_deep_meta_data(models_registry: ModelRegistry):
+    # Registry processing of metadata which is deeper than the recursion limit (metadata is built by hand)
+    depth = 5000
+    # {"id": int, "children": List[{"id": int, "children": List[...]}]} with optional tail
+    meta = {"id": int}
+    root = meta
+    for _ in range(depth - 1):
+        child = {"id": int}
+        meta["children"] = DList(DOptional(child))
+        meta = child
+
+    root_ptr = models_registry.process_meta_data(root, "Node")
+    models = list(models_registry.models)
+    assert len(models) == depth
+    assert root_ptr.type is models[0]
+    assert root_ptr.type.name == "Node"
+    for parent, child in zip(models, models[1:]):
+        ptr = parent.type["children"].type.type
+        assert isinstance(ptr, ModelPtr)
+        assert ptr.type is child
+        assert ptr.parent is parent and ptr.parent_field_name == "children"
+        assert set(child.pointers) == {ptr}
+
+
+def test_registry_process_meta_data_parent(models_registry: ModelRegistry):
+    # Pointer to the model replaces metadata in the given parent (signature of recursive implementation)
+    parent_ptr = models_registry.process_meta_data({"a": int}, "Parent")
+    child = {"b": int}
+    for parent, replace_kwargs in ((DList(child), None), (DUnion(int, child), {"index": 1})):
+        ptr = models_registry.process_meta_data(
+            child, parent=parent, parent_model=(parent_ptr.type, "items"), replace_kwargs=replace_kwargs
+        )
+        assert list(parent)[-1] is ptr
+        assert ptr.parent is parent_ptr.type and ptr.parent_field_name == "items"
+
+
+def test_registry_process_cyclic_meta_data(models_registry: ModelRegistry):
+    # Metadata that refers to itself (e.g. merged metadata that is processed again) is registered only once
+    meta = {"id": int}
+    meta["children"] = DList(meta)
+    root_ptr = models_registry.process_meta_data(meta, "Node")
+    assert list(models_registry.models) == [root_ptr.type]
+    ptr = meta["children"].type
+    assert isinstance(ptr, ModelPtr)
+    assert ptr.type is root_ptr.type
+    assert ptr.parent is root_ptr.type and ptr.parent_field_name == "children"
+
+
+def test_registry_process_repeated_meta_data(models_registry: ModelRegistry):
+    # Same dict object in different fields refers to the same model
+    child = {"id": int}
+    meta = {"a": child, "b": DList(child)}
+    root_ptr = models_registry.process_meta_data(meta, "Root")
+    models = list(models_registry.models)
+    assert models == [root_ptr.type, meta["a"].type]
+    assert isinstance(meta["b"].type, ModelPtr)
+    assert meta["b"].type.type is meta["a"].type
+    assert {ptr.parent_field_name for ptr in meta["a"].type.pointers} == {"a", "b"}
@@ -0,0 +1,36 @@
+import json
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Tuple
+
+BASE_PATH = (Path(__file__) / ".." / "..").resolve()
+
+
+def load_large_data_set() -> dict:
+    with (BASE_PATH / "large_data_set.json").open() as f:
+        return json.load(f)
+
+
+def load_swagger() -> dict:
+    with (BASE_PATH / "swagger.json").open() as f:
+        return json.load(f)
+
+
+def measure(fn: Callable, *args, repeat: int = 3, **kwargs) -> float:
+    """
+    Return best wall time (in seconds) of ``repeat`` calls of ``fn``
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def print_table(header: Tuple[str, ...], rows: Iterable[Tuple]):
+    rows = [tuple(map(str, row)) for row in rows]
+    widths = [max(len(cell) for cell in column) for column in zip(header, *rows)]
+    for row in (header, tuple("-" * w for w in widths), *rows):
+        print("  ".join(cell.ljust(w) for cell, w in zip(row, widths)))
@@ -0,0 +1,49 @@
+"""
+Code generation with jinja2 templates vs precompiled templates renderers
+
+    python -m testing_tools.benchmarks.code_generation
+"""
+from unittest.mock import patch
+
+from json_to_models.generator import MetadataGenerator
+from json_to_models.models import base
+from json_to_models.models.attr import AttrsModelCodeGenerator
+from json_to_models.models.base import generate_code
+from json_to_models.models.dataclasses import DataclassModelCodeGenerator
+from json_to_models.models.pydantic import PydanticModelCodeGenerator
+from json_to_models.models.sqlmodel import SqlModelCodeGenerator
+from json_to_models.models.structure import compose_models
+from json_to_models.registry import ModelRegistry
+from testing_tools.benchmarks import load_large_data_set, load_swagger, measure, print_table
+
+GENERATORS = {
+    "dataclasses": (DataclassModelCodeGenerator, {"meta": True}),
+    "attrs": (AttrsModelCodeGenerator, {"meta": True}),
+    "pydantic": (PydanticModelCodeGenerator, {}),
+    "sqlmodel": (SqlModelCodeGenerator, {}),
+}
+
+
+def main():
+    gen = MetadataGenerator()
+    reg = ModelRegistry()
+    reg.process_meta_data(gen.generate(load_large_data_set()), "Root")
+    reg.process_meta_data(gen.generate(load_swagger()), "Swagger")
+    reg.merge_models(gen)
+    reg.generate_names()
+    structure = compose_models(reg.models_map)
+    print(f"{len(reg.models_map)} models, {sum(len(model.type) for model in reg.models)} fields")
+
+    rows = []
+    for name, (generator, kwargs) in GENERATORS.items():
+        code = generate_code(structure, generator, kwargs)
+        with patch.dict(base._renderers, clear=True):
+            assert generate_code(structure, generator, kwargs) == code
+            jinja = measure(generate_code, structure, generator, kwargs)
+        precompiled = measure(generate_code, structure, generator, kwargs)
+        rows.append((name, f"{jinja:.3f}", f"{precompiled:.3f}", f"{jinja / precompiled:.2f}"))
+    print_table(("generator", "jinja2", "precompiled", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
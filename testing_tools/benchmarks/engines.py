@@ -0,0 +1,28 @@
+"""
+MetadataGenerator (tree engine) vs FlatMetadataGenerator (flat engine)
+
+    python -m testing_tools.benchmarks.engines
+"""
+from json_to_models.flat_generator import FlatMetadataGenerator
+from json_to_models.generator import MetadataGenerator
+from testing_tools.benchmarks import load_large_data_set, measure, print_table
+from testing_tools.benchmarks.path_saturation import generate_logs
+
+
+def main():
+    datasets = {
+        "large_data_set nodes x10": list(load_large_data_set()["nodes"].values()) * 10,
+        "log records": generate_logs(20000),
+    }
+    rows = []
+    for name, data in datasets.items():
+        tree, flat = MetadataGenerator(), FlatMetadataGenerator()
+        assert tree.generate(*data) == flat.generate(*data)
+        tree_time = measure(tree.generate, *data)
+        flat_time = measure(flat.generate, *data)
+        rows.append((name, len(data), f"{tree_time:.3f}", f"{flat_time:.3f}", f"{tree_time / flat_time:.2f}"))
+    print_table(("data", "variants", "tree", "flat", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Flat models structure composition: PositionsDict (full scan on each position update) vs PositionsIndex
+
+    python -m testing_tools.benchmarks.flat_structure [models number]
+"""
+import sys
+from typing import Dict, Set
+
+from json_to_models.dynamic_typing import ModelMeta
+from json_to_models.models import ModelsStructureType
+from json_to_models.models.structure import compose_models_flat, extract_root, filter_pointers
+from json_to_models.models.utils import ListEx, PositionsDict
+from json_to_models.utils import Index
+from testing_tools.benchmarks import measure, print_table
+from testing_tools.benchmarks.structure import build_models, dump
+
+
+def compose_models_flat_scan(models_map: Dict[Index, ModelMeta]) -> ModelsStructureType:
+    """
+    Previous implementation of compose_models_flat (PositionsDict and extract_root for each model)
+    """
+    root_models = ListEx()
+    positions: PositionsDict[Index, int] = PositionsDict()
+    top_level_models: Set[Index] = set()
+    structure_hash_table: Dict[Index, dict] = {
+        key: {"model": model, "nested": ListEx(), "roots": list(extract_root(model))}
+        for key, model in models_map.items()
+    }
+    for key, model in models_map.items():
+        pointers = list(filter_pointers(model))
+        has_root_pointers = len(pointers) != len(model.pointers)
+        if not pointers:
+            root_models.insert(positions["root"], structure_hash_table[key])
+            top_level_models.add(key)
+            positions.update_position("root", PositionsDict.INC)
+        else:
+            parents = {ptr.parent.index for ptr in pointers}
+            struct = structure_hash_table[key]
+            if has_root_pointers or len(parents) > 1 and len(struct["roots"]) >= 1:
+                if parents & top_level_models:
+                    parents.add("root")
+                parents_positions = {positions[parent_key] for parent_key in parents
+                                     if parent_key in positions}
+                parents_joined = "#".join(sorted(parents))
+                if parents_joined in positions:
+                    parents_positions.add(positions[parents_joined])
+                pos = max(parents_positions) if parents_positions else len(root_models)
+                positions.update_position(parents_joined, pos + 1)
+            else:
+                parent = next(iter(parents))
+                pos = positions.get(parent, len(root_models))
+                positions.update_position(parent, pos + 1)
+            positions.update_position(key, pos + 1)
+            root_models.insert(pos, struct)
+    return root_models, {}
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [100, 1000, 5000, 10000, 20000]
+    rows = []
+    for n in sizes:
+        models_map = build_models(n)
+        root, _ = compose_models_flat(models_map)
+        root_scan, _ = compose_models_flat_scan(models_map)
+        assert dump(root) == dump(root_scan)
+        scan = measure(compose_models_flat_scan, models_map, repeat=1)
+        indexed = measure(compose_models_flat, models_map)
+        rows.append((n, f"{scan:.3f}", f"{indexed:.3f}", f"{scan / indexed:.1f}"))
+    print_table(("models", "PositionsDict", "PositionsIndex", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Merge of models after adding new data to large registry: full merge vs incremental one
+
+    python -m testing_tools.benchmarks.incremental_merge [models number]
+"""
+import random
+import sys
+import time
+
+from json_to_models.generator import MetadataGenerator
+from json_to_models.registry import ModelRegistry
+from testing_tools.benchmarks import print_table
+
+
+def random_model(rnd: random.Random, n: int) -> dict:
+    common = ["id", "name", "description", "type", "created_at", "updated_at", "url", "status"]
+    entity = rnd.randrange(n // 4)
+    fields = rnd.sample(common, rnd.randint(1, 5))
+    fields += [f"{entity}_field_{k}" for k in range(rnd.randint(3, 15)) if rnd.random() < .8]
+    return {name: int for name in fields}
+
+
+def merge_new_models(n: int, added: int, incremental: bool) -> float:
+    rnd = random.Random(0)
+    generator = MetadataGenerator()
+    registry = ModelRegistry()
+    for _ in range(n):
+        registry.process_meta_data(random_model(rnd, n))
+    # Merged models could be similar to other models so registry is merged until nothing changes
+    while registry.merge_models(generator):
+        pass
+    for _ in range(added):
+        registry.process_meta_data(random_model(rnd, n))
+    start = time.perf_counter()
+    registry.merge_models(generator, incremental=incremental)
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [1000, 5000, 20000]
+    added = 10
+    rows = []
+    for n in sizes:
+        full = merge_new_models(n, added, False)
+        incremental = merge_new_models(n, added, True)
+        rows.append((n, added, f"{full:.3f}", f"{incremental:.3f}", f"{full / incremental:.1f}"))
+    print_table(("models", "added", "full", "incremental", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Memory usage of converted data variants and generation time with and without interning of metadata nodes
+
+    python -m testing_tools.benchmarks.interning
+"""
+import tracemalloc
+
+from json_to_models.dynamic_typing import InternTable
+from json_to_models.generator import MetadataGenerator
+from testing_tools.benchmarks import load_large_data_set, measure, print_table
+from testing_tools.benchmarks.path_saturation import generate_logs
+
+
+def converted_size(gen: MetadataGenerator, data) -> int:
+    tracemalloc.start()
+    try:
+        converted = [gen._convert(item) for item in data]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del converted
+    return size
+
+
+def main():
+    datasets = {
+        "large_data_set nodes": list(load_large_data_set()["nodes"].values()),
+        "log records": generate_logs(5000),
+    }
+    rows = []
+    for name, data in datasets.items():
+        plain, interned = MetadataGenerator(), MetadataGenerator()
+        plain.intern_table = InternTable(max_size=0)
+        assert plain.generate(*data) == interned.generate(*data)
+        plain_size = converted_size(plain, data)
+        interned_size = converted_size(interned, data)
+        plain_time = measure(plain.generate, *data)
+        interned_time = measure(interned.generate, *data)
+        rows.append((
+            name, len(data),
+            f"{plain_size / 2 ** 20:.1f}", f"{interned_size / 2 ** 20:.1f}",
+            f"{plain_time:.3f}", f"{interned_time:.3f}"
+        ))
+    print_table(("data", "variants", "plain MiB", "interned MiB", "plain s", "interned s"), rows)
+
+
+if __name__ == '__main__':
+    main()
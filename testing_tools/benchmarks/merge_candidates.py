@@ -0,0 +1,53 @@
+"""
+Search of models to merge: all pairs comparison vs inverted index with prefix filtering
+
+    python -m testing_tools.benchmarks.merge_candidates [models number]
+"""
+import random
+import sys
+from itertools import combinations
+
+from json_to_models.registry import ModelRegistry
+from testing_tools.benchmarks import measure, print_table
+
+
+def build_registry(n: int) -> ModelRegistry:
+    """
+    OpenAPI-like registry: models have a few common fields (id, name, ...) and a lot of specific ones
+    """
+    rnd = random.Random(0)
+    common = ["id", "name", "description", "type", "created_at", "updated_at", "url", "status"]
+    registry = ModelRegistry()
+    for i in range(n):
+        entity = rnd.randrange(n // 4)
+        fields = rnd.sample(common, rnd.randint(1, 5))
+        fields += [f"{entity}_field_{k}" for k in range(rnd.randint(3, 15)) if rnd.random() < .8]
+        registry.process_meta_data({name: int for name in fields})
+    return registry
+
+
+def all_pairs(registry: ModelRegistry):
+    result = []
+    for model_a, model_b in combinations(registry.models, 2):
+        fields_a = set(model_a.type.keys())
+        fields_b = set(model_b.type.keys())
+        if any(cmp.cmp(fields_a, fields_b) for cmp in registry._models_cmp):
+            result.append((model_a, model_b))
+    return result
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [500, 1000, 2000, 5000]
+    rows = []
+    for n in sizes:
+        registry = build_registry(n)
+        pairs = registry._similar_models()
+        assert pairs == all_pairs(registry)
+        exhaustive = measure(all_pairs, registry, repeat=1)
+        indexed = measure(registry._similar_models)
+        rows.append((n, len(pairs), f"{exhaustive:.3f}", f"{indexed:.3f}", f"{exhaustive / indexed:.1f}"))
+    print_table(("models", "pairs to merge", "all pairs", "inverted index", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
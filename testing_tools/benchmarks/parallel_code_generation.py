@@ -0,0 +1,46 @@
+"""
+generate_code in the main process vs generate_code with pool of worker processes
+
+    python -m testing_tools.benchmarks.parallel_code_generation [max jobs]
+"""
+import os
+import sys
+
+from json_to_models.generator import MetadataGenerator
+from json_to_models.models.base import generate_code
+from json_to_models.models.dataclasses import DataclassModelCodeGenerator
+from json_to_models.models.structure import compose_models, compose_models_flat
+from json_to_models.registry import ModelRegistry
+from testing_tools.benchmarks import load_large_data_set, load_swagger, measure, print_table
+
+
+def build_structure(structure_fn):
+    gen = MetadataGenerator()
+    reg = ModelRegistry()
+    reg.process_meta_data(gen.generate(load_large_data_set()), "Root")
+    reg.process_meta_data(gen.generate(load_swagger()), "Swagger")
+    reg.merge_models(gen)
+    reg.generate_names()
+    return structure_fn(reg.models_map)
+
+
+def main():
+    max_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    rows = []
+    for structure_fn in (compose_models, compose_models_flat):
+        expected = generate_code(build_structure(structure_fn), DataclassModelCodeGenerator)
+        structure = build_structure(structure_fn)
+        serial = measure(generate_code, structure, DataclassModelCodeGenerator)
+        rows.append((structure_fn.__name__, "serial", f"{serial:.3f}", "1.00"))
+        jobs = 2
+        while jobs <= max(max_jobs, 2):
+            assert generate_code(build_structure(structure_fn), DataclassModelCodeGenerator, jobs=jobs) == expected
+            t = measure(generate_code, structure, DataclassModelCodeGenerator, jobs=jobs)
+            rows.append((structure_fn.__name__, f"jobs={jobs}", f"{t:.3f}", f"{serial / t:.2f}"))
+            jobs *= 2
+    print(f"CPUs: {os.cpu_count()}")
+    print_table(("structure", "mode", "seconds", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
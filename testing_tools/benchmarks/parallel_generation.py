@@ -0,0 +1,32 @@
+"""
+MetadataGenerator.generate vs MetadataGenerator.generate_parallel
+
+    python -m testing_tools.benchmarks.parallel_generation [max jobs]
+"""
+import os
+import sys
+
+from json_to_models.generator import MetadataGenerator
+from testing_tools.benchmarks import load_large_data_set, measure, print_table
+
+
+def main():
+    max_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    data = list(load_large_data_set()["nodes"].values()) * 10
+    gen = MetadataGenerator()
+
+    expected = gen.generate(*data)
+    serial = measure(gen.generate, *data)
+    rows = [("serial", f"{serial:.3f}", "1.00")]
+    jobs = 2
+    while jobs <= max_jobs:
+        assert gen.generate_parallel(data, jobs=jobs) == expected
+        t = measure(gen.generate_parallel, data, jobs=jobs)
+        rows.append((f"jobs={jobs}", f"{t:.3f}", f"{serial / t:.2f}"))
+        jobs *= 2
+    print(f"{len(data)} data variants, CPUs: {os.cpu_count()}")
+    print_table(("mode", "seconds", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
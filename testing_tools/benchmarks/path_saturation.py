@@ -0,0 +1,58 @@
+"""
+Log-style data with long free-text fields: type detection with and without per-path saturation
+
+    python -m testing_tools.benchmarks.path_saturation
+"""
+import random
+
+from json_to_models.dynamic_typing import StringSerializableRegistry, register_datetime_classes, registry
+from json_to_models.generator import MetadataGenerator, PathState
+from testing_tools.benchmarks import measure, print_table
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor 42 12:30".split()
+
+
+def generate_logs(n: int):
+    rnd = random.Random(0)
+
+    def text(words):
+        return " ".join(rnd.choice(WORDS) for _ in range(words))
+
+    return [
+        {
+            "level": rnd.choice(("debug", "info", "warning", "error")),
+            "message": text(12),
+            "request": {"path": f"/api/v1/items/{i}", "user_agent": text(6)},
+            "context": [{"key": text(1), "value": text(8)} for _ in range(3)],
+        }
+        for i in range(n)
+    ]
+
+
+def generate(gen: MetadataGenerator, data, paths: bool):
+    fields = None
+    state = PathState() if paths else None
+    for item in data:
+        fields = gen._accumulate(fields, item, state)
+    return gen._finalize(fields)
+
+
+def main():
+    data = generate_logs(20000)
+    str_registry = StringSerializableRegistry(*registry)
+    str_registry.replaces = set(registry.replaces)
+    register_datetime_classes(str_registry)
+    gen = MetadataGenerator(str_registry)
+
+    assert generate(gen, data, True) == generate(gen, data, False)
+    without_paths = measure(generate, gen, data, False)
+    with_paths = measure(generate, gen, data, True)
+    print(f"{len(data)} log records")
+    print_table(("mode", "seconds", "speedup"), [
+        ("detect every value", f"{without_paths:.3f}", "1.00"),
+        ("per-path saturation", f"{with_paths:.3f}", f"{without_paths / with_paths:.2f}"),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Registration of models: recursive ModelRegistry.process_meta_data vs iterative one (explicit stack)
+
+    python -m testing_tools.benchmarks.process_meta_data
+"""
+import sys
+import time
+from typing import Callable, Tuple
+
+from json_to_models.dynamic_typing import BaseType, DList, DOptional, MetaData, ModelMeta, ModelPtr
+from json_to_models.generator import MetadataGenerator
+from json_to_models.registry import ModelRegistry
+from testing_tools.benchmarks import load_large_data_set, load_swagger, print_table
+
+
+def process_meta_data_recursive(
+        registry: ModelRegistry, meta: MetaData,
+        parent: MetaData = None,
+        parent_model: Tuple[ModelMeta, str] = (None, None),
+        replace_kwargs=None
+) -> ModelPtr:
+    """
+    Previous (recursive) implementation of ModelRegistry.process_meta_data
+    """
+    replace_kwargs = replace_kwargs or {}
+    ptr = None
+    if isinstance(meta, dict):
+        model_meta = registry._register(meta)
+        ptr = ModelPtr(model_meta, parent=parent_model[0], parent_field_name=parent_model[1])
+        if parent:
+            parent.replace(ptr, **replace_kwargs)
+        for key, value in meta.items():
+            nested_ptr = process_meta_data_recursive(registry, value, parent_model=(model_meta, key))
+            if nested_ptr:
+                meta[key] = nested_ptr
+    elif isinstance(meta, BaseType):
+        try:
+            meta_iter = iter(meta)
+        except TypeError:
+            pass
+        else:
+            for i, nested_meta in enumerate(meta_iter):
+                process_meta_data_recursive(
+                    registry, nested_meta,
+                    parent=meta,
+                    parent_model=parent_model,
+                    replace_kwargs={'parent': meta, 'index': i}
+                )
+    return ptr
+
+
+def deep_meta(depth: int) -> dict:
+    meta = root = {"id": int}
+    for _ in range(depth - 1):
+        child = {"id": int, "text": str}
+        meta["children"] = DList(DOptional(child))
+        meta = child
+    return root
+
+
+def measure_processing(build: Callable[[], dict], process: Callable, repeat: int = 3) -> float:
+    # Metadata is modified by registry so it is built again for each run (not measured)
+    best = None
+    for _ in range(repeat):
+        meta = build()
+        registry = ModelRegistry()
+        start = time.perf_counter()
+        process(registry, meta)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    # Recursive version needs 2 frames per level of deep metadata
+    sys.setrecursionlimit(50000)
+    data = load_large_data_set()
+    swagger = load_swagger()
+    gen = MetadataGenerator()
+    cases = [
+        ("large_data_set.json", lambda: gen.generate(data)),
+        ("swagger.json", lambda: gen.generate(swagger)),
+        ("depth 1000", lambda: deep_meta(1000)),
+        ("depth 5000", lambda: deep_meta(5000)),
+    ]
+    rows = []
+    for name, build in cases:
+        recursive = measure_processing(build, process_meta_data_recursive)
+        iterative = measure_processing(build, ModelRegistry.process_meta_data)
+        rows.append((name, f"{recursive:.4f}", f"{iterative:.4f}", f"{recursive / iterative:.2f}"))
+    print_table(("data", "recursive", "iterative", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
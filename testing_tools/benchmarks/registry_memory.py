@@ -0,0 +1,69 @@
+"""
+Memory usage of models registry: bytes per ModelMeta and per ModelPtr (including their own containers)
+and total memory allocated by ``ModelRegistry.process_meta_data``
+
+    python -m testing_tools.benchmarks.registry_memory
+"""
+import sys
+import tracemalloc
+from typing import Iterable
+
+from json_to_models.dynamic_typing import ModelMeta, ModelPtr
+from json_to_models.generator import MetadataGenerator
+from json_to_models.registry import ModelRegistry
+from testing_tools.benchmarks import load_large_data_set, load_swagger, print_table
+
+
+def sizeof(obj) -> int:
+    """
+    Size of the object and its instance dict (if any)
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def model_size(model: ModelMeta) -> int:
+    return (
+            sizeof(model)
+            + sys.getsizeof(model.pointers)
+            + sys.getsizeof(model.child_pointers)
+            + sys.getsizeof(model.original_fields)
+            + sum(map(sys.getsizeof, model.original_fields))
+    )
+
+
+def pointers(models: Iterable[ModelMeta]) -> Iterable[ModelPtr]:
+    for model in models:
+        yield from model.pointers
+
+
+def main():
+    datasets = {
+        "swagger": [load_swagger()],
+        "large_data_set": [load_large_data_set()],
+    }
+    rows = []
+    for name, data in datasets.items():
+        meta = MetadataGenerator().generate(*data)
+        registry = ModelRegistry()
+        tracemalloc.start()
+        try:
+            registry.process_meta_data(meta, "Model")
+            total, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        models = registry.models
+        ptrs = list(pointers(models))
+        rows.append((
+            name, len(models), len(ptrs),
+            f"{sum(map(model_size, models)) / len(models):.0f}",
+            f"{sum(map(sizeof, ptrs)) / len(ptrs):.0f}",
+            f"{total / 2 ** 20:.2f}"
+        ))
+    print_table(("data", "models", "pointers", "bytes/model", "bytes/pointer", "registry MiB"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Root models of all models: walk for each model vs memoized walk over strongly connected components
+
+    python -m testing_tools.benchmarks.roots [models number]
+"""
+import sys
+from typing import Dict, Set
+
+from json_to_models.models.structure import extract_roots, pointers_graph
+from json_to_models.utils import Index
+from testing_tools.benchmarks import measure, print_table
+from testing_tools.benchmarks.structure import build_models
+
+
+def extract_roots_walk(parents: Dict[Index, Set[Index]]) -> Dict[Index, Set[Index]]:
+    """
+    Previous implementation of extract_roots (separate graph walk for each model)
+    """
+    roots: Dict[Index, Set[Index]] = {}
+    for key in parents:
+        model_roots = roots[key] = set()
+        seen = {key}
+        nodes = list(parents[key])
+        while nodes:
+            node = nodes.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if parents[node]:
+                nodes.extend(parents[node])
+            else:
+                model_roots.add(node)
+    return roots
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [1000, 5000, 20000]
+    rows = []
+    for n in sizes:
+        parents, _ = pointers_graph(build_models(n))
+        assert extract_roots(parents) == extract_roots_walk(parents)
+        walk = measure(extract_roots_walk, parents, repeat=1)
+        memoized = measure(extract_roots, parents)
+        rows.append((n, f"{walk:.3f}", f"{memoized:.3f}", f"{walk / memoized:.1f}"))
+    print_table(("models", "walk per model", "memoized", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
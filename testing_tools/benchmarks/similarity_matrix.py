@@ -0,0 +1,52 @@
+"""
+Search of models to merge with low thresholds (a lot of similar models):
+all pairs comparison vs inverted index vs numpy similarity matrix
+
+    python -m testing_tools.benchmarks.similarity_matrix [models number]
+"""
+import random
+import sys
+
+from json_to_models.registry import ModelFieldsNumberMatch, ModelFieldsPercentMatch, ModelRegistry, np
+from testing_tools.benchmarks import measure, print_table
+from testing_tools.benchmarks.merge_candidates import all_pairs
+
+
+def build_registry(n: int) -> ModelRegistry:
+    """
+    Registry of models built from a small vocabulary so prefix filtering can't prune much
+    """
+    rnd = random.Random(0)
+    names = [f"field_{i}" for i in range(60)]
+    registry = ModelRegistry(ModelFieldsPercentMatch(.3), ModelFieldsNumberMatch(4))
+    for _ in range(n):
+        registry.process_meta_data({name: int for name in rnd.sample(names, rnd.randint(3, 20))})
+    return registry
+
+
+def similar_models(registry: ModelRegistry, vectorize: bool):
+    registry.VECTORIZE_THRESHOLD = 0 if vectorize else len(registry.models) + 1
+    registry.VECTORIZE_MIN_DENSITY = 0
+    return registry._similar_models()
+
+
+def main():
+    if np is None:
+        sys.exit("numpy is not installed")
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [500, 1000, 2000, 4000]
+    rows = []
+    for n in sizes:
+        registry = build_registry(n)
+        pairs = similar_models(registry, True)
+        assert pairs == similar_models(registry, False)
+        exhaustive = measure(all_pairs, registry, repeat=1)
+        indexed = measure(similar_models, registry, False)
+        vectorized = measure(similar_models, registry, True)
+        rows.append((
+            n, len(pairs), f"{exhaustive:.3f}", f"{indexed:.3f}", f"{vectorized:.3f}", f"{indexed / vectorized:.1f}"
+        ))
+    print_table(("models", "pairs to merge", "all pairs", "inverted index", "numpy", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
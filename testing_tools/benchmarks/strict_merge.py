@@ -0,0 +1,36 @@
+"""
+Grouping of similar models: connected components (default) vs greedy cliques (strict mode)
+
+    python -m testing_tools.benchmarks.strict_merge [models number]
+"""
+import sys
+
+from json_to_models.registry import ModelFieldsNumberMatch, ModelFieldsPercentMatch
+from testing_tools.benchmarks import measure, print_table
+from testing_tools.benchmarks.similarity_matrix import build_registry
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [500, 1000, 2000]
+    rows = []
+    for n in sizes:
+        registry = build_registry(n)
+        registry._models_cmp = (ModelFieldsPercentMatch(.45), ModelFieldsNumberMatch(10))
+        pairs = registry._similar_models()
+        groups = registry._merge_groups(pairs)
+        strict_groups = registry._strict_merge_groups(pairs)
+        components = measure(registry._merge_groups, pairs)
+        cliques = measure(registry._strict_merge_groups, pairs)
+        rows.append((
+            n, len(pairs),
+            len(groups), max(map(len, groups), default=0), f"{components:.3f}",
+            len(strict_groups), max(map(len, strict_groups), default=0), f"{cliques:.3f}",
+        ))
+    print_table(
+        ("models", "pairs", "groups", "max group", "time", "strict groups", "max strict group", "strict time"),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Detection of string types with and without cache
+
+    python -m testing_tools.benchmarks.string_detection
+"""
+from json_to_models.dynamic_typing import register_datetime_classes
+from json_to_models.generator import MetadataGenerator
+from testing_tools.benchmarks import load_large_data_set, measure, print_table
+
+
+def main():
+    register_datetime_classes()
+    data = list(load_large_data_set()["nodes"].values()) * 5
+
+    rows = []
+    for size in (0, MetadataGenerator.STRING_CACHE_SIZE):
+        gen = MetadataGenerator(string_cache_size=size)
+        t = measure(gen.generate, *data)
+        info = gen.string_cache_info()
+        rows.append((size, f"{t:.3f}", info.hits, info.misses))
+    print(f"{len(data)} data variants")
+    print_table(("cache size", "seconds", "hits", "misses"), rows)
+
+
+if __name__ == '__main__':
+    main()
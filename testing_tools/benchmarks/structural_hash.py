@@ -0,0 +1,64 @@
+"""
+Union of many large nested models: deduplication by hash strings vs integer structural hashes.
+Members are rebuilt before each run so cached hashes of nested types are not reused.
+
+    python -m testing_tools.benchmarks.structural_hash
+"""
+import time
+from typing import Callable, List
+
+from json_to_models.dynamic_typing import DList, DUnion, MetaData, get_hash, get_hash_string
+from json_to_models.generator import MetadataGenerator
+from testing_tools.benchmarks import load_large_data_set, print_table
+
+
+def nested_models(depth: int, width: int) -> List[MetaData]:
+    """
+    Models that differ only in the deepest field
+    """
+    result = []
+    for i in range(width):
+        model = {f"field_{i}": int}
+        for level in range(depth):
+            model = {"child": DList(model), "level": int}
+        result.append(model)
+    return result
+
+
+def wrapped_nodes() -> List[MetaData]:
+    gen = MetadataGenerator()
+    gen.intern_table.max_size = 0
+    nodes = load_large_data_set()["nodes"].values()
+    return [{"node": DList(model), "nodes": DList(DList(model))} for model in map(gen._convert, nodes)]
+
+
+def measure_fresh(fn: Callable, build: Callable[[], List[MetaData]], repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        members = build()
+        start = time.perf_counter()
+        fn(members)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    datasets = {
+        "large_data_set nodes": wrapped_nodes,
+        "nested models (depth=50)": lambda: nested_models(50, 500),
+    }
+    rows = []
+    for name, build in datasets.items():
+        members = build()
+        assert len(set(map(get_hash_string, members))) == len(set(map(get_hash, members)))
+        string_time = measure_fresh(lambda m: set(map(get_hash_string, m)), build)
+        int_time = measure_fresh(lambda m: set(map(get_hash, m)), build)
+        union_time = measure_fresh(lambda m: DUnion(*m), build)
+        rows.append((name, len(members), f"{string_time:.3f}", f"{int_time:.3f}",
+                     f"{string_time / int_time:.2f}", f"{union_time:.3f}"))
+    print_table(("data", "members", "get_hash_string", "get_hash", "speedup", "DUnion"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Models structure composition on large models graphs: previous implementation (list scans) vs graph index
+
+    python -m testing_tools.benchmarks.structure [models number]
+"""
+import random
+import sys
+from typing import Dict
+
+from json_to_models.dynamic_typing import ModelMeta, ModelPtr
+from json_to_models.models import ModelsStructureType
+from json_to_models.models.structure import compose_models, extract_root, filter_pointers
+from json_to_models.models.utils import ListEx
+from json_to_models.utils import Index
+from testing_tools.benchmarks import measure, print_table
+
+
+def compose_models_scan(models_map: Dict[str, ModelMeta]) -> ModelsStructureType:
+    """
+    Previous implementation of compose_models (ListEx.insert_before and extract_root for each model)
+    """
+    root_models = ListEx()
+    root_nested_ix = 0
+    structure_hash_table = {
+        key: {"model": model, "nested": ListEx(), "roots": list(extract_root(model))}
+        for key, model in models_map.items()
+    }
+    path_injections = {}
+    for key, model in models_map.items():
+        pointers = list(filter_pointers(model))
+        has_root_pointers = len(pointers) != len(model.pointers)
+        if not pointers:
+            root_models.append(structure_hash_table[key])
+        else:
+            parents = {ptr.parent.index for ptr in pointers}
+            struct = structure_hash_table[key]
+            if has_root_pointers or len(parents) > 1 and len(struct["roots"]) > 1:
+                try:
+                    root_models.insert_before(
+                        struct,
+                        *(structure_hash_table[parent_key] for parent_key in struct["roots"])
+                    )
+                except ValueError:
+                    root_models.insert(root_nested_ix, struct)
+                    root_nested_ix += 1
+            elif len(parents) > 1 and len(struct["roots"]) == 1:
+                parent = structure_hash_table[struct["roots"][0]]
+                parent["nested"].insert(0, struct)
+                path_injections[struct["model"]] = parent["model"]
+            else:
+                parent = structure_hash_table[next(iter(parents))]
+                parent["nested"].append(struct)
+    return root_models, path_injections
+
+
+def build_models(n: int) -> Dict[str, ModelMeta]:
+    """
+    API-like models graph: root models (10%) with nested models, some of nested models are shared
+    """
+    rnd = random.Random(0)
+    index = Index()
+    models = []
+    for i in range(n):
+        model = ModelMeta({"id": int, f"field_{i}": str}, index())
+        if i % 10 == 0:
+            ModelPtr(model)
+        else:
+            for parent in rnd.sample(models, min(len(models), 1 if rnd.random() < .7 else rnd.randint(2, 4))):
+                ModelPtr(model, parent=parent, parent_field_name=f"field_{i}")
+        models.append(model)
+    return {model.index: model for model in models}
+
+
+def dump(structure):
+    return [(struct["model"].index, dump(struct["nested"])) for struct in structure]
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [500, 1000, 2000, 5000]
+    rows = []
+    for n in sizes:
+        models_map = build_models(n)
+        root, injections = compose_models(models_map)
+        root_scan, injections_scan = compose_models_scan(models_map)
+        assert dump(root) == dump(root_scan) and injections == injections_scan
+        scan = measure(compose_models_scan, models_map, repeat=1)
+        indexed = measure(compose_models, models_map)
+        rows.append((n, f"{scan:.3f}", f"{indexed:.3f}", f"{scan / indexed:.1f}"))
+    print_table(("models", "list scans", "graph index", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
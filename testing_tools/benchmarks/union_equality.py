@@ -0,0 +1,57 @@
+"""
+Comparison of unions of nested models (union items are sorted by canonical keys before comparison).
+Unions are rebuilt before each run so cached keys are not reused between runs.
+
+    python -m testing_tools.benchmarks.union_equality
+"""
+import random
+import time
+from typing import Callable, Tuple
+
+from json_to_models.dynamic_typing import DList, DOptional, DUnion, MetaData, StringLiteral
+from testing_tools.benchmarks import print_table
+
+
+def nested_model(rnd: random.Random, depth: int) -> MetaData:
+    fields = {f"field_{i}": rnd.choice((int, float, str, StringLiteral({f"v{i}"}))) for i in range(5)}
+    if depth:
+        fields["children"] = DList(DUnion(*(nested_model(rnd, depth - 1) for _ in range(2))))
+        fields["parent"] = DOptional(nested_model(rnd, depth - 1))
+    return DList(fields)
+
+
+def unions(width: int, depth: int, equal: bool) -> Tuple[DUnion, DUnion]:
+    items = [nested_model(random.Random(i), depth) for i in range(width)]
+    other = [nested_model(random.Random(i), depth) for i in range(width)]
+    if not equal:
+        other[-1] = nested_model(random.Random(width), depth)
+    random.Random(0).shuffle(other)
+    return DUnion(*items), DUnion(*other)
+
+
+def measure_fresh(build: Callable[[], Tuple[DUnion, DUnion]], repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        a, b = build()
+        start = time.perf_counter()
+        for _ in range(10):
+            a == b
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    rows = []
+    for width, depth in ((50, 3), (200, 3), (20, 5)):
+        for equal in (True, False):
+            a, b = unions(width, depth, equal)
+            assert (a == b) is equal
+            t = measure_fresh(lambda: unions(width, depth, equal))
+            rows.append((width, depth, equal, f"{t:.3f}"))
+    print("10 comparisons of each pair of unions")
+    print_table(("width", "depth", "equal", "seconds"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,8 @@ from json_to_models.registry import ModelFieldsNumberMatch, ModelFieldsPercentMa
 
 @registry.add()
 class SwaggerRef(StringSerializable, str):
+    lexical_pattern = r'#/[\s\S]*'
+
     @classmethod
     def to_internal_value(cls, value: str) -> 'SwaggerRef':
         if not value.startswith("#/"):